@@ -1,29 +1,157 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Response
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, APIRouter, BackgroundTasks, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, DeleteOne, IndexModel, ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure, PyMongoError
 import os
+import asyncio
+import base64
+import codecs
+import copy
+import csv
+import gzip
+import hashlib
+import json
 import logging
+import re
+import time
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional
+from collections import defaultdict, deque
+from contextvars import ContextVar
 import uuid
+from bisect import bisect_right
 from datetime import datetime, timezone, timedelta
+from email.utils import format_datetime, parsedate_to_datetime
 from io import BytesIO
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, LongTable
 from reportlab.lib.styles import getSampleStyleSheet
+from starlette.datastructures import Headers, MutableHeaders
+from storage import MemoryStorage, MotorStorage
+
+# Dépendances optionnelles: sérialisation JSON rapide et compression brotli
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+def env_int(name: str, default: Optional[int]) -> Optional[int]:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+def available_compressors(names: str) -> list:
+    """Keep the wire compressors whose Python package is installed (zlib is always available)"""
+    modules = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+    compressors = []
+    for name in (n.strip() for n in names.split(',') if n.strip()):
+        try:
+            __import__(modules[name])
+            compressors.append(name)
+        except (KeyError, ImportError):
+            logging.getLogger(__name__).warning(f"MongoDB compressor '{name}' unavailable, ignored")
+    return compressors
+
+def mongo_client_options() -> dict:
+    """Connection pool, timeouts and compression of the Motor client, from the environment"""
+    options = {
+        "maxPoolSize": env_int('MONGO_MAX_POOL_SIZE', 100),
+        "minPoolSize": env_int('MONGO_MIN_POOL_SIZE', 5),
+        "maxIdleTimeMS": env_int('MONGO_MAX_IDLE_TIME_MS', 300000),
+        "serverSelectionTimeoutMS": env_int('MONGO_SERVER_SELECTION_TIMEOUT_MS', 10000),
+        "connectTimeoutMS": env_int('MONGO_CONNECT_TIMEOUT_MS', 10000),
+        "socketTimeoutMS": env_int('MONGO_SOCKET_TIMEOUT_MS', None),
+        "waitQueueTimeoutMS": env_int('MONGO_WAIT_QUEUE_TIMEOUT_MS', 10000),
+    }
+    # zlib par défaut (bibliothèque standard); zstd et snappy demandent zstandard / python-snappy
+    compressors = available_compressors(os.environ.get('MONGO_COMPRESSORS', 'zlib'))
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+        if "zlib" in compressors:
+            options["zlibCompressionLevel"] = env_int('MONGO_ZLIB_LEVEL', 6)
+    return {k: v for k, v in options.items() if v is not None}
+
+# 'mongo' (défaut) ou 'memory' (données en mémoire, pour les bancs d'essai et tests de charge)
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'mongo').lower()
+
+def create_storage():
+    if STORAGE_BACKEND == 'memory':
+        return MemoryStorage()
+    if STORAGE_BACKEND != 'mongo':
+        raise RuntimeError(f"Unknown STORAGE_BACKEND '{STORAGE_BACKEND}' (expected 'mongo' or 'memory')")
+    return MotorStorage(os.environ['MONGO_URL'], os.environ['DB_NAME'], **mongo_client_options())
+
+db = create_storage()
+
+# Nombre de connexions ouvertes d'avance au démarrage
+MONGO_WARMUP_CONNECTIONS = env_int('MONGO_WARMUP_CONNECTIONS', 5)
+
+# Seuils d'heures (alertes de dépassement)
+DAILY_HOURS_CAP_MINUTES = int(float(os.environ.get('DAILY_HOURS_CAP', '10')) * 60)
+WEEKLY_HOURS_CAP_MINUTES = int(float(os.environ.get('WEEKLY_HOURS_CAP', '39')) * 60)
+
+# Archivage des réassignations et tâches temporaires passées (voir section ARCHIVAL)
+ARCHIVE_HORIZON_DAYS = env_int('ARCHIVE_HORIZON_DAYS', 90)
+ARCHIVE_TTL_DAYS = env_int('ARCHIVE_TTL_DAYS', None)  # None = archive conservée indéfiniment
+ARCHIVE_INTERVAL_HOURS = env_int('ARCHIVE_INTERVAL_HOURS', 24)  # 0 = pas d'archivage automatique
+
+# Flux d'événements de modification (voir section CHANGE EVENTS)
+EVENTS_HISTORY_SIZE = env_int('EVENTS_HISTORY_SIZE', 1000)  # événements rejouables après une reconnexion
+EVENTS_QUEUE_SIZE = env_int('EVENTS_QUEUE_SIZE', 500)  # en attente par client avant resynchronisation
+EVENTS_KEEPALIVE_SECONDS = env_int('EVENTS_KEEPALIVE_SECONDS', 15)
+# Collections archivées et clé d'unicité de leurs documents dans l'archive
+ARCHIVED_COLLECTIONS = {
+    "temporary_reassignments": ("date", "assignment_id", "shift_id", "block_id"),
+    "temporary_tasks": ("id",),
+}
+
+# Scope ASGI de la requête en cours (pour nommer les mesures de sérialisation), fixé par CompressionMiddleware
+current_scope = ContextVar("current_scope", default=None)
+
+def route_name(scope: dict) -> str:
+    """
+    Template of the matched route without /api (e.g. /employees/{employee_id}), so that metrics
+    get one key per endpoint rather than one per URL; "unmatched" before routing or for unknown paths.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    return route.path[len("/api"):] or "/"
 
-app = FastAPI()
+class FastJSONResponse(JSONResponse):
+    """
+    JSON rendered by orjson when installed (standard encoder otherwise), timed under serialize.<route>.
+    Routes returning one directly skip FastAPI's jsonable_encoder pass over data read from the database.
+    """
+    
+    def render(self, content) -> bytes:
+        start = time.perf_counter()
+        try:
+            body = None
+            if orjson is not None:
+                try:
+                    body = orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+                except TypeError:
+                    pass  # Type inconnu d'orjson: encodeur standard
+            if body is None:
+                body = super().render(jsonable_encoder(content))
+            return body
+        finally:
+            scope = current_scope.get()
+            metrics.record(f"serialize.{route_name(scope) if scope else 'json'}", (time.perf_counter() - start) * 1000)
+
+app = FastAPI(default_response_class=FastJSONResponse)
 api_router = APIRouter(prefix="/api")
 
 # ============== MODELS ==============
@@ -115,6 +243,13 @@ class AssignmentCreate(BaseModel):
     end_date: str
     is_adapted: bool = False
 
+class AssignmentCloneRequest(BaseModel):
+    source_start_date: str
+    source_end_date: str
+    target_start_date: str
+    target_end_date: str
+    keep_employees: bool = True
+
 class TemporaryTask(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -166,12 +301,14 @@ class Holiday(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
     date: str
+    end_date: Optional[str] = None  # Fin de période (incluse) pour un congé de plusieurs jours
     type: str = "ferie"  # 'ferie' or 'conge'
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class HolidayCreate(BaseModel):
     name: str
     date: str
+    end_date: Optional[str] = None
     type: str = "ferie"
 
 # Réassignation temporaire - pour le Drag & Drop
@@ -213,6 +350,71 @@ def get_day_letter(date_str: str) -> str:
     days = ['L', 'M', 'W', 'J', 'V', 'S', 'D']
     return days[d.weekday()]
 
+DEFAULT_BLOCK_DAYS = ['L', 'M', 'W', 'J', 'V']
+DAY_BITS = {letter: 1 << i for i, letter in enumerate(['L', 'M', 'W', 'J', 'V', 'S', 'D'])}
+
+def days_to_mask(days: list) -> int:
+    """Weekday bitmask (L=1, M=2, W=4, J=8, V=16, S=32, D=64)"""
+    mask = 0
+    for letter in days:
+        mask |= DAY_BITS.get(letter, 0)
+    return mask
+
+def block_time_fields(block: dict) -> dict:
+    """Integer minutes stored with a block: raw times, times including HLP, and the days bitmask"""
+    start = time_to_minutes(block.get('start_time'))
+    end = time_to_minutes(block.get('end_time'))
+    return {
+        "start_min": start,
+        "end_min": end,
+        "hlp_start_min": start - (block.get('hlp_before') or 0),
+        "hlp_end_min": end + (block.get('hlp_after') or 0),
+        "days_mask": days_to_mask(block.get('days', DEFAULT_BLOCK_DAYS)),
+    }
+
+def task_time_fields(task: dict) -> dict:
+    """Integer minutes stored with a temporary task, and the bit of its weekday"""
+    fields = {
+        "start_min": time_to_minutes(task.get('start_time')),
+        "end_min": time_to_minutes(task.get('end_time')),
+    }
+    if task.get('date'):
+        fields["days_mask"] = DAY_BITS[get_day_letter(task['date'])]
+    return fields
+
+def add_shift_time_fields(shifts: list) -> list:
+    """Set the precomputed minute fields on every block of the shifts (in place)"""
+    for shift in shifts or []:
+        for block in shift.get('blocks', []):
+            block.update(block_time_fields(block))
+    return shifts
+
+def block_interval(block: dict) -> tuple:
+    """(start, end) minutes of a block including HLP"""
+    start = block.get('hlp_start_min')
+    end = block.get('hlp_end_min')
+    if start is None or end is None:
+        # Document non migré
+        start = time_to_minutes(block['start_time']) - block.get('hlp_before', 0)
+        end = time_to_minutes(block['end_time']) + block.get('hlp_after', 0)
+    return start, end
+
+def task_interval(task: dict) -> tuple:
+    """(start, end) minutes of a temporary task"""
+    start = task.get('start_min')
+    end = task.get('end_min')
+    if start is None or end is None:
+        start = time_to_minutes(task['start_time'])
+        end = time_to_minutes(task['end_time'])
+    return start, end
+
+def block_runs_on(block: dict, day_letter: str) -> bool:
+    """Whether a block applies on the given weekday letter"""
+    mask = block.get('days_mask')
+    if mask is None:
+        return day_letter in block.get('days', DEFAULT_BLOCK_DAYS)
+    return bool(mask & DAY_BITS[day_letter])
+
 def calculate_shift_duration(shift: dict, date_str: str = None, is_admin: bool = False) -> int:
     """Calculate total minutes for a shift"""
     if is_admin or shift.get('is_admin'):
@@ -223,11 +425,10 @@ def calculate_shift_duration(shift: dict, date_str: str = None, is_admin: bool =
     
     for block in shift.get('blocks', []):
         # Vérifier si le bloc s'applique à ce jour
-        if day_letter and day_letter not in block.get('days', ['L', 'M', 'W', 'J', 'V']):
+        if day_letter and not block_runs_on(block, day_letter):
             continue
-        start = time_to_minutes(block['start_time'])
-        end = time_to_minutes(block['end_time'])
-        total += (end - start) + block.get('hlp_before', 0) + block.get('hlp_after', 0)
+        start, end = block_interval(block)
+        total += end - start
     return total
 
 def merge_time_intervals(intervals: list) -> list:
@@ -270,18 +471,16 @@ def calculate_daily_hours_no_overlap(assignments: list, temp_tasks: list, date_s
             else:
                 for block in shift.get('blocks', []):
                     # Check if block applies to this day
-                    if day_letter not in block.get('days', ['L', 'M', 'W', 'J', 'V']):
+                    if not block_runs_on(block, day_letter):
                         continue
                     
-                    start = time_to_minutes(block['start_time']) - block.get('hlp_before', 0)
-                    end = time_to_minutes(block['end_time']) + block.get('hlp_after', 0)
+                    start, end = block_interval(block)
                     intervals.append((start, end))
     
     # Add temporary tasks
     for task in temp_tasks:
         if task.get('date') == date_str:
-            start = time_to_minutes(task['start_time'])
-            end = time_to_minutes(task['end_time'])
+            start, end = task_interval(task)
             intervals.append((start, end))
     
     # Check if holiday (admin shifts are not affected)
@@ -298,19 +497,17 @@ def calculate_daily_hours_no_overlap(assignments: list, temp_tasks: list, date_s
     
     return total
 
-def calculate_daily_hours_with_reassignments(
+def collect_daily_intervals_with_reassignments(
     emp_id: str,
     emp_assignments: list,
     emp_temp_tasks: list,
     date_str: str,
-    holidays: set,
     reassignment_index: dict,
     all_assignments: list
-) -> int:
+) -> tuple:
     """
-    Calculate total minutes worked considering temporary reassignments.
-    - Subtract hours for blocks reassigned AWAY from this employee
-    - Add hours for blocks reassigned TO this employee
+    Collect the (start, end) work intervals of an employee on a date, considering temporary reassignments.
+    Returns (intervals, has_admin_shift). Intervals are not merged.
     """
     day_letter = get_day_letter(date_str)
     
@@ -339,7 +536,7 @@ def calculate_daily_hours_with_reassignments(
             else:
                 for block in shift.get('blocks', []):
                     # Check if block applies to this day
-                    if day_letter not in block.get('days', ['L', 'M', 'W', 'J', 'V']):
+                    if not block_runs_on(block, day_letter):
                         continue
                     
                     # Check if this block was reassigned away
@@ -350,8 +547,7 @@ def calculate_daily_hours_with_reassignments(
                         # Reassigned away - skip this block
                         continue
                     
-                    start = time_to_minutes(block['start_time']) - block.get('hlp_before', 0)
-                    end = time_to_minutes(block['end_time']) + block.get('hlp_after', 0)
+                    start, end = block_interval(block)
                     intervals.append((start, end))
     
     # 2. Add blocks reassigned TO this employee from other employees
@@ -385,20 +581,38 @@ def calculate_daily_hours_with_reassignments(
                 block = next((b for b in shift.get('blocks', []) if b['id'] == block_id), None)
                 if block:
                     # Check if block applies to this day
-                    if day_letter not in block.get('days', ['L', 'M', 'W', 'J', 'V']):
+                    if not block_runs_on(block, day_letter):
                         continue
                     
-                    start = time_to_minutes(block['start_time']) - block.get('hlp_before', 0)
-                    end = time_to_minutes(block['end_time']) + block.get('hlp_after', 0)
+                    start, end = block_interval(block)
                     intervals.append((start, end))
     
     # 3. Add temporary tasks
     for task in emp_temp_tasks:
         if task.get('date') == date_str:
-            start = time_to_minutes(task['start_time'])
-            end = time_to_minutes(task['end_time'])
+            start, end = task_interval(task)
             intervals.append((start, end))
     
+    return intervals, has_admin_shift
+
+def calculate_daily_hours_with_reassignments(
+    emp_id: str,
+    emp_assignments: list,
+    emp_temp_tasks: list,
+    date_str: str,
+    holidays: set,
+    reassignment_index: dict,
+    all_assignments: list
+) -> int:
+    """
+    Calculate total minutes worked considering temporary reassignments.
+    - Subtract hours for blocks reassigned AWAY from this employee
+    - Add hours for blocks reassigned TO this employee
+    """
+    intervals, has_admin_shift = collect_daily_intervals_with_reassignments(
+        emp_id, emp_assignments, emp_temp_tasks, date_str, reassignment_index, all_assignments
+    )
+    
     # Check if holiday (admin shifts are not affected)
     if holidays and date_str in holidays:
         if has_admin_shift:
@@ -430,8 +644,7 @@ def calculate_daily_hours(assignments: list, temp_tasks: list, date_str: str, ho
     
     for task in temp_tasks:
         if task.get('date') == date_str:
-            start = time_to_minutes(task['start_time'])
-            end = time_to_minutes(task['end_time'])
+            start, end = task_interval(task)
             total += (end - start)
     return total
 
@@ -444,6 +657,763 @@ def format_hours_minutes(total_minutes: int) -> str:
     minutes = total_minutes % 60
     return f"{hours:02d}:{minutes:02d}"
 
+def get_week_dates(week_start: str = None) -> list:
+    """Get the Monday-Friday dates of the week containing week_start (or today)"""
+    if week_start:
+        reference = datetime.strptime(week_start, '%Y-%m-%d')
+    else:
+        reference = datetime.now()
+    # Trouver le lundi de la semaine
+    monday = reference - timedelta(days=reference.weekday())
+    return [(monday + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(5)]
+
+def build_reassignment_index(temp_reassignments: list) -> dict:
+    """Index temporary reassignments by key (date-assignment_id-shift_id-block_id)"""
+    reassignment_index = {}
+    for r in temp_reassignments:
+        key = f"{r['date']}-{r['assignment_id']}-{r['shift_id']}-{r.get('block_id') or ''}"
+        reassignment_index[key] = r
+    return reassignment_index
+
+def group_by_employee(items: list) -> dict:
+    """Group documents by their employee_id"""
+    grouped = {}
+    for item in items:
+        grouped.setdefault(item.get('employee_id'), []).append(item)
+    return grouped
+
+def next_date(date_str: str) -> str:
+    return (datetime.strptime(date_str, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+
+class AbsenceIndex:
+    """
+    Per-employee absences as sorted, disjoint date segments, each with the precomputed set of
+    absent shift types (an empty set means every shift, like an absence without shift_types).
+    Lookups are a bisect on the segment starts: O(log n).
+    """
+    
+    def __init__(self, absences: list):
+        self._segments = {
+            emp_id: self._build_segments(emp_absences)
+            for emp_id, emp_absences in group_by_employee(absences).items()
+        }
+    
+    @staticmethod
+    def _build_segments(absences: list) -> tuple:
+        # Boundaries where the set of active absences changes (end dates are inclusive)
+        boundaries = sorted({a['start_date'] for a in absences} | {next_date(a['end_date']) for a in absences})
+        starts, ends, shift_sets = [], [], []
+        for seg_start, seg_next in zip(boundaries, boundaries[1:]):
+            active = [a for a in absences if a['start_date'] <= seg_start <= a['end_date']]
+            if not active:
+                continue
+            if any(not a.get('shift_types') for a in active):
+                shift_types = frozenset()
+            else:
+                shift_types = frozenset(t for a in active for t in a['shift_types'])
+            starts.append(seg_start)
+            ends.append((datetime.strptime(seg_next, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d'))
+            shift_sets.append(shift_types)
+        return starts, ends, shift_sets
+    
+    def absent_shift_types(self, emp_id: str, date_str: str) -> Optional[frozenset]:
+        """None if not absent, an empty set if absent for every shift, else the absent shift types"""
+        segments = self._segments.get(emp_id)
+        if not segments:
+            return None
+        starts, ends, shift_sets = segments
+        i = bisect_right(starts, date_str) - 1
+        if i < 0 or date_str > ends[i]:
+            return None
+        return shift_sets[i]
+    
+    def is_absent(self, emp_id: str, date_str: str) -> bool:
+        return self.absent_shift_types(emp_id, date_str) is not None
+    
+    def is_absent_for_shift(self, emp_id: str, date_str: str, shift_name: str) -> bool:
+        return self.covers_shift(self.absent_shift_types(emp_id, date_str), shift_name)
+    
+    @staticmethod
+    def covers_shift(shift_types: Optional[frozenset], shift_name: str) -> bool:
+        if shift_types is None:
+            return False
+        return not shift_types or shift_name in shift_types
+
+def filter_active_for_date(emp_id: str, emp_assignments: list, emp_temp_tasks: list, absence_index: AbsenceIndex, date_str: str) -> tuple:
+    """
+    Keep the assignments (and shifts) an employee actually works on a date, given their absences.
+    Returns (active_assignments, active_tasks).
+    """
+    # Check absence for specific shifts
+    absent_shifts = absence_index.absent_shift_types(emp_id, date_str)
+    
+    # Filter assignments and tasks based on absence
+    active_assignments = []
+    for assignment in emp_assignments:
+        if not (assignment.get('start_date') <= date_str <= assignment.get('end_date')):
+            continue
+        
+        filtered_shifts = [
+            shift for shift in assignment.get('shifts', [])
+            if not AbsenceIndex.covers_shift(absent_shifts, shift.get('name'))
+        ]
+        if filtered_shifts:
+            active_assignments.append({**assignment, 'shifts': filtered_shifts})
+    
+    active_tasks = []
+    if absent_shifts is None:  # No tasks if absent
+        active_tasks = [t for t in emp_temp_tasks if t.get('date') == date_str]
+    
+    return active_assignments, active_tasks
+
+def compute_employee_hours(
+    emp_id: str,
+    emp_assignments: list,
+    emp_temp_tasks: list,
+    absence_index: AbsenceIndex,
+    dates: list,
+    holiday_dates: set,
+    reassignment_index: dict,
+    all_assignments: list
+) -> tuple:
+    """Compute (daily_hours, total) in minutes for an employee over a list of dates"""
+    daily_hours = {}
+    total = 0
+    
+    for date_str in dates:
+        if date_str in holiday_dates:
+            # Check if employee has admin shift (not affected by holidays)
+            has_admin = any(
+                any(s.get('is_admin') for s in a.get('shifts', []))
+                for a in emp_assignments
+                if a.get('start_date') <= date_str <= a.get('end_date')
+            )
+            if not has_admin:
+                daily_hours[date_str] = 0
+                continue
+        
+        active_assignments, active_tasks = filter_active_for_date(
+            emp_id, emp_assignments, emp_temp_tasks, absence_index, date_str
+        )
+        
+        # Calculate hours with temporary reassignments taken into account
+        day_minutes = calculate_daily_hours_with_reassignments(
+            emp_id=emp_id,
+            emp_assignments=active_assignments,
+            emp_temp_tasks=active_tasks,
+            date_str=date_str,
+            holidays=holiday_dates,
+            reassignment_index=reassignment_index,
+            all_assignments=all_assignments
+        )
+        
+        daily_hours[date_str] = day_minutes
+        total += day_minutes
+    
+    return daily_hours, total
+
+class FreeTimeIndex:
+    """
+    Per-day index of each employee's free intervals (sorted, disjoint).
+    Checking whether an employee is free for [start, end] is a bisect, O(log n).
+    """
+    DAY_END = 24 * 60
+    
+    def __init__(self, busy_by_employee: dict):
+        self._free = {}
+        for emp_id, busy in busy_by_employee.items():
+            starts, ends = [], []
+            cursor = 0
+            for start, end in merge_time_intervals(busy):
+                if start > cursor:
+                    starts.append(cursor)
+                    ends.append(start)
+                cursor = max(cursor, end)
+            if cursor < self.DAY_END:
+                starts.append(cursor)
+                ends.append(self.DAY_END)
+            self._free[emp_id] = (starts, ends)
+    
+    def __contains__(self, emp_id: str) -> bool:
+        return emp_id in self._free
+    
+    def copy(self) -> "FreeTimeIndex":
+        index = FreeTimeIndex({})
+        index._free = {emp_id: (list(starts), list(ends)) for emp_id, (starts, ends) in self._free.items()}
+        return index
+    
+    def is_free(self, emp_id: str, start: int, end: int) -> bool:
+        starts, ends = self._free.get(emp_id, ([0], [self.DAY_END]))
+        i = bisect_right(starts, start) - 1
+        return i >= 0 and ends[i] >= end
+    
+    def free_intervals(self, emp_id: str) -> list:
+        starts, ends = self._free.get(emp_id, ([0], [self.DAY_END]))
+        return list(zip(starts, ends))
+    
+    def reserve(self, emp_id: str, start: int, end: int):
+        """Mark [start, end] as busy; the employee must be free for it"""
+        starts, ends = self._free.setdefault(emp_id, ([0], [self.DAY_END]))
+        i = bisect_right(starts, start) - 1
+        free_start, free_end = starts[i], ends[i]
+        del starts[i], ends[i]
+        if end < free_end:
+            starts.insert(i, end)
+            ends.insert(i, free_end)
+        if free_start < start:
+            starts.insert(i, free_start)
+            ends.insert(i, start)
+
+def build_free_time_index(
+    employees: list,
+    assignments_by_emp: dict,
+    tasks_by_emp: dict,
+    absence_index: AbsenceIndex,
+    date_str: str,
+    reassignment_index: dict,
+    all_assignments: list
+) -> FreeTimeIndex:
+    """Build the free-time index of every employee for one date"""
+    busy_by_employee = {}
+    for emp in employees:
+        emp_id = emp['id']
+        active_assignments, active_tasks = filter_active_for_date(
+            emp_id,
+            assignments_by_emp.get(emp_id, []),
+            tasks_by_emp.get(emp_id, []),
+            absence_index,
+            date_str
+        )
+        intervals, _ = collect_daily_intervals_with_reassignments(
+            emp_id, active_assignments, active_tasks, date_str, reassignment_index, all_assignments
+        )
+        busy_by_employee[emp_id] = intervals
+    return FreeTimeIndex(busy_by_employee)
+
+def get_item_interval(assignment: dict, shift: dict, block: Optional[dict]) -> tuple:
+    """Paid (start, end) minutes of a block including HLP, or of an admin shift"""
+    if shift.get('is_admin') or block is None:
+        admin_hours = shift.get('admin_hours', 8)
+        return (6 * 60, 6 * 60 + admin_hours * 60)
+    start, end = block_interval(block)
+    return (start, end)
+
+def compute_week_hours(
+    employees: list,
+    assignments_by_emp: dict,
+    tasks_by_emp: dict,
+    absence_index: AbsenceIndex,
+    week_dates: list,
+    holiday_dates: set,
+    reassignment_index: dict,
+    all_assignments: list
+) -> dict:
+    """Compute {employee_id: (daily_hours, weekly_total)} for every employee"""
+    week_hours = {}
+    for emp in employees:
+        emp_id = emp['id']
+        week_hours[emp_id] = compute_employee_hours(
+            emp_id, assignments_by_emp.get(emp_id, []), tasks_by_emp.get(emp_id, []),
+            absence_index, week_dates, holiday_dates, reassignment_index, all_assignments
+        )
+    return week_hours
+
+def get_cap_overruns(daily_hours: dict, weekly_total: int, daily_cap: int, weekly_cap: int) -> dict:
+    """Dates over the daily cap and whether the week is over the weekly cap (all in minutes)"""
+    return {
+        "daily": [d for d, minutes in sorted(daily_hours.items()) if minutes > daily_cap],
+        "weekly": weekly_total > weekly_cap
+    }
+
+class CollectionStateCache:
+    """
+    Entries computed for one state of the collections (their storage versions, as in the ETags):
+    a write changes the state, which empties the cache. Callers take the state before loading the
+    data an entry is computed from.
+    """
+    MAX_ENTRIES = 16
+    
+    def __init__(self):
+        self.state = None
+        self._entries = {}
+    
+    @staticmethod
+    def current_state() -> tuple:
+        return tuple(db.version(name) for name in SCHEDULE_COLLECTIONS)
+    
+    def get(self, key, state: tuple):
+        # Un état antérieur à une écriture, même venue d'une autre instance, ne correspond plus
+        if state != self.state or state != self.current_state():
+            return None
+        return self._entries.get(key)
+    
+    def put(self, key, value, state: tuple):
+        if state != self.current_state():
+            return
+        if state != self.state:
+            self.state = state
+            self._entries.clear()
+        if len(self._entries) >= self.MAX_ENTRIES:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = value
+
+class WeekHoursCache(CollectionStateCache):
+    """Computed (daily_hours, weekly_total) per employee, by week"""
+    
+    def get_or_compute(self, week_dates: list, state: tuple, employees: list, assignments_by_emp: dict,
+                       tasks_by_emp: dict, absence_index: AbsenceIndex, holiday_dates: set,
+                       reassignment_index: dict, all_assignments: list) -> dict:
+        """Hours of every loaded employee: from the cache, or computed (and cached)"""
+        week_hours = self.get(tuple(week_dates), state)
+        if week_hours is None:
+            week_hours = compute_week_hours(
+                employees, assignments_by_emp, tasks_by_emp, absence_index,
+                week_dates, holiday_dates, reassignment_index, all_assignments
+            )
+            self.put(tuple(week_dates), week_hours, state)
+            return week_hours
+        missing = [emp for emp in employees if emp['id'] not in week_hours]
+        if missing:
+            # Employé absent de l'entrée: calculé avec les données chargées, sans modifier le cache
+            week_hours = {**week_hours, **compute_week_hours(
+                missing, assignments_by_emp, tasks_by_emp, absence_index,
+                week_dates, holiday_dates, reassignment_index, all_assignments
+            )}
+        return week_hours
+
+week_hours_cache = WeekHoursCache()
+
+class FreeTimeIndexCache(CollectionStateCache):
+    """Free-time index of every employee, by date (the solver reserves time in a copy)"""
+    
+    def get_or_build(self, date_str: str, state: tuple, employees: list, assignments_by_emp: dict,
+                     tasks_by_emp: dict, absence_index: AbsenceIndex, reassignment_index: dict,
+                     all_assignments: list) -> FreeTimeIndex:
+        """Index covering every loaded employee: from the cache, or built (and cached)"""
+        index = self.get(date_str, state)
+        if index is not None and all(emp['id'] in index for emp in employees):
+            return index
+        index = build_free_time_index(
+            employees, assignments_by_emp, tasks_by_emp, absence_index,
+            date_str, reassignment_index, all_assignments
+        )
+        self.put(date_str, index, state)
+        return index
+
+free_time_cache = FreeTimeIndexCache()
+
+def date_range(start_date: str, end_date: str) -> list:
+    """Every date from start_date to end_date (inclusive)"""
+    current = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+    dates = []
+    while current <= end:
+        dates.append(current.strftime('%Y-%m-%d'))
+        current += timedelta(days=1)
+    return dates
+
+class HolidayCalendar:
+    """
+    Holidays (single dates or periods) expanded to a date set, cached in memory for one
+    storage version of the holidays collection (a write, even from another instance, changes it).
+    """
+    
+    def __init__(self):
+        self._version = None
+        self._dates = None
+    
+    async def load(self) -> "HolidayCalendar":
+        """Load the expanded dates once per version; the returned calendar can then be queried synchronously"""
+        version = db.version("holidays")
+        if self._dates is not None and self._version == version:
+            return self
+        holidays = await db.holidays.find({}, {"_id": 0, "date": 1, "end_date": 1}).to_list(None)
+        dates = set()
+        for h in holidays:
+            dates.update(date_range(h['date'], h.get('end_date') or h['date']))
+        # Une écriture pendant le chargement: ne pas mettre en cache un calendrier périmé
+        calendar = self if version == db.version("holidays") else HolidayCalendar()
+        calendar._version = version
+        calendar._dates = frozenset(dates)
+        return calendar
+    
+    @property
+    def dates(self) -> frozenset:
+        return self._dates or frozenset()
+    
+    def is_holiday(self, date_str: str) -> bool:
+        return date_str in self.dates
+    
+    def business_days(self, start_date: str, end_date: str, include_holidays: bool = False) -> list:
+        """Weekdays from start_date to end_date (inclusive), without holidays unless asked"""
+        return [
+            d for d in date_range(start_date, end_date)
+            if not is_weekend(d) and (include_holidays or not self.is_holiday(d))
+        ]
+
+holiday_calendar = HolidayCalendar()
+
+class PayloadMetrics:
+    """Response body size before and after compression (bytes) per route, summarized by GET /api/metrics"""
+    MAX_SAMPLES = 500
+    
+    def __init__(self):
+        self._samples = {}
+        self._counts = {}
+    
+    def record(self, name: str, body_bytes: int, sent_bytes: int):
+        self._samples.setdefault(name, deque(maxlen=self.MAX_SAMPLES)).append((body_bytes, sent_bytes))
+        self._counts[name] = self._counts.get(name, 0) + 1
+    
+    def summary(self) -> dict:
+        result = {}
+        for name, samples in sorted(self._samples.items()):
+            body = sum(b for b, _ in samples)
+            sent = sum(s for _, s in samples)
+            result[name] = {
+                "count": self._counts[name],
+                "last_bytes": samples[-1][0],
+                "last_sent_bytes": samples[-1][1],
+                "avg_bytes": round(body / len(samples)),
+                "avg_sent_bytes": round(sent / len(samples)),
+                "max_bytes": max(b for b, _ in samples),
+                "compression_ratio": round(sent / body, 3) if body else 1.0
+            }
+        return result
+
+payload_metrics = PayloadMetrics()
+
+class LatencyMetrics:
+    """Recent latency samples (ms) per operation, summarized by GET /api/metrics"""
+    MAX_SAMPLES = 500
+    
+    def __init__(self):
+        self._samples = {}
+        self._counts = {}
+    
+    def record(self, name: str, elapsed_ms: float):
+        self._samples.setdefault(name, deque(maxlen=self.MAX_SAMPLES)).append(elapsed_ms)
+        self._counts[name] = self._counts.get(name, 0) + 1
+    
+    def summary(self) -> dict:
+        result = {}
+        for name, samples in sorted(self._samples.items()):
+            ordered = sorted(samples)
+            result[name] = {
+                "count": self._counts[name],
+                "last_ms": round(samples[-1], 2),
+                "avg_ms": round(sum(ordered) / len(ordered), 2),
+                "p50_ms": round(ordered[len(ordered) // 2], 2),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+                "max_ms": round(ordered[-1], 2)
+            }
+        return result
+
+metrics = LatencyMetrics()
+
+async def timed(name: str, awaitable):
+    """Await and record the latency under name"""
+    start = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        metrics.record(name, (time.perf_counter() - start) * 1000)
+
+def archive_name(collection_name: str) -> str:
+    return f"{collection_name}_archive"
+
+def archive_cutoff() -> str:
+    """Records dated before this day belong in the archive collections"""
+    return (datetime.now() - timedelta(days=ARCHIVE_HORIZON_DAYS)).strftime('%Y-%m-%d')
+
+# Date la plus récente déjà archivée, par collection (si l'horizon a été allongé depuis)
+archive_watermarks = {}
+
+def dated_query(start_date: str = None, end_date: str = None, query: dict = None) -> dict:
+    query = dict(query or {})
+    date_range = {}
+    if start_date:
+        date_range["$gte"] = start_date
+    if end_date:
+        date_range["$lte"] = end_date
+    if date_range:
+        query["date"] = date_range
+    return query
+
+def dated_sources(collection_name: str, start_date: str = None) -> list:
+    """The collection, preceded by its archive when the range starts before what the archive may contain"""
+    archived_until = max(archive_cutoff(), archive_watermarks.get(collection_name, ""))
+    if not start_date or start_date <= archived_until:
+        return [archive_name(collection_name), collection_name]
+    return [collection_name]
+
+async def find_dated(collection_name: str, start_date: str = None, end_date: str = None, query: dict = None) -> list:
+    """
+    Documents of temporary_reassignments or temporary_tasks dated between start_date and end_date
+    (inclusive), from the archive too when needed.
+    """
+    query = dated_query(start_date, end_date, query)
+    sources = dated_sources(collection_name, start_date)
+    results = await asyncio.gather(*[
+        db[name].find(query, {"_id": 0, "archived_at": 0}).to_list(None) for name in sources
+    ])
+    # Archive d'abord: une version encore présente dans la collection active l'emporte
+    documents = {}
+    for docs in results:
+        for doc in docs:
+            documents[doc['id']] = doc
+    return list(documents.values())
+
+async def delete_dated(collection_name: str, start_date: str = None, end_date: str = None, query: dict = None) -> int:
+    """One delete_many per source (collection, and its archive when the range reaches it); at least one filter is required"""
+    if not (start_date or end_date or query):
+        raise HTTPException(status_code=400, detail="Au moins un filtre est requis")
+    query = dated_query(start_date, end_date, query)
+    results = await asyncio.gather(*[
+        db[name].delete_many(query) for name in dated_sources(collection_name, start_date)
+    ])
+    return sum(r.deleted_count for r in results)
+
+# Taille maximale d'une page des routes de liste
+LIST_PAGE_MAX = 500
+
+def id_list(ids: str) -> list:
+    return [i for i in ids.split(',') if i]
+
+def period_query(start_date: str = None, end_date: str = None, query: dict = None) -> dict:
+    """Documents whose start_date..end_date period overlaps the given range"""
+    query = dict(query or {})
+    if start_date:
+        query["end_date"] = {"$gte": start_date}
+    if end_date:
+        query["start_date"] = {"$lte": end_date}
+    return query
+
+def parse_sort(sort: str, allowed: tuple) -> tuple:
+    """(field, direction) from "field" or "-field" (descending); defaults to the first allowed field"""
+    if not sort:
+        return allowed[0], ASCENDING
+    field, direction = (sort[1:], DESCENDING) if sort.startswith("-") else (sort, ASCENDING)
+    if field not in allowed:
+        raise HTTPException(status_code=400, detail=f"Tri non supporté: {sort}")
+    return field, direction
+
+def parse_fields(fields: str, model) -> Optional[list]:
+    """Field names of a fields=a,b,c parameter, checked against the model (None = whole documents)"""
+    if not fields:
+        return None
+    names = id_list(fields)
+    unknown = [name for name in names if name not in model.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Champ inconnu: {', '.join(unknown)}")
+    return names
+
+def json_response(docs: list, response: Response) -> FastJSONResponse:
+    """
+    Documents read from the database, returned as is: no response_model validation nor jsonable_encoder
+    pass (partial documents could not be validated anyway). Headers set on response are kept.
+    """
+    return FastJSONResponse(docs, headers=dict(response.headers))
+
+def encode_cursor(doc: dict, field: str) -> str:
+    raw = json.dumps([doc.get(field), doc["id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def keyset_query(query: dict, field: str, direction: int, cursor: str) -> dict:
+    """
+    Restrict query to the documents after the cursor, in (field, id) order. A null or missing
+    field sorts before every value (as in MongoDB), so it cannot be compared with $gt/$lt.
+    """
+    try:
+        value, last_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Curseur invalide")
+    op = "$gt" if direction == ASCENDING else "$lt"
+    same_value = {field: value, "id": {op: last_id}}
+    if value is None:
+        # Croissant: les autres nuls, puis toutes les valeurs; décroissant: les nuls restants seulement
+        after = {"$or": [same_value, {field: {"$ne": None}}]} if direction == ASCENDING else same_value
+    elif direction == ASCENDING:
+        after = {"$or": [{field: {op: value}}, same_value]}
+    else:
+        after = {"$or": [{field: {op: value}}, same_value, {field: None}]}
+    return {"$and": [query, after]} if query else after
+
+async def find_page(sources: list, query: dict, sort: tuple, response: Response,
+                    limit: int = None, cursor: str = None, fields: list = None) -> list:
+    """
+    Documents of the source collections matching query, in (sort field, id) order.
+    With a limit, one page is returned and the cursor of the next one is sent in X-Next-Cursor.
+    With fields, only those are read (plus id and the sort field, which the cursor needs).
+    """
+    field, direction = sort
+    if limit is not None:
+        if limit < 1:
+            raise HTTPException(status_code=400, detail="La limite doit être positive")
+        limit = min(limit, LIST_PAGE_MAX)
+    if cursor:
+        query = keyset_query(query, field, direction, cursor)
+    order = [(field, direction), ("id", direction)]
+    if fields:
+        projection = {"_id": 0, "id": 1, field: 1, **{name: 1 for name in fields}}
+    else:
+        projection = {"_id": 0, "archived_at": 0}
+    finds = []
+    for name in sources:
+        find = db[name].find(query, projection).sort(order)
+        finds.append(find.limit(limit + 1) if limit else find)
+    results = await asyncio.gather(*[find.to_list(None) for find in finds])
+    # Archive d'abord: une version encore présente dans la collection active l'emporte
+    documents = {}
+    for docs in results:
+        for doc in docs:
+            documents[doc['id']] = doc
+    page = list(documents.values())
+    if len(results) > 1:
+        page.sort(key=lambda d: (d.get(field) is not None, d.get(field) or "", d['id']), reverse=direction == DESCENDING)
+    if limit and len(page) > limit:
+        page = page[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(page[-1], field)
+    return page
+
+async def load_schedule_collections(dates: list) -> tuple:
+    """
+    Load every collection the hours engine needs for the given dates, concurrently (holidays come
+    from the cached calendar; reassignments and tasks are limited to the date range).
+    Each load is timed under load.<collection>, the whole under load.schedule_collections.
+    """
+    start = time.perf_counter()
+    first, last = min(dates), max(dates)
+    employees, assignments, temp_tasks, absences, calendar, temp_reassignments = await asyncio.gather(
+        timed("load.employees", db.employees.find({}, {"_id": 0}).to_list(None)),
+        timed("load.assignments", db.assignments.find({}, {"_id": 0}).to_list(None)),
+        timed("load.temporary_tasks", find_dated("temporary_tasks", first, last)),
+        timed("load.absences", db.absences.find({}, {"_id": 0}).to_list(None)),
+        timed("load.holidays", holiday_calendar.load()),
+        timed("load.temporary_reassignments", find_dated("temporary_reassignments", first, last)),
+    )
+    metrics.record("load.schedule_collections", (time.perf_counter() - start) * 1000)
+    return employees, assignments, temp_tasks, absences, calendar.dates, temp_reassignments
+
+async def get_week_hours(week_dates: list) -> dict:
+    """Week hours from the cache, or computed once by the hours engine and cached"""
+    state = week_hours_cache.current_state()
+    week_hours = week_hours_cache.get(tuple(week_dates), state)
+    if week_hours is not None:
+        return week_hours
+    
+    employees, assignments, temp_tasks, absences, holiday_dates, temp_reassignments = await load_schedule_collections(week_dates)
+    return week_hours_cache.get_or_compute(
+        week_dates, state, employees, group_by_employee(assignments), group_by_employee(temp_tasks),
+        AbsenceIndex(absences), holiday_dates,
+        build_reassignment_index(temp_reassignments), assignments
+    )
+
+# ============== CHANGE EVENTS ==============
+
+class LocalBackplane:
+    """
+    Fan-out between API instances. This stand-in only loops back to the current process; with several
+    instances it would be replaced by a shared channel (Redis pub/sub, MongoDB change stream) with the
+    same publish/subscribe interface.
+    """
+    
+    def __init__(self):
+        self._handlers = []
+    
+    def subscribe(self, handler):
+        self._handlers.append(handler)
+    
+    def publish(self, event: dict):
+        for handler in self._handlers:
+            handler(event)
+
+class ChangeBroker:
+    """
+    Compact change events for the connected clients (GET /api/events). Each event gets a sequence
+    id; the latest ones are kept so that a reconnecting client (Last-Event-ID) catches up. A client
+    that falls too far behind is sent a resync event instead.
+    """
+    
+    def __init__(self, backplane):
+        self.backplane = backplane
+        self.last_id = 0
+        self.history = deque(maxlen=EVENTS_HISTORY_SIZE)
+        self._queues = set()
+        backplane.subscribe(self._deliver)
+    
+    def publish(self, event_type: str, **data):
+        # Client à l'origine de l'écriture (en-tête X-Client-Id): il ignore ses propres événements
+        scope = current_scope.get()
+        client_id = Headers(scope=scope).get("x-client-id") if scope else None
+        self.backplane.publish({"type": event_type, "origin": db.epoch, "client_id": client_id, **data})
+    
+    def _deliver(self, event: dict):
+        if event.get("origin") != db.epoch:
+            # Écriture d'une autre instance: les ETag et les heures en cache de celle-ci sont périmés
+            # (y compris pour les collections que cette instance n'a jamais écrites)
+            db.touch(*set(db.versions).union(*ROUTE_COLLECTIONS.values()))
+        self.last_id += 1
+        event = {**event, "id": self.last_id}
+        self.history.append(event)
+        for queue in list(self._queues):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Client trop lent: vider sa file, il doit tout recharger
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait({"type": "resync", "id": self.last_id})
+    
+    def subscribe(self, last_event_id: Optional[int] = None) -> asyncio.Queue:
+        """Queue of the events after last_event_id (or from now on)"""
+        queue = asyncio.Queue(maxsize=EVENTS_QUEUE_SIZE)
+        if last_event_id is not None and last_event_id < self.last_id:
+            missed = [e for e in self.history if e["id"] > last_event_id]
+            if not missed or missed[0]["id"] != last_event_id + 1 or len(missed) >= EVENTS_QUEUE_SIZE:
+                queue.put_nowait({"type": "resync", "id": self.last_id})
+            else:
+                for event in missed:
+                    queue.put_nowait(event)
+        self._queues.add(queue)
+        return queue
+    
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._queues.discard(queue)
+
+change_events = ChangeBroker(LocalBackplane())
+
+def format_sse(event: dict) -> str:
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+@api_router.get("/events")
+async def stream_events(request: Request):
+    """
+    Server-Sent Events stream of changes: reassignment.* and task.* events carry the affected
+    document or filters, resource.changed the resource of any other write.
+    """
+    last_event_id = request.headers.get("last-event-id")
+    queue = change_events.subscribe(int(last_event_id) if last_event_id and last_event_id.isdigit() else None)
+    
+    async def stream():
+        try:
+            # Conseil de reconnexion au client (ms)
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            change_events.unsubscribe(queue)
+    
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 # ============== AUTH ROUTES ==============
 
 @api_router.post("/auth/login")
@@ -458,78 +1428,156 @@ async def get_admins():
     admins = await db.admins.find({}, {"_id": 0}).to_list(100)
     return admins
 
+# ============== DENORMALIZED NAMES ==============
+
+# Une propagation à la fois par employé/école: chaque tâche relit la valeur courante
+propagation_locks = defaultdict(asyncio.Lock)
+
+async def propagate_employee_name(employee_id: str) -> dict:
+    """
+    Copy the current name of an employee to the assignments, temporary tasks and absences
+    that store it. Only documents holding a stale copy are written.
+    """
+    async with propagation_locks[("employee", employee_id)]:
+        employee = await db.employees.find_one({"id": employee_id}, {"_id": 0, "name": 1})
+        if not employee:
+            return {}
+        name = employee.get('name', '')
+        stale = {"employee_id": employee_id, "employee_name": {"$ne": name}}
+        updated = {}
+        for collection_name in ("assignments", "temporary_tasks", "absences"):
+            result = await db[collection_name].update_many(stale, {"$set": {"employee_name": name}})
+            updated[collection_name] = result.modified_count
+        return updated
+
+async def propagate_school_details(school_id: str) -> dict:
+    """
+    Copy the current name and color of a school to the blocks and temporary tasks that store them.
+    Assignments are rewritten in one bulk write, each update conditioned on the shifts it was built from.
+    """
+    async with propagation_locks[("school", school_id)]:
+        school = await db.schools.find_one({"id": school_id}, {"_id": 0, "name": 1, "color": 1})
+        if not school:
+            return {}
+        details = {"school_name": school.get('name', ''), "school_color": school.get('color', '#4CAF50')}
+        stale = {"$or": [{k: {"$ne": v}} for k, v in details.items()]}
+        
+        operations = []
+        async for assignment in db.assignments.find(
+            {"shifts.blocks": {"$elemMatch": {"school_id": school_id, **stale}}},
+            {"_id": 0, "id": 1, "shifts": 1}
+        ):
+            original = assignment['shifts']
+            shifts = copy.deepcopy(original)
+            for shift in shifts:
+                for block in shift.get('blocks', []):
+                    if block.get('school_id') == school_id:
+                        block.update(details)
+            operations.append(UpdateOne({"id": assignment['id'], "shifts": original}, {"$set": {"shifts": shifts}}))
+        updated = {"assignments": 0}
+        if operations:
+            result = await db.assignments.bulk_write(operations, ordered=False)
+            updated["assignments"] = result.modified_count
+        
+        result = await db.temporary_tasks.update_many({"school_id": school_id, **stale}, {"$set": details})
+        updated["temporary_tasks"] = result.modified_count
+        return updated
+
+async def run_propagation(name: str, job, *args) -> None:
+    """Background task wrapper: time the job and log (not raise) failures"""
+    try:
+        updated = await timed(name, job(*args))
+        if any(updated.values()):
+            logger.info(f"{name}: {updated}")
+    except PyMongoError as e:
+        logger.error(f"{name} failed: {e}")
+
 # ============== EMPLOYEE ROUTES ==============
 
+EMPLOYEE_SORTS = ("name", "hire_date")
+
 @api_router.get("/employees", response_model=List[Employee])
-async def get_employees():
-    employees = await db.employees.find({}, {"_id": 0}).to_list(200)
-    return employees
+async def get_employees(response: Response, inactive: Optional[bool] = None, sort: str = None,
+                        limit: int = None, cursor: str = None, fields: str = None):
+    """Employees sorted by name or hire_date (-field for descending), optionally by status, paginated or projected"""
+    query = {}
+    if inactive is not None:
+        query["is_inactive"] = True if inactive else {"$ne": True}
+    projection = parse_fields(fields, Employee)
+    employees = await find_page(["employees"], query, parse_sort(sort, EMPLOYEE_SORTS), response, limit, cursor, projection)
+    return json_response(employees, response) if projection else employees
+
+# Champs uniques, dans l'ordre où les doublons sont signalés
+EMPLOYEE_DUPLICATE_MESSAGES = {
+    "matricule": "Ce matricule existe déjà",
+    "email": "Ce courriel existe déjà",
+    "phone": "Ce téléphone existe déjà",
+    "berline": "Cette berline est déjà utilisée par un employé actif",
+}
+
+async def check_employee_duplicates(data: EmployeeCreate, exclude_id: str = None):
+    """Check matricule, email, phone and berline collisions with a single $or query"""
+    clauses = [{field: getattr(data, field)} for field in ("matricule", "email", "phone") if getattr(data, field)]
+    # Permettre les doublons de berline si l'un des deux est inactif
+    if data.berline and not data.is_inactive:
+        clauses.append({"berline": data.berline, "is_inactive": {"$ne": True}})
+    if not clauses:
+        return
+    
+    query = {"$or": clauses}
+    if exclude_id:
+        query["id"] = {"$ne": exclude_id}
+    projection = {"_id": 0, "matricule": 1, "email": 1, "phone": 1, "berline": 1, "is_inactive": 1}
+    existing = await db.employees.find(query, projection).to_list(None)
+    
+    for field, message in EMPLOYEE_DUPLICATE_MESSAGES.items():
+        value = getattr(data, field)
+        for other in existing:
+            if not value or other.get(field) != value:
+                continue
+            if field == "berline" and other.get('is_inactive'):
+                continue
+            raise HTTPException(status_code=400, detail=message)
+
+def duplicate_employee_error(e: DuplicateKeyError) -> HTTPException:
+    """Translate a unique index violation (concurrent write) into the duplicate message"""
+    key_pattern = (e.details or {}).get('keyPattern', {})
+    for field, message in EMPLOYEE_DUPLICATE_MESSAGES.items():
+        if field in key_pattern:
+            return HTTPException(status_code=400, detail=message)
+    return HTTPException(status_code=400, detail="Cet employé existe déjà")
 
 @api_router.post("/employees", response_model=Employee)
 async def create_employee(data: EmployeeCreate):
     # Vérifier les doublons
-    if data.matricule:
-        existing = await db.employees.find_one({"matricule": data.matricule}, {"_id": 0})
-        if existing:
-            raise HTTPException(status_code=400, detail="Ce matricule existe déjà")
-    
-    if data.email:
-        existing = await db.employees.find_one({"email": data.email}, {"_id": 0})
-        if existing:
-            raise HTTPException(status_code=400, detail="Ce courriel existe déjà")
-    
-    if data.phone:
-        existing = await db.employees.find_one({"phone": data.phone}, {"_id": 0})
-        if existing:
-            raise HTTPException(status_code=400, detail="Ce téléphone existe déjà")
-    
-    # Permettre les doublons de berline si l'un des deux est inactif
-    if data.berline:
-        existing = await db.employees.find_one({"berline": data.berline, "is_inactive": {"$ne": True}}, {"_id": 0})
-        if existing and not data.is_inactive:
-            raise HTTPException(status_code=400, detail="Cette berline est déjà utilisée par un employé actif")
+    await check_employee_duplicates(data)
     
     employee = Employee(**data.model_dump())
     doc = employee.model_dump()
     doc['created_at'] = doc['created_at'].isoformat()
-    await db.employees.insert_one(doc)
+    try:
+        await db.employees.insert_one(doc)
+    except DuplicateKeyError as e:
+        raise duplicate_employee_error(e)
     return employee
 
 @api_router.put("/employees/{employee_id}", response_model=Employee)
-async def update_employee(employee_id: str, data: EmployeeCreate):
+async def update_employee(employee_id: str, data: EmployeeCreate, background_tasks: BackgroundTasks):
     # Vérifier les doublons (sauf pour l'employé actuel)
-    if data.matricule:
-        existing = await db.employees.find_one({"matricule": data.matricule, "id": {"$ne": employee_id}}, {"_id": 0})
-        if existing:
-            raise HTTPException(status_code=400, detail="Ce matricule existe déjà")
-    
-    if data.email:
-        existing = await db.employees.find_one({"email": data.email, "id": {"$ne": employee_id}}, {"_id": 0})
-        if existing:
-            raise HTTPException(status_code=400, detail="Ce courriel existe déjà")
-    
-    if data.phone:
-        existing = await db.employees.find_one({"phone": data.phone, "id": {"$ne": employee_id}}, {"_id": 0})
-        if existing:
-            raise HTTPException(status_code=400, detail="Ce téléphone existe déjà")
-    
-    # Permettre les doublons de berline si l'un des deux est inactif
-    if data.berline:
-        existing = await db.employees.find_one({
-            "berline": data.berline, 
-            "id": {"$ne": employee_id},
-            "is_inactive": {"$ne": True}
-        }, {"_id": 0})
-        if existing and not data.is_inactive:
-            raise HTTPException(status_code=400, detail="Cette berline est déjà utilisée par un employé actif")
-    
-    result = await db.employees.update_one(
-        {"id": employee_id},
-        {"$set": data.model_dump()}
-    )
-    if result.matched_count == 0:
+    await check_employee_duplicates(data, exclude_id=employee_id)
+    
+    try:
+        employee = await db.employees.find_one_and_update(
+            {"id": employee_id},
+            {"$set": data.model_dump()},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError as e:
+        raise duplicate_employee_error(e)
+    if employee is None:
         raise HTTPException(status_code=404, detail="Employé non trouvé")
-    employee = await db.employees.find_one({"id": employee_id}, {"_id": 0})
+    background_tasks.add_task(run_propagation, "propagate.employee_name", propagate_employee_name, employee_id)
     return employee
 
 @api_router.delete("/employees/{employee_id}")
@@ -542,9 +1590,11 @@ async def delete_employee(employee_id: str):
 # ============== SCHOOL ROUTES ==============
 
 @api_router.get("/schools", response_model=List[School])
-async def get_schools():
-    schools = await db.schools.find({}, {"_id": 0}).to_list(200)
-    return schools
+async def get_schools(response: Response, fields: str = None):
+    """Schools sorted by name, optionally projected"""
+    projection = parse_fields(fields, School)
+    schools = await find_page(["schools"], {}, ("name", ASCENDING), response, fields=projection)
+    return json_response(schools, response) if projection else schools
 
 @api_router.post("/schools", response_model=School)
 async def create_school(data: SchoolCreate):
@@ -555,14 +1605,16 @@ async def create_school(data: SchoolCreate):
     return school
 
 @api_router.put("/schools/{school_id}", response_model=School)
-async def update_school(school_id: str, data: SchoolCreate):
-    result = await db.schools.update_one(
+async def update_school(school_id: str, data: SchoolCreate, background_tasks: BackgroundTasks):
+    school = await db.schools.find_one_and_update(
         {"id": school_id},
-        {"$set": data.model_dump()}
+        {"$set": data.model_dump()},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
     )
-    if result.matched_count == 0:
+    if school is None:
         raise HTTPException(status_code=404, detail="École non trouvée")
-    school = await db.schools.find_one({"id": school_id}, {"_id": 0})
+    background_tasks.add_task(run_propagation, "propagate.school_details", propagate_school_details, school_id)
     return school
 
 @api_router.delete("/schools/{school_id}")
@@ -574,10 +1626,25 @@ async def delete_school(school_id: str):
 
 # ============== ASSIGNMENT ROUTES ==============
 
+ASSIGNMENT_SORTS = ("circuit_number", "start_date")
+
 @api_router.get("/assignments")
-async def get_assignments():
-    assignments = await db.assignments.find({}, {"_id": 0}).to_list(500)
-    return assignments
+async def get_assignments(response: Response, start_date: str = None, end_date: str = None, employee_ids: str = "",
+                          search: str = None, sort: str = None, limit: int = None, cursor: str = None,
+                          fields: str = None):
+    """
+    Assignments whose period overlaps the range, optionally for some employees or matching search
+    (circuit number or employee name, case-insensitive), sorted, paginated and projected
+    """
+    query = period_query(start_date, end_date)
+    if employee_ids:
+        query["employee_id"] = {"$in": id_list(employee_ids)}
+    if search:
+        pattern = {"$regex": re.escape(search), "$options": "i"}
+        query["$or"] = [{"circuit_number": pattern}, {"employee_name": pattern}]
+    page = await find_page(["assignments"], query, parse_sort(sort, ASSIGNMENT_SORTS), response, limit, cursor,
+                           parse_fields(fields, Assignment))
+    return json_response(page, response)
 
 @api_router.post("/assignments")
 async def create_assignment(data: AssignmentCreate):
@@ -598,6 +1665,7 @@ async def create_assignment(data: AssignmentCreate):
     )
     doc = assignment.model_dump()
     doc['created_at'] = doc['created_at'].isoformat()
+    add_shift_time_fields(doc['shifts'])
     await db.assignments.insert_one(doc)
     return assignment.model_dump()
 
@@ -607,14 +1675,17 @@ async def update_assignment(assignment_id: str, data: dict):
         employee = await db.employees.find_one({"id": data['employee_id']}, {"_id": 0})
         if employee:
             data['employee_name'] = employee.get('name', '')
+    if 'shifts' in data:
+        add_shift_time_fields(data['shifts'])
     
-    result = await db.assignments.update_one(
+    assignment = await db.assignments.find_one_and_update(
         {"id": assignment_id},
-        {"$set": data}
+        {"$set": data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
     )
-    if result.matched_count == 0:
+    if assignment is None:
         raise HTTPException(status_code=404, detail="Assignation non trouvée")
-    assignment = await db.assignments.find_one({"id": assignment_id}, {"_id": 0})
     return assignment
 
 @api_router.delete("/assignments/{assignment_id}")
@@ -624,12 +1695,88 @@ async def delete_assignment(assignment_id: str):
         raise HTTPException(status_code=404, detail="Assignation non trouvée")
     return {"success": True}
 
+CLONE_CHUNK_SIZE = 500
+
+def shift_date(date_str: str, days: int) -> str:
+    return (datetime.strptime(date_str, '%Y-%m-%d') + timedelta(days=days)).strftime('%Y-%m-%d')
+
+def clone_assignment(assignment: dict, start_date: str, end_date: str, keep_employee: bool) -> dict:
+    """Copy of an assignment for another period, with new ids for the assignment, its shifts and blocks"""
+    clone = copy.deepcopy(assignment)
+    clone.update({
+        "id": str(uuid.uuid4()),
+        "start_date": start_date,
+        "end_date": end_date,
+        "created_at": datetime.now(timezone.utc).isoformat()
+    })
+    if not keep_employee:
+        clone.update({"employee_id": None, "employee_name": ""})
+    for shift in clone.get('shifts', []):
+        shift['id'] = str(uuid.uuid4())
+        for block in shift.get('blocks', []):
+            block['id'] = str(uuid.uuid4())
+    add_shift_time_fields(clone.get('shifts', []))
+    return clone
+
+@api_router.post("/assignments/clone")
+async def clone_assignments(data: AssignmentCloneRequest):
+    """
+    Copy every assignment contained in the source period to the target period. Assignments covering
+    the whole source period get the whole target period; shorter ones keep their offset from the start.
+    Circuits that already exist for the same dates in the target period are skipped.
+    """
+    if data.source_end_date < data.source_start_date or data.target_end_date < data.target_start_date:
+        raise HTTPException(status_code=400, detail="La date de fin doit être après la date de début")
+    
+    sources, employees = await asyncio.gather(
+        db.assignments.find(
+            {"start_date": {"$gte": data.source_start_date}, "end_date": {"$lte": data.source_end_date}},
+            {"_id": 0}
+        ).to_list(None),
+        db.employees.find({"is_inactive": True}, {"_id": 0, "id": 1}).to_list(None),
+    )
+    inactive_ids = {e['id'] for e in employees}
+    existing = await db.assignments.find(
+        {"start_date": {"$gte": data.target_start_date}, "end_date": {"$lte": data.target_end_date}},
+        {"_id": 0, "circuit_number": 1, "start_date": 1, "end_date": 1}
+    ).to_list(None)
+    existing_keys = {(a['circuit_number'], a['start_date'], a['end_date']) for a in existing}
+    
+    offset = (datetime.strptime(data.target_start_date, '%Y-%m-%d') - datetime.strptime(data.source_start_date, '%Y-%m-%d')).days
+    clones, skipped = [], []
+    for assignment in sources:
+        if assignment['start_date'] == data.source_start_date and assignment['end_date'] == data.source_end_date:
+            start_date, end_date = data.target_start_date, data.target_end_date
+        else:
+            start_date = shift_date(assignment['start_date'], offset)
+            end_date = min(shift_date(assignment['end_date'], offset), data.target_end_date)
+        if start_date > end_date or (assignment['circuit_number'], start_date, end_date) in existing_keys:
+            skipped.append(assignment['circuit_number'])
+            continue
+        # Les employés inactifs ne sont pas reportés sur la nouvelle période
+        keep_employee = data.keep_employees and assignment.get('employee_id') not in inactive_ids
+        clones.append(clone_assignment(assignment, start_date, end_date, keep_employee))
+    
+    for i in range(0, len(clones), CLONE_CHUNK_SIZE):
+        await db.assignments.insert_many(clones[i:i + CLONE_CHUNK_SIZE], ordered=False)
+    
+    return {"success": True, "cloned": len(clones), "skipped": sorted(skipped)}
+
 # ============== TEMPORARY TASK ROUTES ==============
 
+TEMPORARY_TASK_SORTS = ("date", "name")
+
 @api_router.get("/temporary-tasks")
-async def get_temporary_tasks():
-    tasks = await db.temporary_tasks.find({}, {"_id": 0}).to_list(500)
-    return tasks
+async def get_temporary_tasks(response: Response, start_date: str = None, end_date: str = None, employee_ids: str = "",
+                              sort: str = None, limit: int = None, cursor: str = None, fields: str = None):
+    """Temporary tasks, sorted, paginated and projected; with a date range, archived tasks are included"""
+    query = dated_query(start_date, end_date)
+    if employee_ids:
+        query["employee_id"] = {"$in": id_list(employee_ids)}
+    sources = dated_sources("temporary_tasks", start_date) if start_date or end_date else ["temporary_tasks"]
+    page = await find_page(sources, query, parse_sort(sort, TEMPORARY_TASK_SORTS), response, limit, cursor,
+                           parse_fields(fields, TemporaryTask))
+    return json_response(page, response)
 
 @api_router.post("/temporary-tasks")
 async def create_temporary_task(data: TemporaryTaskCreate):
@@ -661,7 +1808,9 @@ async def create_temporary_task(data: TemporaryTaskCreate):
     )
     doc = task.model_dump()
     doc['created_at'] = doc['created_at'].isoformat()
+    doc.update(task_time_fields(doc))
     await db.temporary_tasks.insert_one(doc)
+    change_events.publish("task.upserted", task={k: v for k, v in doc.items() if k != "_id"})
     return task.model_dump()
 
 @api_router.put("/temporary-tasks/{task_id}")
@@ -670,29 +1819,60 @@ async def update_temporary_task(task_id: str, data: dict):
         employee = await db.employees.find_one({"id": data['employee_id']}, {"_id": 0})
         if employee:
             data['employee_name'] = employee.get('name', '')
-    
-    result = await db.temporary_tasks.update_one(
+    if {'start_time', 'end_time', 'date'} & data.keys():
+        # Recalculer les minutes précalculées (compléter avec les valeurs actuelles au besoin)
+        current = await db.temporary_tasks.find_one(
+            {"id": task_id}, {"_id": 0, "date": 1, "start_time": 1, "end_time": 1}
+        ) or {}
+        data.update(task_time_fields({**current, **data}))
+    
+    task = await db.temporary_tasks.find_one_and_update(
         {"id": task_id},
-        {"$set": data}
+        {"$set": data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
     )
-    if result.matched_count == 0:
+    if task is None:
         raise HTTPException(status_code=404, detail="Tâche non trouvée")
-    task = await db.temporary_tasks.find_one({"id": task_id}, {"_id": 0})
+    change_events.publish("task.upserted", task=task)
     return task
 
 @api_router.delete("/temporary-tasks/{task_id}")
 async def delete_temporary_task(task_id: str):
-    result = await db.temporary_tasks.delete_one({"id": task_id})
-    if result.deleted_count == 0:
+    projection = {"_id": 0, "archived_at": 0}
+    task = await db.temporary_tasks.find_one_and_delete({"id": task_id}, projection=projection)
+    if task is None:
+        task = await db[archive_name("temporary_tasks")].find_one_and_delete({"id": task_id}, projection=projection)
+    if task is None:
         raise HTTPException(status_code=404, detail="Tâche non trouvée")
+    change_events.publish("task.deleted", task=task)
     return {"success": True}
 
+@api_router.delete("/temporary-tasks")
+async def delete_temporary_tasks(start_date: str = None, end_date: str = None, employee_ids: str = ""):
+    """Delete the temporary tasks matching every given filter: date range and employees (comma-separated ids)"""
+    query = {}
+    if id_list(employee_ids):
+        query["employee_id"] = {"$in": id_list(employee_ids)}
+    deleted_count = await delete_dated("temporary_tasks", start_date, end_date, query)
+    change_events.publish("tasks.deleted", start_date=start_date, end_date=end_date, count=deleted_count,
+                          employee_ids=id_list(employee_ids))
+    return {"success": True, "deleted_count": deleted_count}
+
 # ============== ABSENCE ROUTES ==============
 
+ABSENCE_SORTS = ("start_date", "end_date")
+
 @api_router.get("/absences")
-async def get_absences():
-    absences = await db.absences.find({}, {"_id": 0}).to_list(500)
-    return absences
+async def get_absences(response: Response, start_date: str = None, end_date: str = None, employee_ids: str = "",
+                       sort: str = None, limit: int = None, cursor: str = None, fields: str = None):
+    """Absences overlapping the range, optionally for some employees, sorted, paginated and projected"""
+    query = period_query(start_date, end_date)
+    if employee_ids:
+        query["employee_id"] = {"$in": id_list(employee_ids)}
+    page = await find_page(["absences"], query, parse_sort(sort, ABSENCE_SORTS), response, limit, cursor,
+                           parse_fields(fields, Absence))
+    return json_response(page, response)
 
 @api_router.post("/absences")
 async def create_absence(data: AbsenceCreate):
@@ -715,13 +1895,14 @@ async def create_absence(data: AbsenceCreate):
 
 @api_router.put("/absences/{absence_id}")
 async def update_absence(absence_id: str, data: AbsenceUpdate):
-    result = await db.absences.update_one(
+    absence = await db.absences.find_one_and_update(
         {"id": absence_id},
-        {"$set": data.model_dump()}
+        {"$set": data.model_dump()},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
     )
-    if result.matched_count == 0:
+    if absence is None:
         raise HTTPException(status_code=404, detail="Absence non trouvée")
-    absence = await db.absences.find_one({"id": absence_id}, {"_id": 0})
     return absence
 
 @api_router.delete("/absences/{absence_id}")
@@ -733,14 +1914,26 @@ async def delete_absence(absence_id: str):
 
 # ============== HOLIDAY ROUTES ==============
 
+HOLIDAY_SORTS = ("date", "name")
+
 @api_router.get("/holidays")
-async def get_holidays():
-    holidays = await db.holidays.find({}, {"_id": 0}).to_list(100)
-    return holidays
+async def get_holidays(response: Response, start_date: str = None, end_date: str = None,
+                       sort: str = None, limit: int = None, cursor: str = None, fields: str = None):
+    """Holidays overlapping the range (a single-day holiday has no end_date), sorted, paginated and projected"""
+    query = {}
+    if end_date:
+        query["date"] = {"$lte": end_date}
+    if start_date:
+        query["$or"] = [{"end_date": {"$gte": start_date}}, {"end_date": None, "date": {"$gte": start_date}}]
+    page = await find_page(["holidays"], query, parse_sort(sort, HOLIDAY_SORTS), response, limit, cursor,
+                           parse_fields(fields, Holiday))
+    return json_response(page, response)
 
 @api_router.post("/holidays")
 async def create_holiday(data: HolidayCreate):
-    holiday = Holiday(name=data.name, date=data.date, type=data.type)
+    if data.end_date and data.end_date < data.date:
+        raise HTTPException(status_code=400, detail="La date de fin doit être après la date de début")
+    holiday = Holiday(name=data.name, date=data.date, end_date=data.end_date or None, type=data.type)
     doc = holiday.model_dump()
     doc['created_at'] = doc['created_at'].isoformat()
     await db.holidays.insert_one(doc)
@@ -755,216 +1948,1153 @@ async def delete_holiday(holiday_id: str):
 
 # ============== TEMPORARY REASSIGNMENT ROUTES (Drag & Drop) ==============
 
+TEMPORARY_REASSIGNMENT_SORTS = ("date",)
+
 @api_router.get("/temporary-reassignments")
-async def get_temporary_reassignments(date: str = None):
-    """Get temporary reassignments, optionally filtered by date"""
-    query = {}
+async def get_temporary_reassignments(response: Response, date: str = None, start_date: str = None, end_date: str = None,
+                                      sort: str = None, limit: int = None, cursor: str = None, fields: str = None):
+    """
+    Temporary reassignments, optionally filtered by date or date range (archived ones included),
+    sorted, paginated and projected
+    """
     if date:
-        query["date"] = date
-    reassignments = await db.temporary_reassignments.find(query, {"_id": 0}).to_list(500)
-    return reassignments
+        start_date = end_date = date
+    sources = dated_sources("temporary_reassignments", start_date) if start_date or end_date else ["temporary_reassignments"]
+    page = await find_page(sources, dated_query(start_date, end_date), parse_sort(sort, TEMPORARY_REASSIGNMENT_SORTS),
+                           response, limit, cursor, parse_fields(fields, TemporaryReassignment))
+    return json_response(page, response)
+
+def build_reassignment_upsert(data: dict) -> tuple:
+    """
+    (filter, update) of a temporary reassignment upsert keyed on (date, assignment_id, shift_id, block_id).
+    id and created_at are only set when the reassignment is created.
+    """
+    reassignment = TemporaryReassignment(**data)
+    doc = reassignment.model_dump()
+    doc['created_at'] = doc['created_at'].isoformat()
+    key = {
+        "date": doc['date'],
+        "assignment_id": doc['assignment_id'],
+        "shift_id": doc['shift_id'],
+        "block_id": doc['block_id']
+    }
+    update = {
+        "$set": {
+            "new_employee_id": doc['new_employee_id'],
+            "original_employee_id": doc['original_employee_id']
+        },
+        "$setOnInsert": {"id": doc['id'], "created_at": doc['created_at']}
+    }
+    return key, update
 
 @api_router.post("/temporary-reassignments")
 async def create_temporary_reassignment(data: TemporaryReassignmentCreate):
-    """Create or update a temporary reassignment for drag & drop"""
-    # Vérifier si une réassignation existe déjà pour ce bloc/quart à cette date
-    existing = await db.temporary_reassignments.find_one({
-        "date": data.date,
-        "assignment_id": data.assignment_id,
-        "shift_id": data.shift_id,
-        "block_id": data.block_id
-    }, {"_id": 0})
-    
-    if existing:
-        # Mettre à jour la réassignation existante
-        await db.temporary_reassignments.update_one(
-            {"id": existing["id"]},
-            {"$set": {
-                "new_employee_id": data.new_employee_id,
-                "original_employee_id": data.original_employee_id
-            }}
+    """Create or update a temporary reassignment for drag & drop (single atomic upsert)"""
+    key, update = build_reassignment_upsert(data.model_dump())
+    try:
+        reassignment = await db.temporary_reassignments.find_one_and_update(
+            key, update, projection={"_id": 0}, upsert=True, return_document=ReturnDocument.AFTER
         )
-        updated = await db.temporary_reassignments.find_one({"id": existing["id"]}, {"_id": 0})
-        return updated
-    
-    # Créer une nouvelle réassignation
-    reassignment = TemporaryReassignment(**data.model_dump())
-    doc = reassignment.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    await db.temporary_reassignments.insert_one(doc)
-    return reassignment.model_dump()
+    except DuplicateKeyError:
+        # Deux dépôts simultanés du même bloc: l'autre upsert a créé le document, on le met à jour
+        reassignment = await db.temporary_reassignments.find_one_and_update(
+            key, update, projection={"_id": 0}, return_document=ReturnDocument.AFTER
+        )
+    change_events.publish("reassignment.upserted", reassignment=reassignment)
+    return reassignment
 
 @api_router.delete("/temporary-reassignments/{reassignment_id}")
 async def delete_temporary_reassignment(reassignment_id: str):
-    result = await db.temporary_reassignments.delete_one({"id": reassignment_id})
-    if result.deleted_count == 0:
+    projection = {"_id": 0, "archived_at": 0}
+    reassignment = await db.temporary_reassignments.find_one_and_delete({"id": reassignment_id}, projection=projection)
+    if reassignment is None:
+        reassignment = await db[archive_name("temporary_reassignments")].find_one_and_delete(
+            {"id": reassignment_id}, projection=projection
+        )
+    if reassignment is None:
         raise HTTPException(status_code=404, detail="Réassignation non trouvée")
+    change_events.publish("reassignment.deleted", reassignment=reassignment)
     return {"success": True}
 
+@api_router.delete("/temporary-reassignments")
+async def delete_temporary_reassignments(
+    start_date: str = None,
+    end_date: str = None,
+    employee_ids: str = "",
+    assignment_ids: str = ""
+):
+    """
+    Delete the temporary reassignments matching every given filter: date range, employees
+    (original or new, comma-separated ids) and assignments (comma-separated ids).
+    """
+    query = {}
+    ids = id_list(employee_ids)
+    if ids:
+        query["$or"] = [{"original_employee_id": {"$in": ids}}, {"new_employee_id": {"$in": ids}}]
+    if id_list(assignment_ids):
+        query["assignment_id"] = {"$in": id_list(assignment_ids)}
+    deleted_count = await delete_dated("temporary_reassignments", start_date, end_date, query)
+    change_events.publish(
+        "reassignments.deleted", start_date=start_date, end_date=end_date, count=deleted_count,
+        employee_ids=id_list(employee_ids), assignment_ids=id_list(assignment_ids)
+    )
+    return {"success": True, "deleted_count": deleted_count}
+
 @api_router.delete("/temporary-reassignments/by-date/{date}")
 async def delete_reassignments_by_date(date: str):
     """Delete all temporary reassignments for a specific date"""
-    result = await db.temporary_reassignments.delete_many({"date": date})
-    return {"success": True, "deleted_count": result.deleted_count}
+    results = await asyncio.gather(
+        db.temporary_reassignments.delete_many({"date": date}),
+        db[archive_name("temporary_reassignments")].delete_many({"date": date}),
+    )
+    deleted_count = sum(r.deleted_count for r in results)
+    change_events.publish("reassignments.deleted", start_date=date, end_date=date, count=deleted_count,
+                          employee_ids=[], assignment_ids=[])
+    return {"success": True, "deleted_count": deleted_count}
 
 # ============== SCHEDULE ROUTES ==============
 
+# Sections de la réponse de /schedule et champs d'une ligne employé (paramètre fields)
+SCHEDULE_SECTIONS = ("schedule", "replacements", "week_dates", "holidays", "temporary_reassignments", "reassignment_index", "hours_caps")
+SCHEDULE_ROW_FIELDS = ("employee", "assignments", "circuit_numbers", "temporary_tasks", "absences",
+                       "daily_hours", "weekly_total", "weekly_total_formatted", "over_cap")
+
+def parse_schedule_fields(fields: str) -> tuple:
+    """(sections, row fields) of /schedule's fields parameter: section names, or schedule.<field> for the rows"""
+    if not fields:
+        return set(SCHEDULE_SECTIONS), None
+    sections, row_fields = set(), []
+    for name in id_list(fields):
+        section, _, row_field = name.partition(".")
+        if section not in SCHEDULE_SECTIONS or (row_field and (section != "schedule" or row_field not in SCHEDULE_ROW_FIELDS)):
+            raise HTTPException(status_code=400, detail=f"Champ inconnu: {name}")
+        sections.add(section)
+        if row_field:
+            row_fields.append(row_field)
+    return sections, row_fields or None
+
 @api_router.get("/schedule")
-async def get_schedule(date: str = None, week_start: str = None):
-    employees = await db.employees.find({}, {"_id": 0}).to_list(200)
-    assignments = await db.assignments.find({}, {"_id": 0}).to_list(500)
-    temp_tasks = await db.temporary_tasks.find({}, {"_id": 0}).to_list(500)
-    absences = await db.absences.find({}, {"_id": 0}).to_list(500)
-    holidays = await db.holidays.find({}, {"_id": 0}).to_list(100)
-    temp_reassignments = await db.temporary_reassignments.find({}, {"_id": 0}).to_list(1000)
-    
-    holiday_dates = {h['date'] for h in holidays}
+async def get_schedule(date: str = None, week_start: str = None, fields: str = None):
+    """Weekly schedule; fields selects sections (and schedule.<field> the row fields), the others are not built"""
+    sections, row_fields = parse_schedule_fields(fields)
+    return FastJSONResponse(await build_schedule(week_start, sections, row_fields))
+
+async def build_schedule(week_start: Optional[str], sections: set, row_fields: Optional[list] = None) -> dict:
+    """The requested sections of the week's schedule"""
+    hours_state = week_hours_cache.current_state()
+    week_dates = get_week_dates(week_start)
+    employees, assignments, temp_tasks, absences, holiday_dates, temp_reassignments = await load_schedule_collections(week_dates)
     
     # Index des réassignations temporaires par clé (date-assignment_id-shift_id-block_id)
-    reassignment_index = {}
-    for r in temp_reassignments:
-        key = f"{r['date']}-{r['assignment_id']}-{r['shift_id']}-{r.get('block_id', '')}"
-        reassignment_index[key] = r
-    
-    if week_start:
-        week_start_date = datetime.strptime(week_start, '%Y-%m-%d')
-        # Trouver le lundi de la semaine
-        day_of_week = week_start_date.weekday()
-        monday = week_start_date - timedelta(days=day_of_week)
-        week_dates = [(monday + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(5)]
-    else:
-        today = datetime.now()
-        day_of_week = today.weekday()
-        monday = today - timedelta(days=day_of_week)
-        week_dates = [(monday + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(5)]
-    
-    schedule_data = []
-    
-    for emp in employees:
-        emp_id = emp['id']
-        emp_assignments = [a for a in assignments if a.get('employee_id') == emp_id]
-        emp_temp_tasks = [t for t in temp_tasks if t.get('employee_id') == emp_id]
-        emp_absences = [a for a in absences if a.get('employee_id') == emp_id]
-        
-        # Get circuit numbers for this employee
-        circuit_numbers = [a['circuit_number'] for a in emp_assignments]
+    reassignment_index = build_reassignment_index(temp_reassignments)
+    
+    assignments_by_emp = group_by_employee(assignments)
+    absence_index = AbsenceIndex(absences)
+    result = {}
+    
+    if "schedule" in sections:
+        tasks_by_emp = group_by_employee(temp_tasks)
+        absences_by_emp = group_by_employee(absences)
+        week_hours = week_hours_cache.get_or_compute(
+            week_dates, hours_state, employees, assignments_by_emp, tasks_by_emp,
+            absence_index, holiday_dates, reassignment_index, assignments
+        )
         
-        daily_hours = {}
-        weekly_total = 0
+        schedule_data = []
         
-        for date_str in week_dates:
-            if date_str in holiday_dates:
-                # Check if employee has admin shift (not affected by holidays)
-                has_admin = any(
-                    any(s.get('is_admin') for s in a.get('shifts', []))
-                    for a in emp_assignments
-                    if a.get('start_date') <= date_str <= a.get('end_date')
-                )
-                if not has_admin:
-                    daily_hours[date_str] = 0
-                    continue
+        for emp in employees:
+            emp_id = emp['id']
+            emp_assignments = assignments_by_emp.get(emp_id, [])
+            emp_temp_tasks = tasks_by_emp.get(emp_id, [])
+            emp_absences = absences_by_emp.get(emp_id, [])
             
-            # Check absence for specific shifts
-            emp_absence_today = [a for a in emp_absences if a['start_date'] <= date_str <= a['end_date']]
+            # Get circuit numbers for this employee
+            circuit_numbers = [a['circuit_number'] for a in emp_assignments]
             
-            # Filter assignments and tasks based on absence
-            active_assignments = []
-            for assignment in emp_assignments:
-                if not (assignment.get('start_date') <= date_str <= assignment.get('end_date')):
-                    continue
-                
-                filtered_shifts = []
-                for shift in assignment.get('shifts', []):
-                    # Check if absent for this shift type
-                    is_absent_for_shift = any(
-                        not abs_entry.get('shift_types') or shift.get('name') in abs_entry.get('shift_types', [])
-                        for abs_entry in emp_absence_today
-                    )
-                    if not (is_absent_for_shift and emp_absence_today):
-                        filtered_shifts.append(shift)
-                
-                if filtered_shifts:
-                    active_assignments.append({**assignment, 'shifts': filtered_shifts})
-            
-            active_tasks = []
-            if not emp_absence_today:  # No tasks if absent
-                for task in emp_temp_tasks:
-                    if task.get('date') == date_str:
-                        active_tasks.append(task)
+            daily_hours, weekly_total = week_hours[emp_id]
             
-            # Calculate hours with temporary reassignments taken into account
-            day_minutes = calculate_daily_hours_with_reassignments(
-                emp_id=emp_id,
-                emp_assignments=active_assignments,
-                emp_temp_tasks=active_tasks,
-                date_str=date_str,
-                holidays=holiday_dates,
-                reassignment_index=reassignment_index,
-                all_assignments=assignments
-            )
+            schedule_data.append({
+                "employee": emp,
+                "assignments": emp_assignments,
+                "circuit_numbers": circuit_numbers,
+                "temporary_tasks": emp_temp_tasks,
+                "absences": emp_absences,
+                "daily_hours": daily_hours,
+                "weekly_total": weekly_total,
+                "weekly_total_formatted": format_hours_minutes(weekly_total),
+                "over_cap": get_cap_overruns(daily_hours, weekly_total, DAILY_HOURS_CAP_MINUTES, WEEKLY_HOURS_CAP_MINUTES)
+            })
+        
+        # Sort by circuit number (employees with assignments first, then by circuit number)
+        def sort_key(item):
+            circuits = item.get('circuit_numbers', [])
+            if not circuits:
+                return (1, '', item['employee']['name'])
+            return (0, min(circuits), item['employee']['name'])
+        
+        schedule_data.sort(key=sort_key)
+        if row_fields:
+            schedule_data = [{field: row[field] for field in row_fields} for row in schedule_data]
+        result["schedule"] = schedule_data
+    
+    if "replacements" in sections:
+        # Unassigned items
+        unassigned_assignments = [a for a in assignments if not a.get('employee_id')]
+        unassigned_tasks = [t for t in temp_tasks if not t.get('employee_id')]
+        
+        # Items from absent employees
+        replacement_items = []
+        for emp in employees:
+            emp_id = emp['id']
             
-            daily_hours[date_str] = day_minutes
-            weekly_total += day_minutes
+            for date_str in week_dates:
+                if absence_index.is_absent(emp_id, date_str):
+                    for assignment in assignments_by_emp.get(emp_id, []):
+                        if assignment.get('start_date') <= date_str <= assignment.get('end_date'):
+                            replacement_items.append({
+                                "type": "assignment",
+                                "data": assignment,
+                                "date": date_str,
+                                "original_employee": emp['name']
+                            })
         
-        schedule_data.append({
-            "employee": emp,
-            "assignments": emp_assignments,
-            "circuit_numbers": circuit_numbers,
-            "temporary_tasks": emp_temp_tasks,
-            "absences": emp_absences,
-            "daily_hours": daily_hours,
-            "weekly_total": weekly_total,
-            "weekly_total_formatted": format_hours_minutes(weekly_total)
+        result["replacements"] = {
+            "unassigned_assignments": unassigned_assignments,
+            "unassigned_tasks": unassigned_tasks,
+            "absent_items": replacement_items
+        }
+    
+    result.update({
+        "week_dates": week_dates,
+        "holidays": sorted(holiday_dates),
+        "temporary_reassignments": temp_reassignments,
+        "reassignment_index": reassignment_index,
+        "hours_caps": {
+            "daily_minutes": DAILY_HOURS_CAP_MINUTES,
+            "weekly_minutes": WEEKLY_HOURS_CAP_MINUTES
+        }
+    })
+    return {section: value for section, value in result.items() if section in sections}
+
+@api_router.get("/overtime")
+async def get_overtime(week_start: str = None, daily_cap_hours: float = None, weekly_cap_hours: float = None):
+    """
+    Employees and dates over the daily or weekly hours cap, after reassignments.
+    Reads the hours computed by the schedule engine (cached until the next write).
+    """
+    week_dates = get_week_dates(week_start)
+    daily_cap = int(daily_cap_hours * 60) if daily_cap_hours is not None else DAILY_HOURS_CAP_MINUTES
+    weekly_cap = int(weekly_cap_hours * 60) if weekly_cap_hours is not None else WEEKLY_HOURS_CAP_MINUTES
+    
+    week_hours = await get_week_hours(week_dates)
+    employees = await db.employees.find({"id": {"$in": list(week_hours.keys())}}, {"_id": 0, "id": 1, "name": 1, "matricule": 1}).to_list(None)
+    employees_by_id = {e['id']: e for e in employees}
+    
+    overruns = []
+    for emp_id, (daily_hours, weekly_total) in week_hours.items():
+        over_cap = get_cap_overruns(daily_hours, weekly_total, daily_cap, weekly_cap)
+        if not over_cap['daily'] and not over_cap['weekly']:
+            continue
+        emp = employees_by_id.get(emp_id, {})
+        overruns.append({
+            "employee_id": emp_id,
+            "name": emp.get('name', ''),
+            "matricule": emp.get('matricule', ''),
+            "daily_over": [
+                {"date": d, "minutes": daily_hours[d], "over_by": daily_hours[d] - daily_cap}
+                for d in over_cap['daily']
+            ],
+            "weekly_minutes": weekly_total,
+            "weekly_over_by": max(0, weekly_total - weekly_cap)
         })
     
-    # Sort by circuit number (employees with assignments first, then by circuit number)
-    def sort_key(item):
-        circuits = item.get('circuit_numbers', [])
-        if not circuits:
-            return (1, '', item['employee']['name'])
-        return (0, min(circuits), item['employee']['name'])
+    overruns.sort(key=lambda o: (-o['weekly_over_by'], o['name']))
+    return {
+        "week_dates": week_dates,
+        "daily_cap_minutes": daily_cap,
+        "weekly_cap_minutes": weekly_cap,
+        "employees": overruns
+    }
+
+# ============== BOOTSTRAP ==============
+
+# Sections de l'horaire incluses dans /bootstrap (celles qu'affiche le tableau de bord)
+BOOTSTRAP_SCHEDULE_SECTIONS = {"schedule", "replacements", "reassignment_index", "week_dates"}
+
+class BootstrapCache:
+    """
+    Rendered /bootstrap bodies (JSON, then each compressed variant on first use) by week,
+    for one version tag of the collections: a write changes the tag, which empties the cache.
+    """
+    MAX_WEEKS = 8
+    
+    def __init__(self):
+        self.tag = None
+        self._entries = {}
+    
+    def get(self, tag: str, week_start: str) -> Optional[dict]:
+        return self._entries.get(week_start) if tag == self.tag else None
+    
+    def put(self, tag: str, week_start: str, body: bytes) -> dict:
+        if tag != self.tag:
+            self.tag = tag
+            self._entries.clear()
+        if len(self._entries) >= self.MAX_WEEKS:
+            self._entries.pop(next(iter(self._entries)))
+        entry = {None: body}
+        self._entries[week_start] = entry
+        return entry
+
+bootstrap_cache = BootstrapCache()
+
+async def build_bootstrap(week_dates: list) -> dict:
+    """Reference data and the week's schedule, as the dashboard loads them"""
+    # Lundi à dimanche: la date choisie peut tomber un week-end
+    first = week_dates[0]
+    last = (datetime.strptime(first, '%Y-%m-%d') + timedelta(days=6)).strftime('%Y-%m-%d')
+    employees, schools, assignments, temp_tasks, absences, holidays, schedule = await asyncio.gather(
+        db.employees.find({}, {"_id": 0}).sort([("name", ASCENDING), ("id", ASCENDING)]).to_list(None),
+        db.schools.find({}, {"_id": 0}).sort([("name", ASCENDING), ("id", ASCENDING)]).to_list(None),
+        db.assignments.find({}, {"_id": 0}).to_list(None),
+        find_dated("temporary_tasks", first, last),
+        db.absences.find({}, {"_id": 0}).to_list(None),
+        db.holidays.find({}, {"_id": 0}).sort([("date", ASCENDING), ("id", ASCENDING)]).to_list(None),
+        build_schedule(first, BOOTSTRAP_SCHEDULE_SECTIONS),
+    )
+    return {
+        "employees": employees,
+        "schools": schools,
+        "assignments": assignments,
+        "temporary_tasks": temp_tasks,
+        "absences": absences,
+        "holidays": holidays,
+        "schedule": schedule,
+    }
+
+@api_router.get("/bootstrap")
+async def get_bootstrap(request: Request, week_start: str = None):
+    """
+    Everything the dashboard loads on start, in one response: employees, schools, assignments, absences,
+    holidays, and the week's tasks and schedule. Served from bootstrap_cache until the next write.
+    """
+    week_dates = get_week_dates(week_start)
+    # Étiquette lue avant le chargement: une écriture concurrente la rend plus ancienne que les données
+    tag = collections_etag(ROUTE_COLLECTIONS["/api/bootstrap"])
+    entry = bootstrap_cache.get(tag, week_dates[0])
+    if entry is None:
+        start = time.perf_counter()
+        data = await build_bootstrap(week_dates)
+        metrics.record("bootstrap.build", (time.perf_counter() - start) * 1000)
+        entry = bootstrap_cache.put(tag, week_dates[0], FastJSONResponse(data).body)
+    encoding = accepted_encoding(request.headers.get("accept-encoding", "")) if COMPRESSION_MIN_SIZE else None
+    if encoding and len(entry[None]) >= COMPRESSION_MIN_SIZE:
+        if encoding not in entry:
+            entry[encoding] = compress(entry[None], encoding)
+        # Déjà compressé: CompressionMiddleware le transmet tel quel
+        return Response(entry[encoding], media_type="application/json",
+                        headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"})
+    return Response(entry[None], media_type="application/json")
+
+# ============== REPLACEMENT CANDIDATES ==============
+
+def find_assignment_item(assignments: list, assignment_id: str, shift_id: str, block_id: Optional[str]) -> tuple:
+    """Find (assignment, shift, block) for a reassignable item; block is None for admin shifts"""
+    assignment = next((a for a in assignments if a['id'] == assignment_id), None)
+    if not assignment:
+        raise HTTPException(status_code=404, detail="Assignation non trouvée")
+    shift = next((s for s in assignment.get('shifts', []) if s['id'] == shift_id), None)
+    if not shift:
+        raise HTTPException(status_code=404, detail="Quart non trouvé")
+    block = None
+    if block_id:
+        block = next((b for b in shift.get('blocks', []) if b['id'] == block_id), None)
+        if not block:
+            raise HTTPException(status_code=404, detail="Bloc non trouvé")
+    return assignment, shift, block
+
+def rank_candidates(candidates: list) -> list:
+    """Least loaded first (daily then weekly minutes), then seniority (hire_date)"""
+    return sorted(candidates, key=lambda c: (c['daily_minutes'], c['weekly_minutes'], c.get('hire_date') or '9999-99-99'))
+
+@api_router.get("/replacements/candidates")
+async def get_replacement_candidates(date: str, assignment_id: str, shift_id: str, block_id: str = None):
+    """
+    Rank the active, non-absent employees who are free for a block (or admin shift) on a date.
+    Candidates are ordered by daily minutes, weekly minutes, then hire_date.
+    """
+    hours_state = week_hours_cache.current_state()
+    week_dates = get_week_dates(date)
+    employees, assignments, temp_tasks, absences, holiday_dates, temp_reassignments = await load_schedule_collections(week_dates)
+    
+    assignment, shift, block = find_assignment_item(assignments, assignment_id, shift_id, block_id)
+    start, end = get_item_interval(assignment, shift, block)
+    
+    reassignment_index = build_reassignment_index(temp_reassignments)
     
-    schedule_data.sort(key=sort_key)
+    assignments_by_emp = group_by_employee(assignments)
+    tasks_by_emp = group_by_employee(temp_tasks)
+    absence_index = AbsenceIndex(absences)
     
-    # Unassigned items
-    unassigned_assignments = [a for a in assignments if not a.get('employee_id')]
-    unassigned_tasks = [t for t in temp_tasks if not t.get('employee_id')]
+    # Current holder of the item (after temporary reassignments)
+    key = f"{date}-{assignment_id}-{shift_id}-{block_id or ''}"
+    reassignment = reassignment_index.get(key)
+    current_employee_id = reassignment.get('new_employee_id') if reassignment else assignment.get('employee_id')
     
-    # Items from absent employees
-    replacement_items = []
+    eligible = []
     for emp in employees:
+        if emp.get('is_inactive') or emp['id'] == current_employee_id:
+            continue
+        if absence_index.is_absent_for_shift(emp['id'], date, shift.get('name')):
+            continue
+        eligible.append(emp)
+    
+    free_index = free_time_cache.get_or_build(
+        date, hours_state, employees, assignments_by_emp, tasks_by_emp,
+        absence_index, reassignment_index, assignments
+    )
+    
+    week_hours = week_hours_cache.get_or_compute(
+        week_dates, hours_state, employees, assignments_by_emp, tasks_by_emp,
+        absence_index, holiday_dates, reassignment_index, assignments
+    )
+    
+    candidates = []
+    for emp in eligible:
         emp_id = emp['id']
-        emp_absences = [a for a in absences if a.get('employee_id') == emp_id]
+        if not free_index.is_free(emp_id, start, end):
+            continue
+        daily_hours, weekly_total = week_hours[emp_id]
+        candidates.append({
+            "employee_id": emp_id,
+            "name": emp['name'],
+            "matricule": emp.get('matricule', ''),
+            "hire_date": emp.get('hire_date', ''),
+            "daily_minutes": daily_hours.get(date, 0),
+            "weekly_minutes": weekly_total,
+            "weekly_total_formatted": format_hours_minutes(weekly_total)
+        })
+    
+    return {
+        "date": date,
+        "assignment_id": assignment_id,
+        "shift_id": shift_id,
+        "block_id": block_id,
+        "start_time": minutes_to_time(start),
+        "end_time": minutes_to_time(end),
+        "current_employee_id": current_employee_id,
+        "candidates": rank_candidates(candidates)
+    }
+
+# ============== REPLACEMENT SOLVER ==============
+
+class ReplacementSolveRequest(BaseModel):
+    date: str
+    commit: bool = False
+
+def collect_uncovered_items(
+    employees: list,
+    assignments: list,
+    absence_index: AbsenceIndex,
+    date_str: str,
+    holiday_dates: set,
+    reassignment_index: dict
+) -> list:
+    """
+    List the items (blocks or admin shifts) nobody covers on a date:
+    - items of absent employees that were not reassigned
+    - items moved to Remplacements (reassigned to null)
+    - items of unassigned assignments
+    """
+    day_letter = get_day_letter(date_str)
+    employees_by_id = {e['id']: e for e in employees}
+    uncovered = []
+    
+    for assignment in assignments:
+        if not (assignment.get('start_date') <= date_str <= assignment.get('end_date')):
+            continue
+        owner_id = assignment.get('employee_id')
         
-        for date_str in week_dates:
-            is_absent = any(
-                a['start_date'] <= date_str <= a['end_date']
-                for a in emp_absences
-            )
-            if is_absent:
-                emp_assignments = [a for a in assignments if a.get('employee_id') == emp_id]
-                for assignment in emp_assignments:
-                    if assignment.get('start_date') <= date_str <= assignment.get('end_date'):
-                        replacement_items.append({
-                            "type": "assignment",
-                            "data": assignment,
-                            "date": date_str,
-                            "original_employee": emp['name']
-                        })
+        for shift in assignment.get('shifts', []):
+            if shift.get('is_admin'):
+                items = [None]
+            elif date_str in holiday_dates:
+                continue  # Pas de transport scolaire un jour férié
+            else:
+                items = [b for b in shift.get('blocks', []) if block_runs_on(b, day_letter)]
+            
+            owner_absent = bool(owner_id) and absence_index.is_absent_for_shift(owner_id, date_str, shift.get('name'))
+            for block in items:
+                block_id = block['id'] if block else None
+                key = f"{date_str}-{assignment['id']}-{shift['id']}-{block_id or ''}"
+                reassignment = reassignment_index.get(key)
+                if reassignment:
+                    if reassignment.get('new_employee_id'):
+                        continue  # Déjà réassigné
+                    original_employee_id = reassignment.get('original_employee_id') or owner_id
+                elif not owner_id or owner_absent:
+                    original_employee_id = owner_id
+                else:
+                    continue
+                
+                start, end = get_item_interval(assignment, shift, block)
+                original = employees_by_id.get(original_employee_id) or {}
+                uncovered.append({
+                    "assignment_id": assignment['id'],
+                    "circuit_number": assignment.get('circuit_number', ''),
+                    "shift_id": shift['id'],
+                    "shift_name": shift.get('name', ''),
+                    "block_id": block_id,
+                    "school_name": block.get('school_name', '') if block else '',
+                    "start": start,
+                    "end": end,
+                    "original_employee_id": original_employee_id,
+                    "original_employee": original.get('name', '')
+                })
+    return uncovered
+
+def solve_replacements(uncovered: list, drivers: list, free_index: FreeTimeIndex, absence_index: AbsenceIndex, date_str: str) -> tuple:
+    """
+    Greedy interval scheduling: items are taken by start time and each one goes to the free
+    driver with the fewest daily, then weekly minutes (then seniority), which balances hours.
+    Returns (proposals, unresolved).
+    """
+    proposals = []
+    unresolved = []
+    for item in sorted(uncovered, key=lambda i: (i['start'], i['end'])):
+        eligible = [
+            d for d in drivers
+            if d['employee_id'] != item['original_employee_id']
+            and not absence_index.is_absent_for_shift(d['employee_id'], date_str, item['shift_name'])
+            and free_index.is_free(d['employee_id'], item['start'], item['end'])
+        ]
+        if not eligible:
+            unresolved.append(item)
+            continue
+        driver = rank_candidates(eligible)[0]
+        free_index.reserve(driver['employee_id'], item['start'], item['end'])
+        duration = item['end'] - item['start']
+        driver['daily_minutes'] += duration
+        driver['weekly_minutes'] += duration
+        proposals.append({**item, "new_employee_id": driver['employee_id'], "new_employee": driver['name']})
+    return proposals, unresolved
+
+async def bulk_upsert_reassignments(items: list, session=None) -> int:
+    """Upsert many temporary reassignments in a single bulk write, keyed on (date, assignment_id, shift_id, block_id)"""
+    if not items:
+        return 0
+    operations = [UpdateOne(*build_reassignment_upsert(item), upsert=True) for item in items]
+    result = await db.temporary_reassignments.bulk_write(operations, ordered=False, session=session)
+    return result.upserted_count + result.modified_count
+
+async def bulk_upsert_uncovered_reassignments(items: list) -> tuple:
+    """
+    Upsert reassignments of blocks that are still uncovered (no reassignment, or one to the
+    replacements zone). A block given to a driver in the meantime is left as is: it is filtered out
+    beforehand, and a concurrent one makes its upsert hit the unique key. Returns (count, skipped items).
+    """
+    if not items:
+        return 0, []
+    dates = sorted({item['date'] for item in items})
+    current = build_reassignment_index(await find_dated("temporary_reassignments", dates[0], dates[-1]))
+    pending, skipped = [], []
+    for item in items:
+        reassignment = current.get(f"{item['date']}-{item['assignment_id']}-{item['shift_id']}-{item.get('block_id') or ''}")
+        (skipped if reassignment and reassignment.get('new_employee_id') else pending).append(item)
+    if not pending:
+        return 0, skipped
+    operations = []
+    for item in pending:
+        key, update = build_reassignment_upsert(item)
+        operations.append(UpdateOne({**key, "new_employee_id": None}, update, upsert=True))
+    try:
+        result = await db.temporary_reassignments.bulk_write(operations, ordered=False)
+        return result.upserted_count + result.modified_count, skipped
+    except BulkWriteError as e:
+        errors = e.details.get('writeErrors', [])
+        if any(error.get('code') != 11000 for error in errors):
+            raise
+        skipped += [pending[error['index']] for error in errors]
+        return e.details['nUpserted'] + e.details['nModified'], skipped
+
+def publish_reassignments_upserted(items: list, count: int):
+    """Event of a bulk upsert: the dates only (clients reload them), the documents' ids being unknown here"""
+    if count:
+        change_events.publish("reassignments.upserted", dates=sorted({item['date'] for item in items}), count=count)
+
+@api_router.post("/replacements/solve")
+async def solve_day_replacements(data: ReplacementSolveRequest):
+    """
+    Propose a conflict-free assignment of a day's uncovered blocks to available drivers.
+    With commit=true the proposals are saved as temporary reassignments in one bulk write.
+    """
+    date_str = data.date
+    hours_state = week_hours_cache.current_state()
+    week_dates = get_week_dates(date_str)
+    employees, assignments, temp_tasks, absences, holiday_dates, temp_reassignments = await load_schedule_collections(week_dates)
+    
+    reassignment_index = build_reassignment_index(temp_reassignments)
+    
+    assignments_by_emp = group_by_employee(assignments)
+    tasks_by_emp = group_by_employee(temp_tasks)
+    absence_index = AbsenceIndex(absences)
+    
+    uncovered = collect_uncovered_items(
+        employees, assignments, absence_index, date_str, holiday_dates, reassignment_index
+    )
+    
+    active_employees = [e for e in employees if not e.get('is_inactive')]
+    # Le solveur réserve du temps dans l'index: travailler sur une copie de celui du cache
+    free_index = free_time_cache.get_or_build(
+        date_str, hours_state, employees, assignments_by_emp, tasks_by_emp,
+        absence_index, reassignment_index, assignments
+    ).copy()
+    
+    week_hours = week_hours_cache.get_or_compute(
+        week_dates, hours_state, employees, assignments_by_emp, tasks_by_emp,
+        absence_index, holiday_dates, reassignment_index, assignments
+    )
+    
+    drivers = []
+    for emp in active_employees:
+        emp_id = emp['id']
+        daily_hours, weekly_total = week_hours[emp_id]
+        drivers.append({
+            "employee_id": emp_id,
+            "name": emp['name'],
+            "hire_date": emp.get('hire_date', ''),
+            "daily_minutes": daily_hours.get(date_str, 0),
+            "weekly_minutes": weekly_total
+        })
+    
+    proposals, unresolved = solve_replacements(uncovered, drivers, free_index, absence_index, date_str)
+    
+    def to_output(item):
+        return {
+            **{k: v for k, v in item.items() if k not in ('start', 'end')},
+            "date": date_str,
+            "start_time": minutes_to_time(item['start']),
+            "end_time": minutes_to_time(item['end'])
+        }
+    
+    reassignments = [
+        TemporaryReassignmentCreate(
+            date=date_str,
+            assignment_id=p['assignment_id'],
+            shift_id=p['shift_id'],
+            block_id=p['block_id'],
+            original_employee_id=p['original_employee_id'],
+            new_employee_id=p['new_employee_id']
+        ).model_dump()
+        for p in proposals
+    ]
+    
+    committed = 0
+    if data.commit:
+        committed = await bulk_upsert_reassignments(reassignments)
+        publish_reassignments_upserted(reassignments, committed)
     
     return {
-        "schedule": schedule_data,
-        "replacements": {
-            "unassigned_assignments": unassigned_assignments,
-            "unassigned_tasks": unassigned_tasks,
-            "absent_items": replacement_items
-        },
-        "week_dates": week_dates,
-        "holidays": list(holiday_dates),
-        "temporary_reassignments": temp_reassignments,
-        "reassignment_index": reassignment_index
+        "date": date_str,
+        "proposals": [to_output(p) for p in proposals],
+        "reassignments": reassignments,
+        "unresolved": [to_output(u) for u in unresolved],
+        "committed": committed
     }
 
+@api_router.post("/replacements/commit")
+async def commit_replacements(data: List[TemporaryReassignmentCreate]):
+    """
+    Save a reviewed set of proposed reassignments in one bulk write. Proposals whose block was
+    given to a driver since the solve are stale: they are skipped and returned, not applied.
+    """
+    items = [r.model_dump() for r in data]
+    committed, skipped = await bulk_upsert_uncovered_reassignments(items)
+    publish_reassignments_upserted(items, committed)
+    return {"success": True, "committed": committed, "skipped": skipped}
+
+# ============== BULK REASSIGNMENT ==============
+
+class BulkReassignmentRequest(BaseModel):
+    reassignments: List[TemporaryReassignmentCreate] = []
+    # Raccourci: tous les blocs de from_employee_id à la date donnée vers to_employee_id (None = remplacements)
+    date: Optional[str] = None
+    from_employee_id: Optional[str] = None
+    to_employee_id: Optional[str] = None
+
+def collect_employee_day_items(emp_id: str, assignments: list, date_str: str, reassignment_index: dict) -> list:
+    """
+    (assignment_id, shift_id, block_id, original_employee_id) of everything an employee works on a date:
+    their own blocks and admin shifts not reassigned away, plus what was reassigned to them.
+    """
+    day_letter = get_day_letter(date_str)
+    items = []
+    for assignment in assignments:
+        if assignment.get('employee_id') != emp_id:
+            continue
+        if not (assignment.get('start_date') <= date_str <= assignment.get('end_date')):
+            continue
+        for shift in assignment.get('shifts', []):
+            if shift.get('is_admin'):
+                block_ids = [None]
+            else:
+                block_ids = [b['id'] for b in shift.get('blocks', []) if block_runs_on(b, day_letter)]
+            for block_id in block_ids:
+                reassignment = reassignment_index.get(f"{date_str}-{assignment['id']}-{shift['id']}-{block_id or ''}")
+                if reassignment and reassignment.get('new_employee_id') != emp_id:
+                    continue  # Déjà réassigné à quelqu'un d'autre
+                items.append((assignment['id'], shift['id'], block_id, emp_id))
+    for reassignment in reassignment_index.values():
+        if reassignment.get('date') != date_str or reassignment.get('new_employee_id') != emp_id:
+            continue
+        if reassignment.get('original_employee_id') == emp_id:
+            continue  # Déjà compté ci-dessus
+        items.append((
+            reassignment['assignment_id'], reassignment['shift_id'],
+            reassignment.get('block_id'), reassignment.get('original_employee_id')
+        ))
+    return items
+
+@api_router.post("/temporary-reassignments/bulk")
+async def bulk_reassign(data: BulkReassignmentRequest):
+    """
+    Apply many temporary reassignments at once (and/or move all of an employee's blocks on a date
+    to another employee) in one bulk write, inside a transaction when the database supports it.
+    Returns the updated week hours of the affected employees.
+    """
+    items = [r.model_dump() for r in data.reassignments]
+    if data.from_employee_id:
+        if not data.date:
+            raise HTTPException(status_code=400, detail="La date est requise pour déplacer les blocs d'un employé")
+        if data.to_employee_id == data.from_employee_id:
+            raise HTTPException(status_code=400, detail="L'employé de destination doit être différent")
+        reassignments = await find_dated("temporary_reassignments", data.date, data.date)
+        assignments = await db.assignments.find(
+            period_query(data.date, data.date, {"employee_id": data.from_employee_id}), {"_id": 0}
+        ).to_list(None)
+        for assignment_id, shift_id, block_id, original_id in collect_employee_day_items(
+            data.from_employee_id, assignments, data.date, build_reassignment_index(reassignments)
+        ):
+            items.append(TemporaryReassignmentCreate(
+                date=data.date,
+                assignment_id=assignment_id,
+                shift_id=shift_id,
+                block_id=block_id,
+                original_employee_id=original_id,
+                new_employee_id=data.to_employee_id
+            ).model_dump())
+    if not items:
+        raise HTTPException(status_code=400, detail="Aucun bloc à réassigner")
+    
+    for attempt in range(2):
+        try:
+            async with db.transaction() as session:
+                count = await bulk_upsert_reassignments(items, session=session)
+            break
+        except BulkWriteError as e:
+            # Upsert simultané du même bloc par une autre requête: rejouer une fois (idempotent)
+            if attempt or any(error.get('code') != 11000 for error in e.details.get('writeErrors', [])):
+                raise
+    publish_reassignments_upserted(items, count)
+    
+    affected = {item['original_employee_id'] for item in items} | {item['new_employee_id'] for item in items}
+    affected.discard(None)
+    hours = {}
+    for week_start in sorted({get_week_dates(item['date'])[0] for item in items}):
+        week_hours = await get_week_hours(get_week_dates(week_start))
+        hours[week_start] = {
+            emp_id: {
+                "daily_hours": week_hours[emp_id][0],
+                "weekly_total": week_hours[emp_id][1],
+                "weekly_total_formatted": format_hours_minutes(week_hours[emp_id][1])
+            }
+            for emp_id in affected if emp_id in week_hours
+        }
+    
+    return {"success": True, "count": count, "reassignments": items, "hours": hours}
+
+# ============== CSV IMPORT ==============
+
+IMPORT_BATCH_SIZE = 500
+
+# Noms de colonnes acceptés (en minuscules) -> champ
+IMPORT_COLUMN_ALIASES = {
+    "nom": "name", "date_embauche": "hire_date", "telephone": "phone", "téléphone": "phone",
+    "courriel": "email", "inactif": "is_inactive", "couleur": "color",
+    "circuit": "circuit_number", "employe": "employee", "employé": "employee", "matricule_employe": "employee",
+    "date_debut": "start_date", "date_fin": "end_date", "adapte": "is_adapted", "adapté": "is_adapted",
+    "quart": "shift", "ecole": "school", "école": "school", "heure_debut": "start_time", "heure_fin": "end_time",
+    "jours": "days", "heures_admin": "admin_hours",
+}
+
+IMPORT_REQUIRED_COLUMNS = {
+    "employees": ["name", "hire_date"],
+    "schools": ["name"],
+    "assignments": ["circuit_number", "start_date", "end_date"],
+}
+
+class CsvRecordParser:
+    """Turn lines into CSV records, keeping quoted fields that span several lines together"""
+    
+    def __init__(self, delimiter: str = None):
+        self.delimiter = delimiter
+        self.pending = ""
+        self.line_number = 0
+        self.record_line = 0
+    
+    def feed(self, line: str) -> Optional[tuple]:
+        """(line number, fields) once a record is complete, else None"""
+        self.line_number += 1
+        if not self.pending:
+            self.record_line = self.line_number
+        self.pending += line
+        if self.pending.count('"') % 2:
+            return None
+        return self.flush()
+    
+    def flush(self) -> Optional[tuple]:
+        text, self.pending = self.pending, ""
+        if not text.strip():
+            return None
+        if self.delimiter is None:
+            # Le délimiteur le plus fréquent de l'en-tête (Excel en français exporte avec ';')
+            self.delimiter = max(",;\t", key=text.count)
+        try:
+            return self.record_line, next(csv.reader([text], delimiter=self.delimiter, strict=True))
+        except csv.Error as e:
+            raise HTTPException(status_code=400, detail=f"CSV invalide à la ligne {self.record_line}: {e}")
+
+async def iter_csv_rows(request: Request, kind: str, delimiter: str = None):
+    """
+    Parse the request body as CSV while it streams in. Yields (line number, row) where row maps
+    the normalized header names to stripped values.
+    """
+    parser = CsvRecordParser(delimiter)
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    header = None
+    
+    def complete_records(text: str, final: bool = False) -> tuple:
+        """Records of the complete lines of text, and the unfinished last line"""
+        lines = text.split('\n')
+        rest = "" if final else lines.pop()
+        records = [r for r in (parser.feed(line + '\n') for line in lines) if r]
+        if final and parser.pending:
+            records.append(parser.flush())
+        return records, rest
+    
+    def to_rows(records: list) -> list:
+        nonlocal header
+        rows = []
+        for line, fields in records:
+            if header is None:
+                header = [IMPORT_COLUMN_ALIASES.get(f.strip().lower(), f.strip().lower()) for f in fields]
+                missing = [c for c in IMPORT_REQUIRED_COLUMNS[kind] if c not in header]
+                if missing:
+                    raise HTTPException(status_code=400, detail=f"Colonnes manquantes: {', '.join(missing)}")
+                continue
+            rows.append((line, {name: value.strip() for name, value in zip(header, fields)}))
+        return rows
+    
+    rest = ""
+    async for chunk in request.stream():
+        records, rest = complete_records(rest + decoder.decode(chunk))
+        for row in to_rows(records):
+            yield row
+    records, _ = complete_records(rest + decoder.decode(b'', final=True), final=True)
+    for row in to_rows(records):
+        yield row
+    if header is None:
+        raise HTTPException(status_code=400, detail="Fichier CSV vide")
+
+async def iter_csv_batches(request: Request, kind: str, delimiter: str = None):
+    batch = []
+    async for row in iter_csv_rows(request, kind, delimiter):
+        batch.append(row)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def parse_import_date(value: str, label: str, errors: list) -> str:
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        errors.append(f"{label} invalide: '{value}' (AAAA-MM-JJ)")
+        return value
+
+def parse_import_time(value: str, label: str, errors: list) -> str:
+    try:
+        return datetime.strptime(value, '%H:%M').strftime('%H:%M')
+    except ValueError:
+        errors.append(f"{label} invalide: '{value}' (HH:MM)")
+        return value
+
+def parse_import_int(value: str, label: str, errors: list, default: int = 0) -> int:
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        errors.append(f"{label} invalide: '{value}'")
+        return default
+
+def parse_import_bool(value: str) -> bool:
+    return value.strip().lower() in ("1", "oui", "o", "true", "vrai", "x", "yes")
+
+def parse_import_days(value: str, errors: list) -> list:
+    if not value:
+        return list(DEFAULT_BLOCK_DAYS)
+    letters = [c for c in value.upper() if c not in " ,;/"]
+    unknown = [c for c in letters if c not in DAY_BITS]
+    if unknown:
+        errors.append(f"Jours invalides: '{value}' (L, M, W, J, V, S, D)")
+    return [c for c in DAY_BITS if c in letters]
+
+class ImportReport:
+    """Per-row outcome of a CSV import"""
+    
+    def __init__(self, dry_run: bool):
+        self.dry_run = dry_run
+        self.total_rows = 0
+        self.inserted = 0
+        self.errors = []
+    
+    def fail(self, line: int, *messages):
+        self.errors.append({"line": line, "errors": list(messages)})
+    
+    async def write(self, collection, docs: list, lines: list, describe_error=None):
+        """insert_many (unordered); rows rejected by a unique index are reported with their line"""
+        if not docs:
+            return
+        if self.dry_run:
+            self.inserted += len(docs)
+            return
+        try:
+            result = await collection.insert_many(docs, ordered=False)
+            self.inserted += len(result.inserted_ids)
+        except BulkWriteError as e:
+            self.inserted += e.details.get('nInserted', 0)
+            for error in e.details.get('writeErrors', []):
+                message = describe_error(error) if describe_error else None
+                self.fail(lines[error['index']], message or "Doublon refusé par la base de données")
+    
+    def as_dict(self) -> dict:
+        return {
+            "dry_run": self.dry_run,
+            "total_rows": self.total_rows,
+            "inserted": self.inserted,
+            "errors": sorted(self.errors, key=lambda e: e['line'])
+        }
+
+def describe_employee_write_error(error: dict) -> Optional[str]:
+    key_pattern = error.get('keyPattern', {})
+    return next((m for f, m in EMPLOYEE_DUPLICATE_MESSAGES.items() if f in key_pattern), None)
+
+@api_router.post("/import/employees")
+async def import_employees(request: Request, dry_run: bool = False, delimiter: str = None):
+    """
+    Import employees from a CSV body (columns: name, hire_date, matricule, phone, email, berline, is_inactive).
+    Duplicates are checked against the existing employees and the rest of the file.
+    """
+    existing = await db.employees.find(
+        {}, {"_id": 0, "matricule": 1, "email": 1, "phone": 1, "berline": 1, "is_inactive": 1}
+    ).to_list(None)
+    taken = {field: {e[field] for e in existing if e.get(field)} for field in ("matricule", "email", "phone")}
+    taken["berline"] = {e['berline'] for e in existing if e.get('berline') and not e.get('is_inactive')}
+    
+    report = ImportReport(dry_run)
+    async for batch in iter_csv_batches(request, "employees", delimiter):
+        docs, lines = [], []
+        for line, row in batch:
+            report.total_rows += 1
+            errors = []
+            if not row.get('name'):
+                errors.append("Nom requis")
+            data = EmployeeCreate(
+                name=row.get('name', ''),
+                hire_date=parse_import_date(row.get('hire_date', ''), "Date d'embauche", errors),
+                matricule=row.get('matricule', ''),
+                phone=row.get('phone', ''),
+                email=row.get('email', ''),
+                berline=row.get('berline', ''),
+                is_inactive=parse_import_bool(row.get('is_inactive', ''))
+            )
+            for field, message in EMPLOYEE_DUPLICATE_MESSAGES.items():
+                value = getattr(data, field)
+                if value and not (field == "berline" and data.is_inactive) and value in taken[field]:
+                    errors.append(message)
+            if errors:
+                report.fail(line, *errors)
+                continue
+            for field in taken:
+                if getattr(data, field) and not (field == "berline" and data.is_inactive):
+                    taken[field].add(getattr(data, field))
+            doc = Employee(**data.model_dump()).model_dump()
+            doc['created_at'] = doc['created_at'].isoformat()
+            docs.append(doc)
+            lines.append(line)
+        await report.write(db.employees, docs, lines, describe_employee_write_error)
+    return report.as_dict()
+
+@api_router.post("/import/schools")
+async def import_schools(request: Request, dry_run: bool = False, delimiter: str = None):
+    """Import schools from a CSV body (columns: name, color, type, commission, ville)"""
+    existing = await db.schools.find({}, {"_id": 0, "name": 1}).to_list(None)
+    taken = {s.get('name', '').lower() for s in existing}
+    
+    report = ImportReport(dry_run)
+    async for batch in iter_csv_batches(request, "schools", delimiter):
+        docs, lines = [], []
+        for line, row in batch:
+            report.total_rows += 1
+            errors = []
+            name = row.get('name', '')
+            if not name:
+                errors.append("Nom requis")
+            elif name.lower() in taken:
+                errors.append("Cette école existe déjà")
+            color = row.get('color') or "#4CAF50"
+            if not re.fullmatch(r"#[0-9A-Fa-f]{6}", color):
+                errors.append(f"Couleur invalide: '{color}' (#RRGGBB)")
+            if errors:
+                report.fail(line, *errors)
+                continue
+            taken.add(name.lower())
+            school = School(name=name, color=color, type=row.get('type', ''),
+                            commission=row.get('commission', ''), ville=row.get('ville', ''))
+            doc = school.model_dump()
+            doc['created_at'] = doc['created_at'].isoformat()
+            docs.append(doc)
+            lines.append(line)
+        await report.write(db.schools, docs, lines)
+    return report.as_dict()
+
+@api_router.post("/import/assignments")
+async def import_assignments(request: Request, dry_run: bool = False, delimiter: str = None):
+    """
+    Import assignments from a CSV body with one row per block (or per admin shift). Rows sharing
+    circuit_number, start_date and end_date form one assignment; a circuit with an invalid row is
+    not imported. Columns: circuit_number, start_date, end_date, employee (matricule or name),
+    is_adapted, shift, school (name), start_time, end_time, hlp_before, hlp_after, days, admin_hours.
+    """
+    employees, schools, existing = await asyncio.gather(
+        db.employees.find({}, {"_id": 0, "id": 1, "name": 1, "matricule": 1}).to_list(None),
+        db.schools.find({}, {"_id": 0, "id": 1, "name": 1, "color": 1}).to_list(None),
+        db.assignments.find({}, {"_id": 0, "circuit_number": 1, "start_date": 1, "end_date": 1}).to_list(None),
+    )
+    employees_by_key = {e['name'].lower(): e for e in employees if e.get('name')}
+    employees_by_key.update({e['matricule'].lower(): e for e in employees if e.get('matricule')})
+    schools_by_name = {s['name'].lower(): s for s in schools if s.get('name')}
+    existing_keys = {(a['circuit_number'], a['start_date'], a['end_date']) for a in existing}
+    
+    report = ImportReport(dry_run)
+    circuits = {}  # (circuit_number, start_date, end_date) -> {"doc", "lines", "failed"}
+    async for batch in iter_csv_batches(request, "assignments", delimiter):
+        for line, row in batch:
+            report.total_rows += 1
+            errors = []
+            circuit_number = row.get('circuit_number', '')
+            if not circuit_number:
+                errors.append("Numéro de circuit requis")
+            start_date = parse_import_date(row.get('start_date', ''), "Date de début", errors)
+            end_date = parse_import_date(row.get('end_date', ''), "Date de fin", errors)
+            if not errors and end_date < start_date:
+                errors.append("La date de fin doit être après la date de début")
+            
+            employee = None
+            if row.get('employee'):
+                employee = employees_by_key.get(row['employee'].lower())
+                if not employee:
+                    errors.append(f"Employé introuvable: '{row['employee']}'")
+            
+            shift_name = (row.get('shift') or "AM").upper()
+            block = None
+            if shift_name != "ADMIN":
+                school = schools_by_name.get(row.get('school', '').lower())
+                if not school:
+                    errors.append(f"École introuvable: '{row.get('school', '')}'")
+                block = {
+                    "start_time": parse_import_time(row.get('start_time', ''), "Heure de début", errors),
+                    "end_time": parse_import_time(row.get('end_time', ''), "Heure de fin", errors),
+                    "hlp_before": parse_import_int(row.get('hlp_before', ''), "HLP avant", errors),
+                    "hlp_after": parse_import_int(row.get('hlp_after', ''), "HLP après", errors),
+                    "days": parse_import_days(row.get('days', ''), errors),
+                }
+                if school:
+                    block.update({"school_id": school['id'], "school_name": school['name'], "school_color": school.get('color', '#4CAF50')})
+            
+            key = (circuit_number, start_date, end_date)
+            if key in existing_keys:
+                errors.append("Ce circuit existe déjà pour cette période")
+            group = circuits.get(key)
+            if group and group["doc"] and not errors and group["doc"]["employee_id"] != (employee['id'] if employee else None):
+                errors.append("Employé différent des autres lignes du circuit")
+            if errors:
+                report.fail(line, *errors)
+                if group:
+                    group["failed"] = True
+                else:
+                    circuits[key] = {"doc": None, "lines": [line], "failed": True}
+                continue
+            
+            if not group:
+                group = circuits[key] = {
+                    "doc": {
+                        "circuit_number": circuit_number,
+                        "employee_id": employee['id'] if employee else None,
+                        "employee_name": employee['name'] if employee else "",
+                        "start_date": start_date,
+                        "end_date": end_date,
+                        "is_adapted": parse_import_bool(row.get('is_adapted', '')),
+                        "shifts": []
+                    },
+                    "lines": [], "failed": False
+                }
+            elif group["doc"] is None:
+                group["lines"].append(line)
+                continue
+            group["lines"].append(line)
+            shift = next((s for s in group["doc"]["shifts"] if s['name'] == shift_name), None)
+            if not shift:
+                shift = {"name": shift_name, "is_admin": shift_name == "ADMIN", "blocks": []}
+                if shift["is_admin"]:
+                    shift["admin_hours"] = parse_import_int(row.get('admin_hours', ''), "Heures admin", [], 8)
+                group["doc"]["shifts"].append(shift)
+            if block:
+                shift["blocks"].append(block)
+    
+    failed_lines = {e['line'] for e in report.errors}
+    docs, lines = [], []
+    for group in circuits.values():
+        if group["failed"]:
+            for line in group["lines"]:
+                if line not in failed_lines:
+                    report.fail(line, "Circuit non importé: erreur sur une autre ligne du circuit")
+            continue
+        data = group["doc"]
+        assignment = Assignment(
+            circuit_number=data['circuit_number'],
+            shifts=[Shift(**s) for s in data['shifts']],
+            employee_id=data['employee_id'],
+            employee_name=data['employee_name'],
+            start_date=data['start_date'],
+            end_date=data['end_date'],
+            is_adapted=data['is_adapted']
+        )
+        doc = assignment.model_dump()
+        doc['created_at'] = doc['created_at'].isoformat()
+        for shift, source in zip(doc['shifts'], data['shifts']):
+            if source.get('admin_hours') is not None:
+                shift['admin_hours'] = source['admin_hours']
+        add_shift_time_fields(doc['shifts'])
+        docs.append(doc)
+        lines.append(group["lines"][0])
+        if len(docs) >= IMPORT_BATCH_SIZE:
+            await report.write(db.assignments, docs, lines)
+            docs, lines = [], []
+    await report.write(db.assignments, docs, lines)
+    return report.as_dict()
+
 # ============== CONFLICT CHECK ==============
 
 @api_router.post("/check-conflict")
@@ -1001,8 +3131,7 @@ async def check_conflict(data: dict):
         
         for shift in assignment.get('shifts', []):
             for block in shift.get('blocks', []):
-                block_start = time_to_minutes(block['start_time']) - block.get('hlp_before', 0)
-                block_end = time_to_minutes(block['end_time']) + block.get('hlp_after', 0)
+                block_start, block_end = block_interval(block)
                 
                 overlap = min(new_end, block_end) - max(new_start, block_start)
                 if overlap > 5:
@@ -1018,8 +3147,7 @@ async def check_conflict(data: dict):
     for task in temp_tasks:
         if task.get('id') == exclude_id:
             continue
-        task_start = time_to_minutes(task['start_time'])
-        task_end = time_to_minutes(task['end_time'])
+        task_start, task_end = task_interval(task)
         
         overlap = min(new_end, task_end) - max(new_start, task_start)
         if overlap > 5:
@@ -1045,13 +3173,19 @@ async def generate_hours_report(
     from reportlab.lib.pagesizes import letter
     from reportlab.platypus import LongTable
     
-    employees = await db.employees.find({}, {"_id": 0}).to_list(200)
-    assignments = await db.assignments.find({}, {"_id": 0}).to_list(500)
-    temp_tasks = await db.temporary_tasks.find({}, {"_id": 0}).to_list(500)
-    absences = await db.absences.find({}, {"_id": 0}).to_list(500)
-    holidays = await db.holidays.find({}, {"_id": 0}).to_list(100)
+    start = time.perf_counter()
+    employees, assignments, temp_tasks, absences, calendar = await asyncio.gather(
+        timed("load.employees", db.employees.find({}, {"_id": 0}).to_list(None)),
+        timed("load.assignments", db.assignments.find({}, {"_id": 0}).to_list(None)),
+        timed("load.temporary_tasks", find_dated("temporary_tasks", start_date, end_date)),
+        timed("load.absences", db.absences.find({}, {"_id": 0}).to_list(None)),
+        timed("load.holidays", holiday_calendar.load()),
+    )
+    metrics.record("load.report_collections", (time.perf_counter() - start) * 1000)
     
-    holiday_dates = {h['date'] for h in holidays}
+    absence_index = AbsenceIndex(absences)
+    assignments_by_emp = group_by_employee(assignments)
+    tasks_by_emp = group_by_employee(temp_tasks)
     
     if employee_ids:
         emp_ids = employee_ids.split(',')
@@ -1065,15 +3199,8 @@ async def generate_hours_report(
     else:  # name (alphabetical)
         employees.sort(key=lambda e: e.get('name', ''))
     
-    # Generate date range (excluding weekends)
-    start = datetime.strptime(start_date, '%Y-%m-%d')
-    end = datetime.strptime(end_date, '%Y-%m-%d')
-    date_range = []
-    current = start
-    while current <= end:
-        if current.weekday() < 5:
-            date_range.append(current.strftime('%Y-%m-%d'))
-        current += timedelta(days=1)
+    # Generate date range (excluding weekends, holidays are shown as F)
+    report_dates = calendar.business_days(start_date, end_date, include_holidays=True)
     
     # Always use portrait orientation
     page_size = letter
@@ -1101,33 +3228,27 @@ async def generate_hours_report(
         return f"{days_fr[dt.weekday()]}\n{dt.day}"
     
     # Build headers: Matricule, Nom, [dates...], Total
-    headers = ["Mat.", "Employé"] + [format_date_header(d) for d in date_range] + ["TOTAL"]
+    headers = ["Mat.", "Employé"] + [format_date_header(d) for d in report_dates] + ["TOTAL"]
     table_data = [headers]
     
     for emp in employees:
         emp_id = emp['id']
-        emp_assignments = [a for a in assignments if a.get('employee_id') == emp_id]
-        emp_temp_tasks = [t for t in temp_tasks if t.get('employee_id') == emp_id]
-        emp_absences = [a for a in absences if a.get('employee_id') == emp_id]
+        emp_assignments = assignments_by_emp.get(emp_id, [])
+        emp_temp_tasks = tasks_by_emp.get(emp_id, [])
         
         row = [emp.get('matricule', '-')[:6], emp['name'][:18]]
         total_minutes = 0
         
-        for date_str in date_range:
-            if date_str in holiday_dates:
+        for date_str in report_dates:
+            if calendar.is_holiday(date_str):
                 row.append("F")
                 continue
             
-            is_absent = any(
-                a['start_date'] <= date_str <= a['end_date']
-                for a in emp_absences
-            )
-            
-            if is_absent:
+            if absence_index.is_absent(emp_id, date_str):
                 row.append("A")
                 continue
             
-            day_minutes = calculate_daily_hours(emp_assignments, emp_temp_tasks, date_str, holiday_dates)
+            day_minutes = calculate_daily_hours(emp_assignments, emp_temp_tasks, date_str, calendar.dates)
             total_minutes += day_minutes
             
             if day_minutes > 0:
@@ -1139,7 +3260,7 @@ async def generate_hours_report(
         table_data.append(row)
     
     # Calculate column widths based on number of days
-    num_days = len(date_range)
+    num_days = len(report_dates)
     page_width = letter[0] - 30  # Account for margins
     mat_width = 32
     name_width = 80
@@ -1191,6 +3312,300 @@ async def generate_hours_report(
         headers={"Content-Disposition": f"attachment; filename=rapport_heures_{start_date}_{end_date}.pdf"}
     )
 
+# ============== DATABASE INDEXES ==============
+
+# Index requis par les requêtes fréquentes (find_one par id, doublons, conflits, réassignations)
+INDEX_SPECS = {
+    "admins": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("code", ASCENDING)], name="code"),
+    ],
+    "employees": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # Uniques lorsque renseignés (filet de sécurité de check_employee_duplicates)
+        IndexModel([("matricule", ASCENDING)], name="matricule", unique=True,
+                   partialFilterExpression={"matricule": {"$gt": ""}}),
+        IndexModel([("email", ASCENDING)], name="email", unique=True,
+                   partialFilterExpression={"email": {"$gt": ""}}),
+        IndexModel([("phone", ASCENDING)], name="phone", unique=True,
+                   partialFilterExpression={"phone": {"$gt": ""}}),
+        # Une berline n'est unique que parmi les employés actifs
+        IndexModel([("berline", ASCENDING)], name="berline_active", unique=True,
+                   partialFilterExpression={"berline": {"$gt": ""}, "is_inactive": False}),
+        IndexModel([("berline", ASCENDING), ("is_inactive", ASCENDING)], name="berline_is_inactive"),
+        # Tris et pagination par curseur de GET /employees
+        IndexModel([("name", ASCENDING), ("id", ASCENDING)], name="name_id"),
+        IndexModel([("hire_date", ASCENDING), ("id", ASCENDING)], name="hire_date_id"),
+        IndexModel([("is_inactive", ASCENDING), ("name", ASCENDING), ("id", ASCENDING)], name="is_inactive_name_id"),
+    ],
+    "schools": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("name", ASCENDING), ("id", ASCENDING)], name="name_id"),
+    ],
+    "assignments": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("employee_id", ASCENDING)], name="employee_id"),
+        IndexModel([("start_date", ASCENDING), ("end_date", ASCENDING)], name="period"),
+        IndexModel([("circuit_number", ASCENDING), ("id", ASCENDING)], name="circuit_number_id"),
+        IndexModel([("start_date", ASCENDING), ("id", ASCENDING)], name="start_date_id"),
+    ],
+    "temporary_tasks": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("employee_id", ASCENDING), ("date", ASCENDING)], name="employee_id_date"),
+        IndexModel([("date", ASCENDING), ("start_min", ASCENDING)], name="date_start_min"),
+        IndexModel([("date", ASCENDING), ("id", ASCENDING)], name="date_id"),
+        IndexModel([("name", ASCENDING), ("id", ASCENDING)], name="name_id"),
+    ],
+    "absences": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("employee_id", ASCENDING), ("start_date", ASCENDING)], name="employee_id_start_date"),
+        IndexModel([("start_date", ASCENDING), ("id", ASCENDING)], name="start_date_id"),
+        IndexModel([("end_date", ASCENDING), ("id", ASCENDING)], name="end_date_id"),
+    ],
+    "holidays": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("date", ASCENDING)], name="date"),
+        IndexModel([("date", ASCENDING), ("id", ASCENDING)], name="date_id"),
+        IndexModel([("name", ASCENDING), ("id", ASCENDING)], name="name_id"),
+    ],
+    "temporary_reassignments": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel(
+            [("date", ASCENDING), ("assignment_id", ASCENDING), ("shift_id", ASCENDING), ("block_id", ASCENDING)],
+            name="date_assignment_shift_block_unique",
+            unique=True
+        ),
+        # Suppressions en masse par employé ou par assignation
+        IndexModel([("original_employee_id", ASCENDING), ("date", ASCENDING)], name="original_employee_id_date"),
+        IndexModel([("new_employee_id", ASCENDING), ("date", ASCENDING)], name="new_employee_id_date"),
+        IndexModel([("assignment_id", ASCENDING), ("date", ASCENDING)], name="assignment_id_date"),
+        IndexModel([("date", ASCENDING), ("id", ASCENDING)], name="date_id"),
+    ],
+}
+
+for collection_name, archive_key in ARCHIVED_COLLECTIONS.items():
+    INDEX_SPECS[archive_name(collection_name)] = [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("date", ASCENDING)], name="date"),
+        # Index TTL: MongoDB supprime les documents ARCHIVE_TTL_DAYS jours après leur archivage
+        IndexModel([("archived_at", ASCENDING)], name="archived_at", **(
+            {"expireAfterSeconds": ARCHIVE_TTL_DAYS * 86400} if ARCHIVE_TTL_DAYS else {}
+        )),
+    ]
+    if archive_key != ("id",):
+        INDEX_SPECS[archive_name(collection_name)].append(
+            IndexModel([(field, ASCENDING) for field in archive_key], name="archive_key_unique", unique=True)
+        )
+
+# Codes MongoDB: IndexOptionsConflict / IndexKeySpecsConflict (même nom, autres options)
+INDEX_CONFLICT_CODES = {85, 86}
+
+index_build_status = {}
+
+async def ensure_indexes() -> dict:
+    """
+    Create the indexes of INDEX_SPECS (idempotent). An index whose options changed is rebuilt.
+    Failures (e.g. existing duplicates for a unique index) are reported, not raised.
+    """
+    # Doublons d'avant l'index unique (date, assignment_id, shift_id, block_id): à retirer d'abord
+    try:
+        await dedupe_temporary_reassignments()
+    except PyMongoError as e:
+        logger.warning(f"Duplicate temporary reassignments not removed: {e}")
+    for collection_name, models in INDEX_SPECS.items():
+        collection = db[collection_name]
+        status = index_build_status.setdefault(collection_name, {})
+        for model in models:
+            name = model.document['name']
+            status[name] = "building"
+            try:
+                try:
+                    await collection.create_indexes([model])
+                except OperationFailure as e:
+                    if e.code not in INDEX_CONFLICT_CODES:
+                        raise
+                    await collection.drop_index(name)
+                    await collection.create_indexes([model])
+                status[name] = "ready"
+            except PyMongoError as e:
+                status[name] = f"failed: {e}"
+                logger.warning(f"Index {collection_name}.{name} not created: {e}")
+    return index_build_status
+
+@api_router.get("/admin/indexes")
+async def get_index_status():
+    """Index build status as reported by the startup routine"""
+    return {"status": index_build_status}
+
+@api_router.post("/admin/indexes")
+async def rebuild_indexes():
+    """Re-run the index creation (e.g. after removing duplicates)"""
+    return {"status": await ensure_indexes()}
+
+# ============== MIGRATIONS ==============
+
+MIGRATION_BATCH_SIZE = 500
+
+async def flush_migration_batch(collection, operations: list) -> int:
+    if not operations:
+        return 0
+    result = await collection.bulk_write(operations, ordered=False)
+    operations.clear()
+    return result.modified_count
+
+async def migrate_time_fields() -> dict:
+    """
+    One-time backfill of the precomputed minute fields (start_min, hlp_start_min, days_mask...)
+    on existing assignments and temporary tasks. Each update is conditioned on the values it was
+    computed from, so a concurrent edit is never overwritten.
+    """
+    migration_id = "time_fields_v1"
+    if await db.migrations.find_one({"id": migration_id}):
+        return {"id": migration_id, "status": "already_applied"}
+    
+    counts = {"assignments": 0, "temporary_tasks": 0}
+    operations = []
+    async for assignment in db.assignments.find({}, {"_id": 0, "id": 1, "shifts": 1}):
+        original = assignment.get('shifts', [])
+        shifts = add_shift_time_fields(copy.deepcopy(original))
+        if shifts != original:
+            operations.append(UpdateOne({"id": assignment['id'], "shifts": original}, {"$set": {"shifts": shifts}}))
+        if len(operations) >= MIGRATION_BATCH_SIZE:
+            counts["assignments"] += await flush_migration_batch(db.assignments, operations)
+    counts["assignments"] += await flush_migration_batch(db.assignments, operations)
+    
+    async for task in db.temporary_tasks.find({}, {"_id": 0, "id": 1, "date": 1, "start_time": 1, "end_time": 1}):
+        fields = task_time_fields(task)
+        operations.append(UpdateOne(task, {"$set": fields}))
+        if len(operations) >= MIGRATION_BATCH_SIZE:
+            counts["temporary_tasks"] += await flush_migration_batch(db.temporary_tasks, operations)
+    counts["temporary_tasks"] += await flush_migration_batch(db.temporary_tasks, operations)
+    
+    await db.migrations.update_one(
+        {"id": migration_id},
+        {"$setOnInsert": {"id": migration_id, "applied_at": datetime.now(timezone.utc).isoformat(), "updated": counts}},
+        upsert=True
+    )
+    logger.info(f"Migration {migration_id} applied: {counts}")
+    return {"id": migration_id, "status": "applied", "updated": counts}
+
+async def dedupe_temporary_reassignments() -> dict:
+    """
+    One-time removal of duplicate temporary reassignments (same date, assignment_id, shift_id and
+    block_id, left by concurrent inserts before the upsert), keeping the newest of each, so that
+    the unique index on that key can be created.
+    """
+    migration_id = "dedupe_reassignments_v1"
+    if await db.migrations.find_one({"id": migration_id}):
+        return {"id": migration_id, "status": "already_applied"}
+    
+    removed = 0
+    seen = set()
+    duplicate_ids = []
+    projection = {"_id": 0, "id": 1, "date": 1, "assignment_id": 1, "shift_id": 1, "block_id": 1}
+    newest_first = [("created_at", DESCENDING), ("id", DESCENDING)]
+    async for doc in db.temporary_reassignments.find({}, projection).sort(newest_first):
+        key = (doc.get('date'), doc.get('assignment_id'), doc.get('shift_id'), doc.get('block_id'))
+        if key in seen:
+            duplicate_ids.append(doc['id'])
+        seen.add(key)
+        if len(duplicate_ids) >= MIGRATION_BATCH_SIZE:
+            removed += (await db.temporary_reassignments.delete_many({"id": {"$in": duplicate_ids}})).deleted_count
+            duplicate_ids = []
+    if duplicate_ids:
+        removed += (await db.temporary_reassignments.delete_many({"id": {"$in": duplicate_ids}})).deleted_count
+    
+    await db.migrations.update_one(
+        {"id": migration_id},
+        {"$setOnInsert": {"id": migration_id, "applied_at": datetime.now(timezone.utc).isoformat(), "removed": removed}},
+        upsert=True
+    )
+    if removed:
+        logger.info(f"Migration {migration_id} applied: {removed} duplicate reassignments removed")
+    return {"id": migration_id, "status": "applied", "removed": removed}
+
+# ============== ARCHIVAL ==============
+
+ARCHIVE_BATCH_SIZE = 500
+
+archive_status = {"last_run": None, "last_cutoff": None, "moved": {}}
+
+async def load_archive_watermarks():
+    for collection_name in ARCHIVED_COLLECTIONS:
+        latest = await db[archive_name(collection_name)].find_one({}, {"_id": 0, "date": 1}, sort=[("date", DESCENDING)])
+        if latest:
+            archive_watermarks[collection_name] = latest['date']
+
+async def archive_collection(collection_name: str, cutoff: str) -> int:
+    """
+    Move the documents dated before cutoff to the archive collection, in batches. Archive writes are
+    idempotent upserts on the archive key; a hot document is only deleted if it was not modified in between.
+    """
+    hot = db[collection_name]
+    archive = db[archive_name(collection_name)]
+    archive_key = ARCHIVED_COLLECTIONS[collection_name]
+    moved = 0
+    while True:
+        batch = await hot.find({"date": {"$lt": cutoff}}, {"_id": 0}).limit(ARCHIVE_BATCH_SIZE).to_list(None)
+        if not batch:
+            break
+        archived_at = datetime.now(timezone.utc)
+        try:
+            await archive.bulk_write(
+                [
+                    ReplaceOne({field: doc.get(field) for field in archive_key}, {**doc, "archived_at": archived_at}, upsert=True)
+                    for doc in batch
+                ],
+                ordered=False
+            )
+        except BulkWriteError as e:
+            # Upserts simultanés d'une autre instance: le document est déjà archivé
+            if any(error.get('code') != 11000 for error in e.details.get('writeErrors', [])):
+                raise
+        archive_watermarks[collection_name] = max(
+            archive_watermarks.get(collection_name, ""), max(doc['date'] for doc in batch)
+        )
+        result = await hot.bulk_write([DeleteOne(doc) for doc in batch], ordered=False)
+        moved += result.deleted_count
+        if result.deleted_count == 0:
+            break  # Tous modifiés entre-temps: réessayé au prochain passage
+    return moved
+
+async def archive_past_records() -> dict:
+    """Archive the temporary reassignments and tasks older than ARCHIVE_HORIZON_DAYS"""
+    cutoff = archive_cutoff()
+    moved = {}
+    for collection_name in ARCHIVED_COLLECTIONS:
+        moved[collection_name] = await timed(f"archive.{collection_name}", archive_collection(collection_name, cutoff))
+    archive_status.update({"last_run": datetime.now(timezone.utc).isoformat(), "last_cutoff": cutoff, "moved": moved})
+    if any(moved.values()):
+        logger.info(f"Archived records dated before {cutoff}: {moved}")
+    return archive_status
+
+async def archive_loop():
+    while True:
+        try:
+            await archive_past_records()
+        except PyMongoError as e:
+            logger.error(f"Archival failed: {e}")
+        await asyncio.sleep(ARCHIVE_INTERVAL_HOURS * 3600)
+
+@api_router.get("/admin/archive")
+async def get_archive_status():
+    """Archival settings and the result of the last run"""
+    return {
+        "horizon_days": ARCHIVE_HORIZON_DAYS,
+        "ttl_days": ARCHIVE_TTL_DAYS,
+        "interval_hours": ARCHIVE_INTERVAL_HOURS,
+        "cutoff": archive_cutoff(),
+        **archive_status
+    }
+
+@api_router.post("/admin/archive")
+async def run_archive():
+    """Archive past temporary reassignments and tasks now"""
+    return await archive_past_records()
+
 # ============== INIT DATA ==============
 
 @api_router.post("/init-data")
@@ -1213,18 +3628,209 @@ async def init_data():
     
     return {"success": True, "message": "Données initialisées"}
 
+@api_router.get("/health")
+async def health():
+    """Ready once the connection pool is warm (retries the warm-up until then)"""
+    if not app_state["ready"] and not await warm_up():
+        return Response(status_code=503, content='{"status": "starting"}', media_type="application/json")
+    return {"status": "ok"}
+
+@api_router.get("/metrics")
+async def get_metrics():
+    """Latency of the collection loads and other timed operations, response sizes per route"""
+    return {"latency": metrics.summary(), "payload": payload_metrics.summary()}
+
 @api_router.get("/")
 async def root():
     return {"message": "Les Berlines Trip à Bord - API de gestion des horaires"}
 
 app.include_router(api_router)
 
+# Routes qui publient leurs propres événements, ou dont les POST ne modifient pas les données
+DETAILED_EVENT_PREFIXES = (
+    "/api/temporary-reassignments", "/api/temporary-tasks", "/api/replacements",
+    "/api/auth", "/api/check-conflict", "/api/admin", "/api/events",
+)
+
+@app.middleware("http")
+async def publish_write_events(request: Request, call_next):
+    """Any other successful write publishes a resource.changed event (resource = first path segment)"""
+    response = await call_next(request)
+    path = request.url.path
+    if (request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400
+            and path.startswith("/api/") and not path.startswith(DETAILED_EVENT_PREFIXES)):
+        segments = path[len("/api/"):].split("/")
+        change_events.publish("resource.changed", resource=segments[0], method=request.method,
+                              resource_id=segments[1] if len(segments) > 1 else None)
+    return response
+
+# ============== CONDITIONAL GET ==============
+
+SCHEDULE_COLLECTIONS = (
+    "employees", "assignments", "absences", "holidays",
+    "temporary_tasks", archive_name("temporary_tasks"),
+    "temporary_reassignments", archive_name("temporary_reassignments"),
+)
+
+# Collections lues par les routes GET de données; leurs versions forment l'ETag
+# (les routes d'état en mémoire, comme /health ou /metrics, n'en ont pas)
+ROUTE_COLLECTIONS = {
+    "/api/admins": ("admins",),
+    "/api/employees": ("employees",),
+    "/api/schools": ("schools",),
+    "/api/assignments": ("assignments",),
+    "/api/temporary-tasks": ("temporary_tasks", archive_name("temporary_tasks")),
+    "/api/absences": ("absences",),
+    "/api/holidays": ("holidays",),
+    "/api/temporary-reassignments": ("temporary_reassignments", archive_name("temporary_reassignments")),
+    "/api/schedule": SCHEDULE_COLLECTIONS,
+    "/api/overtime": SCHEDULE_COLLECTIONS,
+    "/api/replacements/candidates": SCHEDULE_COLLECTIONS,
+    "/api/reports/hours-pdf": SCHEDULE_COLLECTIONS,
+    "/api/bootstrap": SCHEDULE_COLLECTIONS + ("schools",),
+}
+
+def collections_etag(names) -> str:
+    """Weak ETag from the collection versions; the date is included since some routes default to the current week"""
+    state = ",".join(f"{name}:{db.version(name)}" for name in names)
+    digest = hashlib.blake2b(f"{state}|{datetime.now().date()}".encode(), digest_size=8).hexdigest()
+    return f'W/"{db.epoch}-{digest}"'
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """If-None-Match (weak comparison) takes precedence over If-Modified-Since"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag.removeprefix("W/") in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+@app.middleware("http")
+async def conditional_get(request: Request, call_next):
+    """ETag and Last-Modified on data reads; 304 before the route runs when the client's copy is current"""
+    names = ROUTE_COLLECTIONS.get(request.url.path) if request.method in ("GET", "HEAD") else None
+    if names is None:
+        return await call_next(request)
+    # Versions lues avant la requête: une écriture concurrente rend l'ETag plus ancien que les données, jamais l'inverse
+    etag = collections_etag(names)
+    last_modified = db.last_modified(names)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    response = await call_next(request)
+    if response.status_code == 200:
+        response.headers.update(headers)
+    return response
+
+# ============== RESPONSE COMPRESSION ==============
+
+# Taille minimale (octets) d'une réponse compressée; 0 = pas de compression
+COMPRESSION_MIN_SIZE = env_int('COMPRESSION_MIN_SIZE', 1024)
+GZIP_LEVEL = env_int('GZIP_LEVEL', 6)
+BROTLI_QUALITY = env_int('BROTLI_QUALITY', 4)
+
+def accepted_encoding(accept_encoding: str) -> Optional[str]:
+    """br if the client accepts it and brotli is installed, else gzip if accepted"""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                pass
+        if quality > 0:
+            accepted.add(name.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+class CompressionMiddleware:
+    """
+    Compress JSON and text API responses of at least COMPRESSION_MIN_SIZE bytes (brotli or gzip), timed
+    under compress.<route>, and record their body and transfer sizes. Other responses (PDF) pass through.
+    """
+    
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith("/api"):
+            await self.app(scope, receive, send)
+            return
+        current_scope.set(scope)
+        encoding = accepted_encoding(Headers(scope=scope).get("accept-encoding", "")) if self.minimum_size else None
+        start_message = None
+        chunks = []
+        passthrough = False
+        
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                content_type = Headers(raw=message["headers"]).get("content-type", "")
+                passthrough = (not content_type.startswith(("application/json", "text/"))
+                               or content_type.startswith("text/event-stream"))
+                if passthrough:
+                    await send(message)
+                else:
+                    start_message = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            # Les middlewares @app.middleware découpent le corps: l'assembler avant de compresser
+            chunks.append(message.get("body", b""))
+            if message.get("more_body"):
+                return
+            body = b"".join(chunks)
+            # Routage fait: le scope porte la route trouvée
+            route = route_name(scope)
+            headers = MutableHeaders(raw=start_message["headers"])
+            if encoding and len(body) >= self.minimum_size and "content-encoding" not in headers:
+                started = time.perf_counter()
+                sent = compress(body, encoding)
+                metrics.record(f"compress.{route}", (time.perf_counter() - started) * 1000)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+            else:
+                sent = body
+            headers["Content-Length"] = str(len(sent))
+            payload_metrics.record(route, len(body), len(sent))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": sent})
+        
+        await self.app(scope, receive, send_compressed)
+
+app.add_middleware(CompressionMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 logging.basicConfig(
@@ -1233,6 +3839,55 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+app_state = {"ready": False}
+
+async def warm_up() -> bool:
+    """
+    Open the connection pool and prime the reference-data caches so that the first
+    request after a machine start does not pay for them.
+    """
+    try:
+        await timed("startup.ping", db.ping())
+        await timed("startup.pool_warmup", db.warm_up(MONGO_WARMUP_CONNECTIONS))
+        await timed("startup.prime_caches", asyncio.gather(
+            holiday_calendar.load(),
+            get_week_hours(get_week_dates()),
+        ))
+    except PyMongoError as e:
+        logger.error(f"Database warm-up failed: {e}")
+        return False
+    app_state["ready"] = True
+    return True
+
+@app.on_event("startup")
+async def create_db_indexes():
+    try:
+        await ensure_indexes()
+    except PyMongoError as e:
+        logger.error(f"Index creation failed at startup: {e}")
+
+@app.on_event("startup")
+async def run_migrations():
+    try:
+        await migrate_time_fields()
+    except PyMongoError as e:
+        logger.error(f"Migration failed at startup: {e}")
+
+@app.on_event("startup")
+async def start_archival():
+    try:
+        await load_archive_watermarks()
+    except PyMongoError as e:
+        logger.error(f"Archive watermarks not loaded: {e}")
+    if ARCHIVE_INTERVAL_HOURS:
+        app_state["archive_task"] = asyncio.create_task(archive_loop())
+
+@app.on_event("startup")
+async def warm_up_db_client():
+    await warm_up()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
+    if app_state.get("archive_task"):
+        app_state["archive_task"].cancel()
+    db.close()
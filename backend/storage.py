@@ -0,0 +1,804 @@
+"""
+Storage backends for the API collections.
+
+Handlers use a Storage object like a Motor database (``db.employees.find(...)``).
+Every write through a Storage bumps the version of its collection (``versions``,
+``modified``), which the API turns into ETags. MotorStorage talks to MongoDB;
+MemoryStorage keeps everything in process so the schedule and report engines can
+be profiled and load-tested without a server.
+MemoryStorage implements the subset of the MongoDB query and update language the
+API uses (comparison, $in/$nin, $ne, $exists, $regex, $elemMatch, $or/$and/$nor,
+dotted paths into arrays, projections, sort/skip/limit, $set/$unset/$inc/
+$setOnInsert/$push/$pull/$addToSet, upserts, bulk writes and unique indexes).
+"""
+
+import asyncio
+import copy
+import re
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from pymongo.operations import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+from pymongo.results import BulkWriteResult, DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+_MISSING = object()
+
+# Méthodes d'écriture des collections (Motor et MemoryCollection)
+_WRITE_METHODS = frozenset({
+    "insert_one", "insert_many", "update_one", "update_many", "replace_one", "delete_one", "delete_many",
+    "find_one_and_update", "find_one_and_replace", "find_one_and_delete", "bulk_write", "drop",
+})
+
+
+class VersionedCollection:
+    """Collection proxy that bumps the storage's version of the collection after every write"""
+
+    def __init__(self, storage: "Storage", name: str, collection):
+        self._storage = storage
+        self._name = name
+        self._collection = collection
+
+    def __getattr__(self, attr: str):
+        value = getattr(self._collection, attr)
+        if attr not in _WRITE_METHODS:
+            return value
+
+        async def write(*args, **kwargs):
+            try:
+                return await value(*args, **kwargs)
+            finally:
+                # Même en cas d'erreur: une écriture en masse a pu s'appliquer en partie
+                self._storage.touch(self._name)
+        return write
+
+
+class Storage(ABC):
+    """Repository of named collections: ``storage.employees`` or ``storage['employees']``"""
+
+    def __init__(self):
+        # Identifie ce processus: des versions d'une autre instance ou d'avant un redémarrage ne correspondent pas
+        self.epoch = uuid.uuid4().hex[:8]
+        self.versions = {}
+        self.modified = {}
+        self.started_at = datetime.now(timezone.utc)
+        self._versioned = {}
+
+    @abstractmethod
+    def _collection(self, name: str):
+        """The backend's collection object for a name"""
+
+    def collection(self, name: str) -> VersionedCollection:
+        if name not in self._versioned:
+            self._versioned[name] = VersionedCollection(self, name, self._collection(name))
+        return self._versioned[name]
+
+    def touch(self, *names: str):
+        """Record a write to the named collections"""
+        now = datetime.now(timezone.utc)
+        for name in names:
+            self.versions[name] = self.versions.get(name, 0) + 1
+            self.modified[name] = now
+
+    def version(self, name: str) -> int:
+        return self.versions.get(name, 0)
+
+    def last_modified(self, names) -> datetime:
+        """Time of the latest write to any of the collections (the start of the process if none)"""
+        return max([self.started_at] + [self.modified[name] for name in names if name in self.modified])
+
+    def __getitem__(self, name: str):
+        return self.collection(name)
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self.collection(name)
+
+    @abstractmethod
+    async def ping(self):
+        """Round trip to the backend (raises when it is unreachable)"""
+
+    async def warm_up(self, connections: int):
+        await self.ping()
+
+    async def supports_transactions(self) -> bool:
+        return False
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Session to pass to writes as session=..., or None when transactions are not supported"""
+        yield None
+
+    def close(self):
+        pass
+
+
+class MotorStorage(Storage):
+    """MongoDB through Motor"""
+
+    def __init__(self, mongo_url: str, db_name: str, **client_options):
+        from motor.motor_asyncio import AsyncIOMotorClient
+        super().__init__()
+        self.client = AsyncIOMotorClient(mongo_url, **client_options)
+        self.db = self.client[db_name]
+        self._supports_transactions = None
+
+    def _collection(self, name: str):
+        return self.db[name]
+
+    async def ping(self):
+        await self.client.admin.command('ping')
+
+    async def warm_up(self, connections: int):
+        # Ouvrir plusieurs connexions du pool en parallèle
+        await asyncio.gather(*[self.db.command('ping') for _ in range(max(1, connections))])
+
+    async def supports_transactions(self) -> bool:
+        """Transactions need a replica set or a sharded cluster (not a standalone server)"""
+        if self._supports_transactions is None:
+            hello = await self.client.admin.command('hello')
+            self._supports_transactions = bool(hello.get('setName')) or hello.get('msg') == 'isdbgrid'
+        return self._supports_transactions
+
+    @asynccontextmanager
+    async def transaction(self):
+        if not await self.supports_transactions():
+            yield None
+            return
+        async with await self.client.start_session() as session:
+            async with session.start_transaction():
+                yield session
+        # Les écritures ne sont visibles qu'après le commit: les versions lues entre-temps sont périmées
+        self.touch(*self.versions)
+
+    def close(self):
+        self.client.close()
+
+
+class MemoryStorage(Storage):
+    """In-process collections, for benchmarks, load tests and local development"""
+
+    def __init__(self):
+        super().__init__()
+        self._collections = {}
+
+    def _collection(self, name: str) -> "MemoryCollection":
+        if name not in self._collections:
+            self._collections[name] = MemoryCollection(name)
+        return self._collections[name]
+
+    async def ping(self):
+        return {"ok": 1}
+
+
+# ============== QUERY MATCHING ==============
+
+def _path_values(value, parts: list) -> list:
+    """Values at a dotted path, traversing arrays like MongoDB does"""
+    if not parts:
+        return [value]
+    if isinstance(value, dict):
+        if parts[0] not in value:
+            return []
+        return _path_values(value[parts[0]], parts[1:])
+    if isinstance(value, list):
+        if parts[0].isdigit():
+            index = int(parts[0])
+            return _path_values(value[index], parts[1:]) if index < len(value) else []
+        values = []
+        for item in value:
+            if isinstance(item, (dict, list)):
+                values.extend(_path_values(item, parts))
+        return values
+    return []
+
+def _candidates(doc: dict, path: str) -> list:
+    """Values to compare for a field: leaf arrays also contribute their elements"""
+    values = _path_values(doc, path.split('.'))
+    expanded = []
+    for value in values:
+        expanded.append(value)
+        if isinstance(value, list):
+            expanded.extend(value)
+    return expanded
+
+def _type_rank(value) -> int:
+    if value is None or value is _MISSING:
+        return 1
+    if isinstance(value, bool):
+        return 8
+    if isinstance(value, (int, float)):
+        return 2
+    if isinstance(value, str):
+        return 3
+    if isinstance(value, dict):
+        return 4
+    if isinstance(value, list):
+        return 5
+    if isinstance(value, ObjectId):
+        return 7
+    if isinstance(value, datetime):
+        return 9
+    return 10
+
+def _comparable(a, b) -> bool:
+    return _type_rank(a) == _type_rank(b) and a is not None and b is not None
+
+def _equals(candidates: list, target) -> bool:
+    if target is None:
+        return not candidates or any(c is None for c in candidates)
+    return any(_type_rank(c) == _type_rank(target) and c == target for c in candidates)
+
+def _match_operators(doc: dict, path: str, condition: dict) -> bool:
+    candidates = _candidates(doc, path)
+    for op, arg in condition.items():
+        if op == '$eq':
+            ok = _equals(candidates, arg)
+        elif op == '$ne':
+            ok = not _equals(candidates, arg)
+        elif op in ('$gt', '$gte', '$lt', '$lte'):
+            compare = {
+                '$gt': lambda a, b: a > b,
+                '$gte': lambda a, b: a >= b,
+                '$lt': lambda a, b: a < b,
+                '$lte': lambda a, b: a <= b,
+            }[op]
+            ok = any(_comparable(c, arg) and compare(c, arg) for c in candidates)
+        elif op == '$in':
+            ok = any(_equals(candidates, v) for v in arg)
+        elif op == '$nin':
+            ok = not any(_equals(candidates, v) for v in arg)
+        elif op == '$exists':
+            ok = bool(_path_values(doc, path.split('.'))) == bool(arg)
+        elif op == '$regex':
+            pattern = re.compile(arg, re.IGNORECASE if 'i' in condition.get('$options', '') else 0)
+            ok = any(isinstance(c, str) and pattern.search(c) for c in candidates)
+        elif op == '$options':
+            ok = True
+        elif op == '$size':
+            ok = any(isinstance(v, list) and len(v) == arg for v in _path_values(doc, path.split('.')))
+        elif op == '$elemMatch':
+            ok = any(
+                isinstance(v, list) and any(_match_element(item, arg) for item in v)
+                for v in _path_values(doc, path.split('.'))
+            )
+        elif op == '$not':
+            ok = not _match_operators(doc, path, arg)
+        else:
+            raise OperationFailure(f"Unsupported query operator {op}")
+        if not ok:
+            return False
+    return True
+
+_LOGICAL_OPERATORS = {'$and', '$or', '$nor'}
+
+def _match_element(item, condition: dict) -> bool:
+    is_query = any(not k.startswith('$') or k in _LOGICAL_OPERATORS for k in condition)
+    if isinstance(item, dict) and is_query:
+        return matches(item, condition)
+    return _match_operators({'v': item}, 'v', condition)
+
+def _is_operator_dict(value) -> bool:
+    return isinstance(value, dict) and value and all(k.startswith('$') for k in value)
+
+def matches(doc: dict, query: Optional[dict]) -> bool:
+    """Whether doc matches a MongoDB query filter"""
+    if not query:
+        return True
+    for key, condition in query.items():
+        if key == '$and':
+            if not all(matches(doc, q) for q in condition):
+                return False
+        elif key == '$or':
+            if not any(matches(doc, q) for q in condition):
+                return False
+        elif key == '$nor':
+            if any(matches(doc, q) for q in condition):
+                return False
+        elif _is_operator_dict(condition):
+            if not _match_operators(doc, key, condition):
+                return False
+        elif not _equals(_candidates(doc, key), condition):
+            return False
+    return True
+
+
+# ============== PROJECTION, SORT, UPDATES ==============
+
+def _project(doc: dict, projection) -> dict:
+    if not projection:
+        return copy.deepcopy(doc)
+    if isinstance(projection, (list, tuple)):
+        projection = {field: 1 for field in projection}
+    include_id = projection.get('_id', 1)
+    fields = {k: v for k, v in projection.items() if k != '_id'}
+    if fields and all(fields.values()):
+        result = {}
+        if include_id and '_id' in doc:
+            result['_id'] = doc['_id']
+        for field in fields:
+            parts = field.split('.')
+            value = doc
+            for part in parts:
+                if not isinstance(value, dict) or part not in value:
+                    value = _MISSING
+                    break
+                value = value[part]
+            if value is _MISSING:
+                continue
+            target = result
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = copy.deepcopy(value)
+        return result
+    excluded = {k for k, v in fields.items() if not v}
+    if not include_id:
+        excluded.add('_id')
+    return {k: copy.deepcopy(v) for k, v in doc.items() if k not in excluded}
+
+def _sort_key(value):
+    if value is _MISSING:
+        value = None
+    return (_type_rank(value), value if value is not None else 0)
+
+def _sort_documents(docs: list, sort_spec: list) -> list:
+    for field, direction in reversed(sort_spec):
+        def key(doc, field=field):
+            values = _path_values(doc, field.split('.'))
+            return _sort_key(values[0] if values else _MISSING)
+        docs.sort(key=key, reverse=direction < 0)
+    return docs
+
+def _normalize_sort(key_or_list, direction=None) -> list:
+    if key_or_list is None:
+        return []
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction if direction is not None else 1)]
+    return list(key_or_list)
+
+def _set_path(doc: dict, path: str, value):
+    parts = path.split('.')
+    target = doc
+    for part in parts[:-1]:
+        if isinstance(target, list) and part.isdigit():
+            target = target[int(part)]
+            continue
+        target = target.setdefault(part, {})
+    if isinstance(target, list) and parts[-1].isdigit():
+        target[int(parts[-1])] = value
+    else:
+        target[parts[-1]] = value
+
+def _get_path(doc: dict, path: str):
+    values = _path_values(doc, path.split('.'))
+    return values[0] if values else _MISSING
+
+def _unset_path(doc: dict, path: str):
+    parts = path.split('.')
+    target = doc
+    for part in parts[:-1]:
+        if not isinstance(target, dict) or part not in target:
+            return
+        target = target[part]
+    if isinstance(target, dict):
+        target.pop(parts[-1], None)
+
+def _apply_update(doc: dict, update: dict, inserting: bool = False) -> dict:
+    if not any(k.startswith('$') for k in update):
+        # Remplacement complet (en conservant _id)
+        replaced = copy.deepcopy(update)
+        if '_id' in doc:
+            replaced['_id'] = doc['_id']
+        return replaced
+    doc = copy.deepcopy(doc)
+    for op, fields in update.items():
+        if op == '$set' or (op == '$setOnInsert' and inserting):
+            for path, value in fields.items():
+                _set_path(doc, path, copy.deepcopy(value))
+        elif op == '$setOnInsert':
+            continue
+        elif op == '$unset':
+            for path in fields:
+                _unset_path(doc, path)
+        elif op == '$inc':
+            for path, amount in fields.items():
+                current = _get_path(doc, path)
+                _set_path(doc, path, (0 if current is _MISSING else current) + amount)
+        elif op in ('$push', '$addToSet'):
+            for path, value in fields.items():
+                current = _get_path(doc, path)
+                items = list(current) if isinstance(current, list) else []
+                new_items = value['$each'] if isinstance(value, dict) and '$each' in value else [value]
+                for item in new_items:
+                    if op == '$push' or item not in items:
+                        items.append(copy.deepcopy(item))
+                _set_path(doc, path, items)
+        elif op == '$pull':
+            for path, condition in fields.items():
+                current = _get_path(doc, path)
+                if not isinstance(current, list):
+                    continue
+                if isinstance(condition, dict):
+                    kept = [item for item in current if not _match_element(item, condition)]
+                else:
+                    kept = [item for item in current if item != condition]
+                _set_path(doc, path, kept)
+        else:
+            raise OperationFailure(f"Unsupported update operator {op}")
+    return doc
+
+def _upsert_seed(query: dict) -> dict:
+    """Fields an upsert copies from the equality conditions of its filter"""
+    seed = {}
+    for key, condition in (query or {}).items():
+        if key.startswith('$'):
+            if key == '$and':
+                for sub in condition:
+                    seed.update(_upsert_seed(sub))
+            continue
+        if _is_operator_dict(condition):
+            if '$eq' in condition:
+                _set_path(seed, key, copy.deepcopy(condition['$eq']))
+            continue
+        _set_path(seed, key, copy.deepcopy(condition))
+    return seed
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+# ============== COLLECTION ==============
+
+class _UniqueIndex:
+    def __init__(self, name: str, fields: list, partial: Optional[dict]):
+        self.name = name
+        self.fields = fields
+        self.partial = partial
+        self.entries = {}
+
+    def key(self, doc: dict):
+        if self.partial and not matches(doc, self.partial):
+            return None
+        values = []
+        for field in self.fields:
+            value = _get_path(doc, field)
+            values.append(None if value is _MISSING else _freeze(value))
+        return tuple(values)
+
+    def duplicate_error(self, key: tuple) -> DuplicateKeyError:
+        key_pattern = {field: 1 for field in self.fields}
+        key_value = dict(zip(self.fields, key))
+        return DuplicateKeyError(
+            f"E11000 duplicate key error index: {self.name} dup key: {key_value}",
+            11000,
+            {"code": 11000, "keyPattern": key_pattern, "keyValue": key_value}
+        )
+
+
+class MemoryCursor:
+    """Subset of Motor's AsyncIOMotorCursor"""
+
+    def __init__(self, collection: "MemoryCollection", query: Optional[dict], projection=None):
+        self._collection = collection
+        self._query = query or {}
+        self._projection = projection
+        self._sort = []
+        self._skip = 0
+        self._limit = 0
+
+    def sort(self, key_or_list, direction=None) -> "MemoryCursor":
+        self._sort = _normalize_sort(key_or_list, direction)
+        return self
+
+    def skip(self, count: int) -> "MemoryCursor":
+        self._skip = count
+        return self
+
+    def limit(self, count: int) -> "MemoryCursor":
+        self._limit = count
+        return self
+
+    def _results(self, length: Optional[int] = None) -> list:
+        docs = self._collection._matching(self._query)
+        if self._sort:
+            docs = _sort_documents(list(docs), self._sort)
+        docs = docs[self._skip:]
+        limit = self._limit or None
+        if length is not None:
+            limit = min(limit, length) if limit else length
+        if limit is not None:
+            docs = docs[:limit]
+        return [_project(doc, self._projection) for doc in docs]
+
+    async def to_list(self, length: Optional[int] = None) -> list:
+        return self._results(length)
+
+    def __aiter__(self):
+        self._iterator = iter(self._results())
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class MemoryCollection:
+    """Subset of Motor's AsyncIOMotorCollection, backed by an insertion-ordered dict"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._docs = {}
+        self._unique = {}
+        self._indexes = {"_id_": {"key": [("_id", 1)], "v": 2}}
+
+    # ---- lecture ----
+
+    def _matching(self, query: Optional[dict]) -> list:
+        query = query or {}
+        # Recherche directe par un index unique complet (ex.: {"id": ...})
+        for index in self._unique.values():
+            if index.partial or not all(f in query and not isinstance(query[f], dict) for f in index.fields):
+                continue
+            doc_id = index.entries.get(tuple(_freeze(query[f]) for f in index.fields))
+            doc = self._docs.get(doc_id) if doc_id is not None else None
+            return [doc] if doc is not None and matches(doc, query) else []
+        if '_id' in query and not isinstance(query['_id'], dict):
+            doc = self._docs.get(query['_id'])
+            return [doc] if doc is not None and matches(doc, query) else []
+        return [doc for doc in self._docs.values() if matches(doc, query)]
+
+    def find(self, filter: Optional[dict] = None, projection=None, sort=None, skip: int = 0, limit: int = 0) -> MemoryCursor:
+        cursor = MemoryCursor(self, filter, projection)
+        if sort:
+            cursor.sort(sort)
+        return cursor.skip(skip).limit(limit)
+
+    async def find_one(self, filter: Optional[dict] = None, projection=None, sort=None):
+        results = self.find(filter, projection, sort=sort).limit(1)._results()
+        return results[0] if results else None
+
+    async def count_documents(self, filter: Optional[dict] = None, **kwargs) -> int:
+        return len(self._matching(filter))
+
+    async def estimated_document_count(self) -> int:
+        return len(self._docs)
+
+    async def distinct(self, key: str, filter: Optional[dict] = None) -> list:
+        values = []
+        for doc in self._matching(filter):
+            for value in _candidates(doc, key):
+                if not isinstance(value, list) and value not in values:
+                    values.append(value)
+        return values
+
+    # ---- écriture ----
+
+    def _check_unique(self, doc: dict, replacing_id=None):
+        for index in self._unique.values():
+            key = index.key(doc)
+            if key is None:
+                continue
+            existing = index.entries.get(key)
+            if existing is not None and existing != replacing_id:
+                raise index.duplicate_error(key)
+
+    def _index_add(self, doc: dict):
+        for index in self._unique.values():
+            key = index.key(doc)
+            if key is not None:
+                index.entries[key] = doc['_id']
+
+    def _index_remove(self, doc: dict):
+        for index in self._unique.values():
+            key = index.key(doc)
+            if key is not None and index.entries.get(key) == doc['_id']:
+                del index.entries[key]
+
+    def _insert(self, document: dict):
+        if '_id' not in document:
+            document['_id'] = ObjectId()
+        if document['_id'] in self._docs:
+            raise _UniqueIndex('_id_', ['_id'], None).duplicate_error((document['_id'],))
+        stored = copy.deepcopy(document)
+        self._check_unique(stored)
+        self._docs[stored['_id']] = stored
+        self._index_add(stored)
+        return stored['_id']
+
+    def _replace(self, old: dict, new: dict):
+        self._check_unique(new, replacing_id=old['_id'])
+        self._index_remove(old)
+        self._docs[old['_id']] = new
+        self._index_add(new)
+
+    def _update(self, filter: dict, update: dict, upsert: bool, multi: bool) -> dict:
+        targets = self._matching(filter)
+        if not multi:
+            targets = targets[:1]
+        if not targets:
+            if not upsert:
+                return {"n": 0, "nModified": 0}
+            seed = _upsert_seed(filter)
+            if any(k.startswith('$') for k in update):
+                doc = _apply_update(seed, update, inserting=True)
+            else:
+                doc = {**seed, **copy.deepcopy(update)}
+            upserted_id = self._insert(doc)
+            return {"n": 1, "nModified": 0, "upserted": upserted_id}
+        modified = 0
+        for old in targets:
+            new = _apply_update(old, update)
+            if new != old:
+                self._replace(old, new)
+                modified += 1
+        return {"n": len(targets), "nModified": modified}
+
+    async def insert_one(self, document: dict, **kwargs) -> InsertOneResult:
+        return InsertOneResult(self._insert(document), True)
+
+    async def insert_many(self, documents: list, ordered: bool = True, **kwargs) -> InsertManyResult:
+        inserted_ids = []
+        write_errors = []
+        for index, document in enumerate(documents):
+            try:
+                inserted_ids.append(self._insert(document))
+            except DuplicateKeyError as e:
+                write_errors.append({"index": index, "code": 11000, "errmsg": str(e), "op": document})
+                if ordered:
+                    break
+        if write_errors:
+            raise BulkWriteError({
+                "writeErrors": write_errors, "writeConcernErrors": [], "nInserted": len(inserted_ids),
+                "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": []
+            })
+        return InsertManyResult(inserted_ids, True)
+
+    async def update_one(self, filter: dict, update: dict, upsert: bool = False, **kwargs) -> UpdateResult:
+        return UpdateResult(self._update(filter, update, upsert, multi=False), True)
+
+    async def update_many(self, filter: dict, update: dict, upsert: bool = False, **kwargs) -> UpdateResult:
+        return UpdateResult(self._update(filter, update, upsert, multi=True), True)
+
+    async def replace_one(self, filter: dict, replacement: dict, upsert: bool = False, **kwargs) -> UpdateResult:
+        return UpdateResult(self._update(filter, replacement, upsert, multi=False), True)
+
+    async def delete_one(self, filter: dict, **kwargs) -> DeleteResult:
+        return DeleteResult({"n": self._delete(filter, multi=False)}, True)
+
+    async def delete_many(self, filter: dict, **kwargs) -> DeleteResult:
+        return DeleteResult({"n": self._delete(filter, multi=True)}, True)
+
+    def _delete(self, filter: dict, multi: bool) -> int:
+        targets = self._matching(filter)
+        if not multi:
+            targets = targets[:1]
+        for doc in targets:
+            self._index_remove(doc)
+            del self._docs[doc['_id']]
+        return len(targets)
+
+    async def find_one_and_update(self, filter: dict, update: dict, projection=None, sort=None,
+                                  upsert: bool = False, return_document=ReturnDocument.BEFORE, **kwargs):
+        targets = self._matching(filter)
+        if sort:
+            targets = _sort_documents(list(targets), _normalize_sort(sort))
+        before = targets[0] if targets else None
+        if before is None:
+            if not upsert:
+                return None
+            raw = self._update(filter, update, upsert=True, multi=False)
+            return _project(self._docs[raw['upserted']], projection) if return_document else None
+        after = _apply_update(before, update)
+        if after != before:
+            self._replace(before, after)
+        return _project(after if return_document else before, projection)
+
+    async def find_one_and_replace(self, filter: dict, replacement: dict, projection=None, sort=None,
+                                   upsert: bool = False, return_document=ReturnDocument.BEFORE, **kwargs):
+        return await self.find_one_and_update(filter, replacement, projection, sort, upsert, return_document)
+
+    async def find_one_and_delete(self, filter: dict, projection=None, sort=None, **kwargs):
+        targets = self._matching(filter)
+        if sort:
+            targets = _sort_documents(list(targets), _normalize_sort(sort))
+        if not targets:
+            return None
+        doc = targets[0]
+        self._index_remove(doc)
+        del self._docs[doc['_id']]
+        return _project(doc, projection)
+
+    async def bulk_write(self, requests: list, ordered: bool = True, **kwargs) -> BulkWriteResult:
+        result = {
+            "writeErrors": [], "writeConcernErrors": [], "nInserted": 0, "nUpserted": 0,
+            "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": []
+        }
+        for index, request in enumerate(requests):
+            try:
+                if isinstance(request, InsertOne):
+                    self._insert(request._doc)
+                    result["nInserted"] += 1
+                elif isinstance(request, (UpdateOne, UpdateMany, ReplaceOne)):
+                    raw = self._update(
+                        request._filter, request._doc, bool(request._upsert),
+                        multi=isinstance(request, UpdateMany)
+                    )
+                    if "upserted" in raw:
+                        result["nUpserted"] += 1
+                        result["upserted"].append({"index": index, "_id": raw["upserted"]})
+                    else:
+                        result["nMatched"] += raw["n"]
+                        result["nModified"] += raw["nModified"]
+                elif isinstance(request, (DeleteOne, DeleteMany)):
+                    result["nRemoved"] += self._delete(request._filter, multi=isinstance(request, DeleteMany))
+                else:
+                    raise TypeError(f"Unsupported bulk operation {request!r}")
+            except DuplicateKeyError as e:
+                result["writeErrors"].append({"index": index, "code": 11000, "errmsg": str(e)})
+                if ordered:
+                    break
+        if result["writeErrors"]:
+            raise BulkWriteError(result)
+        return BulkWriteResult(result, True)
+
+    # ---- index ----
+
+    async def create_indexes(self, indexes: list, **kwargs) -> list:
+        names = []
+        for model in indexes:
+            document = model.document
+            names.append(self._create_index(list(document['key'].items()), **{
+                k: v for k, v in document.items() if k != 'key'
+            }))
+        return names
+
+    async def create_index(self, keys, **kwargs) -> str:
+        return self._create_index(_normalize_sort(keys, 1), **kwargs)
+
+    def _create_index(self, keys: list, name: str = None, unique: bool = False,
+                      partialFilterExpression: dict = None, **options) -> str:
+        name = name or '_'.join(f"{field}_{direction}" for field, direction in keys)
+        spec = {"key": keys, "v": 2}
+        if unique:
+            spec["unique"] = True
+        if partialFilterExpression:
+            spec["partialFilterExpression"] = partialFilterExpression
+        spec.update(options)
+        existing = self._indexes.get(name)
+        if existing is not None:
+            if existing != spec:
+                raise OperationFailure(f"Index with name: {name} already exists with different options", 85)
+            return name
+        if unique:
+            index = _UniqueIndex(name, [field for field, _ in keys], partialFilterExpression)
+            for doc in self._docs.values():
+                key = index.key(doc)
+                if key is None:
+                    continue
+                if key in index.entries:
+                    raise index.duplicate_error(key)
+                index.entries[key] = doc['_id']
+            self._unique[name] = index
+        self._indexes[name] = spec
+        return name
+
+    async def drop_index(self, name: str, **kwargs):
+        if name not in self._indexes or name == '_id_':
+            raise OperationFailure(f"index not found with name [{name}]", 27)
+        del self._indexes[name]
+        self._unique.pop(name, None)
+
+    async def index_information(self) -> dict:
+        return copy.deepcopy(self._indexes)
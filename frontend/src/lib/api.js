@@ -1,12 +1,17 @@
 import axios from 'axios';
+import { v4 as uuidv4 } from 'uuid';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
 
+// Identifie cet onglet: les événements de ses propres écritures ne lui sont pas renvoyés
+const CLIENT_ID = uuidv4();
+
 const api = axios.create({
   baseURL: API,
   headers: {
     'Content-Type': 'application/json',
+    'X-Client-Id': CLIENT_ID,
   },
 });
 
@@ -16,7 +21,7 @@ export const getAdmins = () => api.get('/admins');
 export const initData = () => api.post('/init-data');
 
 // Employees
-export const getEmployees = () => api.get('/employees');
+export const getEmployees = (params) => api.get('/employees', { params });
 export const createEmployee = (data) => api.post('/employees', data);
 export const updateEmployee = (id, data) => api.put(`/employees/${id}`, data);
 export const deleteEmployee = (id) => api.delete(`/employees/${id}`);
@@ -28,31 +33,37 @@ export const updateSchool = (id, data) => api.put(`/schools/${id}`, data);
 export const deleteSchool = (id) => api.delete(`/schools/${id}`);
 
 // Assignments
-export const getAssignments = () => api.get('/assignments');
+export const getAssignments = (params) => api.get('/assignments', { params });
 export const createAssignment = (data) => api.post('/assignments', data);
 export const updateAssignment = (id, data) => api.put(`/assignments/${id}`, data);
 export const deleteAssignment = (id) => api.delete(`/assignments/${id}`);
+export const cloneAssignments = (data) => api.post('/assignments/clone', data);
 
 // Temporary Tasks
-export const getTemporaryTasks = () => api.get('/temporary-tasks');
+export const getTemporaryTasks = (params) => api.get('/temporary-tasks', { params });
 export const createTemporaryTask = (data) => api.post('/temporary-tasks', data);
 export const updateTemporaryTask = (id, data) => api.put(`/temporary-tasks/${id}`, data);
 export const deleteTemporaryTask = (id) => api.delete(`/temporary-tasks/${id}`);
+export const deleteTemporaryTasks = (params) => api.delete('/temporary-tasks', { params });
 
 // Absences
-export const getAbsences = () => api.get('/absences');
+export const getAbsences = (params) => api.get('/absences', { params });
 export const createAbsence = (data) => api.post('/absences', data);
 export const updateAbsence = (id, data) => api.put(`/absences/${id}`, data);
 export const deleteAbsence = (id) => api.delete(`/absences/${id}`);
 
 // Holidays
-export const getHolidays = () => api.get('/holidays');
+export const getHolidays = (params) => api.get('/holidays', { params });
 export const createHoliday = (data) => api.post('/holidays', data);
 export const deleteHoliday = (id) => api.delete(`/holidays/${id}`);
 
+// Bootstrap: reference data and the week's schedule in one response
+export const getBootstrap = (weekStart) => api.get('/bootstrap', { params: { week_start: weekStart } });
+
 // Schedule
 export const getSchedule = (params) => api.get('/schedule', { params });
 export const checkConflict = (data) => api.post('/check-conflict', data);
+export const getOvertime = (params) => api.get('/overtime', { params });
 
 // Temporary Reassignments (Drag & Drop)
 export const getTemporaryReassignments = (date) => 
@@ -63,6 +74,34 @@ export const deleteTemporaryReassignment = (id) =>
   api.delete(`/temporary-reassignments/${id}`);
 export const deleteReassignmentsByDate = (date) => 
   api.delete(`/temporary-reassignments/by-date/${date}`);
+export const bulkReassign = (data) => 
+  api.post('/temporary-reassignments/bulk', data);
+export const deleteTemporaryReassignments = (params) => 
+  api.delete('/temporary-reassignments', { params });
+
+// Change events (Server-Sent Events): handlers by event type, returns the unsubscribe function.
+// Events of this client's own writes are skipped (the page already reloads after them).
+export const subscribeToChanges = (handlers) => {
+  const source = new EventSource(`${API}/events`);
+  Object.entries(handlers).forEach(([type, handler]) =>
+    source.addEventListener(type, (event) => {
+      const data = JSON.parse(event.data);
+      if (data.client_id !== CLIENT_ID) handler(data);
+    }));
+  return () => source.close();
+};
+
+// Replacements
+export const getReplacementCandidates = (params) => 
+  api.get('/replacements/candidates', { params });
+export const solveReplacements = (date, commit = false) => 
+  api.post('/replacements/solve', { date, commit });
+export const commitReplacements = (reassignments) => 
+  api.post('/replacements/commit', reassignments);
+
+// CSV import (kind: employees, schools, assignments)
+export const importCsv = (kind, file, dryRun = false) => 
+  api.post(`/import/${kind}`, file, { headers: { 'Content-Type': 'text/csv' }, params: { dry_run: dryRun } });
 
 // Reports
 export const getHoursReportPDF = (startDate, endDate, employeeIds = '', sortBy = 'name') => {
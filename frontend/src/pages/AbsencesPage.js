@@ -1,5 +1,5 @@
-import { useState, useMemo } from 'react';
-import { createAbsence, deleteAbsence } from '../lib/api';
+import { useState, useMemo, useCallback, useEffect } from 'react';
+import { createAbsence, deleteAbsence, getAbsences } from '../lib/api';
 import api from '../lib/api';
 import { Button } from '../components/ui/button';
 import { Input } from '../components/ui/input';
@@ -31,7 +31,13 @@ const SHIFT_TYPES = [
   { id: 'MECANO', label: 'Mécano' },
 ];
 
-export default function AbsencesPage({ absences, employees, onUpdate }) {
+const PAGE_SIZE = 50;
+
+export default function AbsencesPage({ employees, onUpdate }) {
+  // Absences chargées page par page, les plus récentes d'abord
+  const [absences, setAbsences] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [showModal, setShowModal] = useState(false);
   const [editingAbsence, setEditingAbsence] = useState(null);
   const [formData, setFormData] = useState({
@@ -48,9 +54,28 @@ export default function AbsencesPage({ absences, employees, onUpdate }) {
     return [...employees].sort((a, b) => a.name.localeCompare(b.name));
   }, [employees]);
 
-  const sortedAbsences = [...absences].sort((a, b) => 
-    new Date(b.start_date) - new Date(a.start_date)
-  );
+  const loadAbsences = useCallback(async (cursor = null) => {
+    setLoadingMore(true);
+    try {
+      const res = await getAbsences({ sort: '-start_date', limit: PAGE_SIZE, ...(cursor ? { cursor } : {}) });
+      setAbsences(prev => cursor ? [...prev, ...res.data] : res.data);
+      setNextCursor(res.headers['x-next-cursor'] || null);
+    } catch (error) {
+      toast.error('Erreur lors du chargement des absences');
+    } finally {
+      setLoadingMore(false);
+    }
+  }, []);
+
+  useEffect(() => { loadAbsences(); }, [loadAbsences]);
+
+  const refresh = () => {
+    loadAbsences();
+    onUpdate();
+  };
+
+  // Déjà triées par le serveur
+  const sortedAbsences = absences;
 
   const formatDateDisplay = (dateStr) => {
     const date = new Date(dateStr + 'T00:00:00');
@@ -152,7 +177,7 @@ export default function AbsencesPage({ absences, employees, onUpdate }) {
         toast.success('Absence enregistrée');
       }
       setShowModal(false);
-      onUpdate();
+      refresh();
     } catch (error) {
       toast.error('Erreur lors de l\'enregistrement');
     }
@@ -164,7 +189,7 @@ export default function AbsencesPage({ absences, employees, onUpdate }) {
     try {
       await deleteAbsence(absence.id);
       toast.success('Absence supprimée');
-      onUpdate();
+      refresh();
     } catch (error) {
       toast.error('Erreur lors de la suppression');
     }
@@ -256,6 +281,13 @@ export default function AbsencesPage({ absences, employees, onUpdate }) {
                 )}
               </TableBody>
             </Table>
+            {nextCursor && (
+              <div className="flex justify-center py-4">
+                <Button variant="outline" onClick={() => loadAbsences(nextCursor)} disabled={loadingMore} data-testid="load-more-absences-btn">
+                  Charger plus
+                </Button>
+              </div>
+            )}
           </ScrollArea>
         </CardContent>
       </Card>
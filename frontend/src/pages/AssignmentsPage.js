@@ -1,5 +1,5 @@
-import { useState, useMemo } from 'react';
-import { createAssignment, updateAssignment, deleteAssignment } from '../lib/api';
+import { useState, useMemo, useCallback, useEffect, useRef } from 'react';
+import { createAssignment, updateAssignment, deleteAssignment, getAssignments } from '../lib/api';
 import { getContrastColor, formatHoursMinutes, timeToMinutes } from '../lib/utils';
 import { Button } from '../components/ui/button';
 import { Input } from '../components/ui/input';
@@ -47,7 +47,13 @@ const DEFAULT_PREDEFINED_PERIODS = [
   { id: '4', label: '2e semestre 2024-2025', start: '2025-01-20', end: '2025-06-20' },
 ];
 
-export default function AssignmentsPage({ assignments, employees, schools, onUpdate }) {
+const PAGE_SIZE = 100;
+
+export default function AssignmentsPage({ employees, schools, onUpdate }) {
+  // Assignations chargées page par page, par numéro de circuit
+  const [assignments, setAssignments] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [search, setSearch] = useState('');
   const [showModal, setShowModal] = useState(false);
   const [showPeriodsModal, setShowPeriodsModal] = useState(false);
@@ -68,6 +74,37 @@ export default function AssignmentsPage({ assignments, employees, schools, onUpd
   });
   const [newPeriod, setNewPeriod] = useState({ label: '', start: '', end: '' });
 
+  // La recherche est faite par le serveur: chaque nouveau terme recharge depuis la première page
+  const requestId = useRef(0);
+  const loadAssignments = useCallback(async (cursor = null) => {
+    const id = ++requestId.current;
+    setLoadingMore(true);
+    try {
+      const res = await getAssignments({
+        sort: 'circuit_number', limit: PAGE_SIZE,
+        ...(search.trim() ? { search: search.trim() } : {}),
+        ...(cursor ? { cursor } : {})
+      });
+      if (id !== requestId.current) return; // Réponse d'une recherche remplacée
+      setAssignments(prev => cursor ? [...prev, ...res.data] : res.data);
+      setNextCursor(res.headers['x-next-cursor'] || null);
+    } catch (error) {
+      toast.error('Erreur lors du chargement des assignations');
+    } finally {
+      if (id === requestId.current) setLoadingMore(false);
+    }
+  }, [search]);
+
+  useEffect(() => {
+    const timer = setTimeout(() => loadAssignments(), 300);
+    return () => clearTimeout(timer);
+  }, [loadAssignments]);
+
+  const refresh = () => {
+    loadAssignments();
+    onUpdate();
+  };
+
   // Trier les employés par ordre alphabétique
   const sortedEmployees = useMemo(() => {
     return [...employees].sort((a, b) => a.name.localeCompare(b.name));
@@ -75,12 +112,7 @@ export default function AssignmentsPage({ assignments, employees, schools, onUpd
 
   // Trier les assignations: circuits numériques d'abord, puis Admin/Mécano à la fin
   const sortedAssignments = useMemo(() => {
-    const filtered = assignments.filter(a =>
-      a.circuit_number.toLowerCase().includes(search.toLowerCase()) ||
-      a.employee_name?.toLowerCase().includes(search.toLowerCase())
-    );
-    
-    return filtered.sort((a, b) => {
+    return [...assignments].sort((a, b) => {
       const aIsAdmin = a.shifts?.some(s => s.is_admin);
       const bIsAdmin = b.shifts?.some(s => s.is_admin);
       
@@ -95,7 +127,7 @@ export default function AssignmentsPage({ assignments, employees, schools, onUpd
       
       return a.circuit_number.localeCompare(b.circuit_number);
     });
-  }, [assignments, search]);
+  }, [assignments]);
 
   const openAddModal = () => {
     setEditingAssignment(null);
@@ -295,7 +327,7 @@ export default function AssignmentsPage({ assignments, employees, schools, onUpd
         toast.success('Assignation créée');
       }
       setShowModal(false);
-      onUpdate();
+      refresh();
     } catch (error) {
       toast.error('Erreur lors de l\'enregistrement');
     }
@@ -307,7 +339,7 @@ export default function AssignmentsPage({ assignments, employees, schools, onUpd
     try {
       await deleteAssignment(assignment.id);
       toast.success('Assignation supprimée');
-      onUpdate();
+      refresh();
     } catch (error) {
       toast.error('Erreur lors de la suppression');
     }
@@ -320,7 +352,7 @@ export default function AssignmentsPage({ assignments, employees, schools, onUpd
           <CardTitle className="flex items-center gap-2">
             <Bus className="h-5 w-5" />
             Gestion des assignations
-            <Badge variant="secondary">{assignments.length}</Badge>
+            <Badge variant="secondary">{assignments.length}{nextCursor ? '+' : ''}</Badge>
           </CardTitle>
           <div className="flex items-center gap-2">
             <div className="relative">
@@ -408,6 +440,13 @@ export default function AssignmentsPage({ assignments, employees, schools, onUpd
                 </div>
               )}
             </div>
+            {nextCursor && (
+              <div className="flex justify-center py-4">
+                <Button variant="outline" onClick={() => loadAssignments(nextCursor)} disabled={loadingMore} data-testid="load-more-assignments-btn">
+                  Charger plus
+                </Button>
+              </div>
+            )}
           </ScrollArea>
         </CardContent>
       </Card>
@@ -3,9 +3,8 @@ import { useAuth } from '../context/AuthContext';
 import { useTheme } from '../context/ThemeContext';
 import { useNavigate } from 'react-router-dom';
 import { 
-  getSchedule, getEmployees, getSchools, getAssignments, 
-  getTemporaryTasks, getAbsences, getHolidays,
-  createTemporaryReassignment, deleteTemporaryTask
+  getBootstrap,
+  createTemporaryReassignment, deleteTemporaryTask, subscribeToChanges
 } from '../lib/api';
 import { 
   formatHoursMinutes, getWeekDates, getMonday, timeToMinutes, 
@@ -173,21 +172,21 @@ export default function DashboardPage() {
   const fetchData = useCallback(async () => {
     try {
       const monday = getMonday(selectedDate);
-      const [empRes, schRes, assRes, taskRes, absRes, holRes, schedRes] = await Promise.all([
-        getEmployees(), getSchools(), getAssignments(), getTemporaryTasks(), getAbsences(), getHolidays(), getSchedule({ week_start: monday })
-      ]);
+      // Données de référence et horaire de la semaine en une seule requête
+      const { data } = await getBootstrap(monday);
+      const schedule = data.schedule || {};
       // Filter out inactive employees
-      const activeEmployees = (empRes.data || []).filter(e => !e.is_inactive);
+      const activeEmployees = (data.employees || []).filter(e => !e.is_inactive);
       setEmployees(activeEmployees);
-      setSchools(schRes.data);
-      setAssignments(assRes.data);
-      setTempTasks(taskRes.data);
-      setAbsences(absRes.data);
-      setHolidays(holRes.data);
-      setScheduleData(schedRes.data.schedule || []);
-      setReplacements(schedRes.data.replacements || {});
-      setReassignmentIndex(schedRes.data.reassignment_index || {});
-      setWeekDates(schedRes.data.week_dates || getWeekDates(monday));
+      setSchools(data.schools);
+      setAssignments(data.assignments);
+      setTempTasks(data.temporary_tasks);
+      setAbsences(data.absences);
+      setHolidays(data.holidays);
+      setScheduleData(schedule.schedule || []);
+      setReplacements(schedule.replacements || {});
+      setReassignmentIndex(schedule.reassignment_index || {});
+      setWeekDates(schedule.week_dates || getWeekDates(monday));
     } catch (error) {
       console.error('Error fetching data:', error);
       toast.error('Erreur lors du chargement des données');
@@ -198,6 +197,59 @@ export default function DashboardPage() {
   
   useEffect(() => { fetchData(); }, [fetchData]);
   
+  // Modifications des autres répartiteurs (les siennes sont ignorées): la vue est corrigée sur place
+  // tout de suite, les heures et remplacements calculés par le serveur rechargés ensuite
+  const fetchDataRef = useRef(fetchData);
+  useEffect(() => { fetchDataRef.current = fetchData; }, [fetchData]);
+  
+  useEffect(() => {
+    let refreshTimer = null;
+    // Heures et remplacements sont recalculés par le serveur: un seul rechargement par rafale
+    const scheduleRefresh = () => {
+      clearTimeout(refreshTimer);
+      refreshTimer = setTimeout(() => fetchDataRef.current(), 1000);
+    };
+    const reassignmentKey = (r) => `${r.date}-${r.assignment_id}-${r.shift_id}-${r.block_id || ''}`;
+    const unsubscribe = subscribeToChanges({
+      'reassignment.upserted': ({ reassignment }) => {
+        setReassignmentIndex(prev => ({ ...prev, [reassignmentKey(reassignment)]: reassignment }));
+        scheduleRefresh();
+      },
+      'reassignment.deleted': ({ reassignment }) => {
+        setReassignmentIndex(prev => {
+          const next = { ...prev };
+          delete next[reassignmentKey(reassignment)];
+          return next;
+        });
+        scheduleRefresh();
+      },
+      'reassignments.deleted': ({ start_date, end_date, employee_ids, assignment_ids }) => {
+        const matches = (r) =>
+          (!start_date || r.date >= start_date) && (!end_date || r.date <= end_date) &&
+          (!employee_ids.length || employee_ids.includes(r.original_employee_id) || employee_ids.includes(r.new_employee_id)) &&
+          (!assignment_ids.length || assignment_ids.includes(r.assignment_id));
+        setReassignmentIndex(prev => Object.fromEntries(Object.entries(prev).filter(([, r]) => !matches(r))));
+        scheduleRefresh();
+      },
+      'task.upserted': ({ task }) => {
+        setTempTasks(prev => [...prev.filter(t => t.id !== task.id), task]);
+        scheduleRefresh();
+      },
+      'task.deleted': ({ task }) => {
+        setTempTasks(prev => prev.filter(t => t.id !== task.id));
+        scheduleRefresh();
+      },
+      'reassignments.upserted': scheduleRefresh,
+      'tasks.deleted': scheduleRefresh,
+      'resource.changed': scheduleRefresh,
+      'resync': scheduleRefresh,
+    });
+    return () => {
+      clearTimeout(refreshTimer);
+      unsubscribe();
+    };
+  }, []);
+  
   // Get effective employee for a block (considering temporary reassignments from backend)
   const getEffectiveEmployeeId = useCallback((assignment, shiftId, blockId) => {
     const key = `${selectedDate}-${assignment.id}-${shiftId}-${blockId || ''}`;
@@ -1431,8 +1483,8 @@ export default function DashboardPage() {
         
         {activeTab === 'employees' && <EmployeesPage employees={employees} onUpdate={fetchData} />}
         {activeTab === 'schools' && <SchoolsPage schools={schools} onUpdate={fetchData} />}
-        {activeTab === 'assignments' && <AssignmentsPage assignments={assignments} employees={activeEmployees} schools={schools} onUpdate={fetchData} />}
-        {activeTab === 'absences' && <AbsencesPage absences={absences} employees={activeEmployees} onUpdate={fetchData} />}
+        {activeTab === 'assignments' && <AssignmentsPage employees={activeEmployees} schools={schools} onUpdate={fetchData} />}
+        {activeTab === 'absences' && <AbsencesPage employees={activeEmployees} onUpdate={fetchData} />}
         {activeTab === 'holidays' && <HolidaysPage holidays={holidays} onUpdate={fetchData} />}
         {activeTab === 'reports' && <ReportsPage employees={activeEmployees} />}
       </main>
@@ -67,20 +67,13 @@ export default function HolidaysPage({ holidays, onUpdate }) {
           return;
         }
         
-        let count = 0;
-        let current = new Date(start);
-        while (current <= end) {
-          if (current.getDay() !== 0 && current.getDay() !== 6) {
-            await createHoliday({ 
-              name: formData.name, 
-              date: current.toISOString().split('T')[0],
-              type: formData.type
-            });
-            count++;
-          }
-          current.setDate(current.getDate() + 1);
-        }
-        toast.success(`${count} jour(s) ajouté(s)`);
+        await createHoliday({ 
+          name: formData.name, 
+          date: formData.start_date,
+          end_date: formData.end_date,
+          type: formData.type
+        });
+        toast.success(`${formData.type === 'ferie' ? 'Jour férié' : 'Congé'} ajouté`);
       }
       
       setShowModal(false);
@@ -148,6 +141,7 @@ export default function HolidaysPage({ holidays, onUpdate }) {
                     </TableCell>
                     <TableCell className="font-medium">
                       {formatDateDisplay(holiday.date)}
+                      {holiday.end_date && holiday.end_date !== holiday.date && ` au ${formatDateDisplay(holiday.end_date)}`}
                     </TableCell>
                     <TableCell>{holiday.name}</TableCell>
                     <TableCell>
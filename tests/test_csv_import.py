@@ -0,0 +1,77 @@
+"""
+Test suite for bulk CSV import
+Tests the import endpoints used at the start of a school year:
+1. Per-row error report (duplicates, invalid values, unknown references)
+2. Dry run validates without writing
+3. Missing required columns are rejected
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+CSV_HEADERS = {"Content-Type": "text/csv"}
+
+
+class TestImportEmployees:
+    """Employee import"""
+
+    def test_dry_run_reports_row_errors(self):
+        """Invalid rows are reported with their line number and nothing is written"""
+        body = (
+            "nom;date_embauche;matricule\n"
+            "TEST IMPORT, Un;2020-01-01;TEST-IMP-1\n"
+            "TEST IMPORT, Deux;2020-01-01;TEST-IMP-1\n"
+            "TEST IMPORT, Trois;2020-13-01;\n"
+        )
+        response = requests.post(f"{BASE_URL}/api/import/employees?dry_run=true", data=body.encode(), headers=CSV_HEADERS)
+        assert response.status_code == 200
+        report = response.json()
+
+        assert report["dry_run"] == True
+        assert report["total_rows"] == 3
+        assert report["inserted"] == 1
+        assert [e["line"] for e in report["errors"]] == [3, 4]
+
+        employees = requests.get(f"{BASE_URL}/api/employees").json()
+        assert not any(e.get("matricule") == "TEST-IMP-1" for e in employees)
+        print("✅ Dry run reports duplicate and invalid rows")
+
+    def test_missing_columns(self):
+        """A file without the required columns is rejected"""
+        response = requests.post(f"{BASE_URL}/api/import/employees", data=b"matricule\nX\n", headers=CSV_HEADERS)
+        assert response.status_code == 400
+        assert "name" in response.json()["detail"]
+
+
+class TestImportAssignments:
+    """Assignment import (one row per block)"""
+
+    def test_import_groups_blocks_into_circuits(self):
+        """Rows of the same circuit and period become one assignment"""
+        schools = requests.get(f"{BASE_URL}/api/schools").json()
+        if not schools:
+            pytest.skip("No school to test with")
+        school = schools[0]["name"]
+        body = (
+            "circuit_number,start_date,end_date,shift,school,start_time,end_time,hlp_before\n"
+            f"TEST-IMP-900,2026-01-01,2026-01-31,AM,\"{school}\",07:00,08:00,10\n"
+            f"TEST-IMP-900,2026-01-01,2026-01-31,PM,\"{school}\",15:00,16:00,\n"
+            "TEST-IMP-901,2026-01-01,2026-01-31,AM,École inexistante,07:00,08:00,\n"
+        )
+        response = requests.post(f"{BASE_URL}/api/import/assignments", data=body.encode(), headers=CSV_HEADERS)
+        assert response.status_code == 200
+        report = response.json()
+        assert report["inserted"] == 1
+        assert [e["line"] for e in report["errors"]] == [4]
+
+        assignments = requests.get(f"{BASE_URL}/api/assignments").json()
+        imported = [a for a in assignments if a["circuit_number"] == "TEST-IMP-900"]
+        assert len(imported) == 1
+        assert [s["name"] for s in imported[0]["shifts"]] == ["AM", "PM"]
+        assert imported[0]["shifts"][0]["blocks"][0]["hlp_start_min"] == 410
+        print("✅ Circuit rows grouped into one assignment")
+
+        # Cleanup
+        requests.delete(f"{BASE_URL}/api/assignments/{imported[0]['id']}")
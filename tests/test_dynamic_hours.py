@@ -494,5 +494,41 @@ class TestScheduleAPIWithReassignments:
         print("✅ Schedule returns weekly_total_formatted in HH:MM format")
 
 
+class TestOvertimeCaps:
+    """Test daily and weekly hours cap detection"""
+    
+    def test_schedule_returns_over_cap_flags(self):
+        """Each schedule row carries its cap overruns"""
+        response = requests.get(f"{BASE_URL}/api/schedule?week_start=2025-12-15")
+        assert response.status_code == 200
+        data = response.json()
+        
+        caps = data['hours_caps']
+        for emp_schedule in data['schedule']:
+            over_cap = emp_schedule['over_cap']
+            assert over_cap['weekly'] == (emp_schedule['weekly_total'] > caps['weekly_minutes'])
+            for date_key in over_cap['daily']:
+                assert emp_schedule['daily_hours'][date_key] > caps['daily_minutes']
+        
+        print("✅ Schedule returns over_cap flags")
+    
+    def test_overtime_matches_schedule_hours(self):
+        """Overtime report uses the same totals as the schedule"""
+        schedule = requests.get(f"{BASE_URL}/api/schedule?week_start=2025-12-15").json()
+        totals = {s['employee']['id']: s['weekly_total'] for s in schedule['schedule']}
+        
+        # A low cap so that every employee with hours is reported
+        response = requests.get(f"{BASE_URL}/api/overtime?week_start=2025-12-15&weekly_cap_hours=0&daily_cap_hours=0")
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert data['weekly_cap_minutes'] == 0
+        for entry in data['employees']:
+            assert entry['weekly_minutes'] == totals[entry['employee_id']]
+            assert entry['weekly_over_by'] == entry['weekly_minutes']
+        
+        print(f"✅ Overtime report lists {len(data['employees'])} employees with the schedule totals")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,57 @@
+"""
+Test suite for the index migrations run before the indexes are created
+Tests on the in-memory storage backend that:
+1. Duplicate temporary reassignments are removed, keeping the newest of each block
+2. The unique (date, assignment_id, shift_id, block_id) index is then created
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'test')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+import server  # noqa: E402
+from storage import MemoryStorage  # noqa: E402
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    storage = MemoryStorage()
+    monkeypatch.setattr(server, "db", storage)
+    monkeypatch.setattr(server, "index_build_status", {})
+    key = {"date": "2026-01-13", "assignment_id": "a1", "shift_id": "s1"}
+    run(storage.temporary_reassignments.insert_many([
+        {"id": "r1", **key, "block_id": "b1", "new_employee_id": "e1", "created_at": "2026-01-10T08:00:00+00:00"},
+        {"id": "r2", **key, "block_id": "b1", "new_employee_id": "e2", "created_at": "2026-01-10T09:00:00+00:00"},
+        {"id": "r3", **key, "block_id": "b1", "new_employee_id": "e3", "created_at": "2026-01-10T07:00:00+00:00"},
+        {"id": "r4", **key, "block_id": "b2", "new_employee_id": "e1", "created_at": "2026-01-10T08:00:00+00:00"},
+        {"id": "r5", **key, "new_employee_id": "e1", "created_at": "2026-01-10T08:00:00+00:00"},
+        {"id": "r6", **key, "block_id": None, "new_employee_id": "e2", "created_at": "2026-01-10T10:00:00+00:00"},
+    ]))
+    return storage
+
+
+class TestReassignmentDedupe:
+    """Duplicates left before the unique index"""
+
+    def test_keeps_newest_of_each_block(self, storage):
+        result = run(server.dedupe_temporary_reassignments())
+        assert result["removed"] == 3
+        docs = run(storage.temporary_reassignments.find({}, {"_id": 0}).to_list(None))
+        assert sorted(d["id"] for d in docs) == ["r2", "r4", "r6"]
+        assert run(server.dedupe_temporary_reassignments())["status"] == "already_applied"
+        print("✅ Newest reassignment of each block kept")
+
+    def test_unique_index_created_after_dedupe(self, storage):
+        status = run(server.ensure_indexes())
+        assert status["temporary_reassignments"]["date_assignment_shift_block_unique"] == "ready"
+        assert run(storage.temporary_reassignments.count_documents({})) == 3
+        print("✅ Unique index created once duplicates are removed")
@@ -0,0 +1,182 @@
+"""
+Test suite for the in-memory storage backend
+Tests that MemoryStorage behaves like MongoDB for the queries the API issues:
+1. Filters, projections, sorting and paging
+2. Updates, upserts and find_one_and_update
+3. Unique (and partial unique) indexes and bulk writes
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+from pymongo import IndexModel, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+from storage import MemoryStorage, Storage  # noqa: E402
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def storage():
+    storage = MemoryStorage()
+    run(storage.employees.insert_many([
+        {"id": "e1", "name": "ALPHA", "hire_date": "2010-01-01", "is_inactive": False},
+        {"id": "e2", "name": "BRAVO", "hire_date": "2015-01-01", "is_inactive": True},
+        {"id": "e3", "name": "CHARLIE", "hire_date": "2012-01-01"},
+    ]))
+    return storage
+
+
+class TestQueries:
+    """Filters, projections and cursors"""
+
+    def test_find_with_projection_and_sort(self, storage):
+        docs = run(storage.employees.find({}, {"_id": 0, "id": 1, "name": 1}).sort("hire_date", -1).to_list(None))
+        assert docs == [{"id": "e2", "name": "BRAVO"}, {"id": "e3", "name": "CHARLIE"}, {"id": "e1", "name": "ALPHA"}]
+        print("✅ Projection and sort")
+
+    def test_ne_matches_missing_field(self, storage):
+        docs = run(storage.employees.find({"is_inactive": {"$ne": True}}, {"_id": 0}).to_list(None))
+        assert sorted(d["id"] for d in docs) == ["e1", "e3"]
+        print("✅ $ne matches documents without the field")
+
+    def test_or_in_and_range(self, storage):
+        query = {"$or": [{"id": {"$in": ["e1"]}}, {"hire_date": {"$gte": "2014-01-01", "$lt": "2016-01-01"}}]}
+        docs = run(storage.employees.find(query, {"_id": 0}).to_list(None))
+        assert sorted(d["id"] for d in docs) == ["e1", "e2"]
+        print("✅ $or with $in and range")
+
+    def test_dotted_path_into_arrays(self):
+        storage = MemoryStorage()
+        run(storage.assignments.insert_one({
+            "id": "a1", "shifts": [{"id": "s1", "blocks": [{"school_id": "x"}, {"school_id": "y"}]}]
+        }))
+        assert run(storage.assignments.count_documents({"shifts.blocks.school_id": "y"})) == 1
+        assert run(storage.assignments.count_documents({"shifts.blocks.school_id": "z"})) == 0
+        print("✅ Dotted paths traverse arrays")
+
+    def test_skip_limit_and_async_iteration(self, storage):
+        async def collect():
+            return [doc["id"] async for doc in storage.employees.find({}).sort("id", 1).skip(1).limit(1)]
+        assert run(collect()) == ["e2"]
+        print("✅ Skip, limit and async iteration")
+
+    def test_returned_documents_are_copies(self, storage):
+        doc = run(storage.employees.find_one({"id": "e1"}, {"_id": 0}))
+        doc["name"] = "CHANGED"
+        assert run(storage.employees.find_one({"id": "e1"}))["name"] == "ALPHA"
+        print("✅ Returned documents do not alias stored ones")
+
+
+class TestUpdates:
+    """Updates and upserts"""
+
+    def test_update_one_set_and_unset(self, storage):
+        result = run(storage.employees.update_one({"id": "e1"}, {"$set": {"name": "ZED"}, "$unset": {"hire_date": ""}}))
+        assert result.matched_count == 1 and result.modified_count == 1
+        doc = run(storage.employees.find_one({"id": "e1"}, {"_id": 0}))
+        assert doc["name"] == "ZED" and "hire_date" not in doc
+        print("✅ $set and $unset")
+
+    def test_find_one_and_update_returns_after(self, storage):
+        doc = run(storage.employees.find_one_and_update(
+            {"id": "e2"}, {"$set": {"is_inactive": False}},
+            projection={"_id": 0}, return_document=ReturnDocument.AFTER
+        ))
+        assert doc["is_inactive"] is False and "_id" not in doc
+        assert run(storage.employees.find_one_and_update({"id": "missing"}, {"$set": {"x": 1}})) is None
+        print("✅ find_one_and_update")
+
+    def test_upsert_seeds_filter_and_set_on_insert(self):
+        storage = MemoryStorage()
+        update = {"$set": {"new_employee_id": "e2"}, "$setOnInsert": {"id": "r1"}}
+        first = run(storage.temporary_reassignments.find_one_and_update(
+            {"date": "2026-01-13", "assignment_id": "a1"}, update,
+            projection={"_id": 0}, upsert=True, return_document=ReturnDocument.AFTER
+        ))
+        assert first == {"date": "2026-01-13", "assignment_id": "a1", "new_employee_id": "e2", "id": "r1"}
+        update = {"$set": {"new_employee_id": "e3"}, "$setOnInsert": {"id": "r2"}}
+        second = run(storage.temporary_reassignments.find_one_and_update(
+            {"date": "2026-01-13", "assignment_id": "a1"}, update,
+            projection={"_id": 0}, upsert=True, return_document=ReturnDocument.AFTER
+        ))
+        assert second["id"] == "r1" and second["new_employee_id"] == "e3"
+        assert run(storage.temporary_reassignments.count_documents({})) == 1
+        print("✅ Upsert keeps a single document")
+
+    def test_delete_many(self, storage):
+        result = run(storage.employees.delete_many({"hire_date": {"$lt": "2014-01-01"}}))
+        assert result.deleted_count == 2
+        assert run(storage.employees.count_documents({})) == 1
+        print("✅ delete_many")
+
+
+class TestIndexes:
+    """Unique indexes and bulk writes"""
+
+    def test_unique_index_rejects_duplicates(self, storage):
+        run(storage.employees.create_indexes([IndexModel([("id", 1)], name="id_unique", unique=True)]))
+        with pytest.raises(DuplicateKeyError):
+            run(storage.employees.insert_one({"id": "e1", "name": "DUP"}))
+        with pytest.raises(DuplicateKeyError):
+            run(storage.employees.update_one({"id": "e3"}, {"$set": {"id": "e1"}}))
+        print("✅ Unique index enforced on insert and update")
+
+    def test_partial_unique_index(self, storage):
+        run(storage.employees.create_indexes([IndexModel(
+            [("berline", 1)], name="berline_active", unique=True,
+            partialFilterExpression={"berline": {"$gt": ""}, "is_inactive": False}
+        )]))
+        run(storage.employees.update_one({"id": "e1"}, {"$set": {"berline": "B1"}}))
+        # Employé inactif: hors de l'index partiel
+        run(storage.employees.update_one({"id": "e2"}, {"$set": {"berline": "B1"}}))
+        with pytest.raises(DuplicateKeyError):
+            run(storage.employees.insert_one({"id": "e4", "berline": "B1", "is_inactive": False}))
+        print("✅ Partial unique index")
+
+    def test_unordered_bulk_write_reports_errors(self, storage):
+        run(storage.employees.create_indexes([IndexModel([("id", 1)], name="id_unique", unique=True)]))
+        operations = [
+            UpdateOne({"id": "e1"}, {"$set": {"name": "A2"}}),
+            UpdateOne({"id": "e9"}, {"$set": {"id": "e2"}}, upsert=True),
+            UpdateOne({"id": "e5"}, {"$set": {"name": "E5"}}, upsert=True),
+        ]
+        with pytest.raises(BulkWriteError) as error:
+            run(storage.employees.bulk_write(operations, ordered=False))
+        details = error.value.details
+        assert details["nMatched"] == 1 and details["nUpserted"] == 1
+        assert [e["index"] for e in details["writeErrors"]] == [1]
+        print("✅ Unordered bulk write")
+
+
+class TestVersions:
+    """Write versions used for ETags"""
+
+    def test_writes_bump_collection_version(self, storage):
+        version = storage.version("employees")
+        run(storage.employees.find({}).to_list(None))
+        assert storage.version("employees") == version
+        run(storage.employees.update_one({"id": "e1"}, {"$set": {"name": "ZED"}}))
+        run(storage["employees"].delete_many({"id": "missing"}))
+        assert storage.version("employees") == version + 2
+        assert storage.version("schools") == 0
+        assert storage.last_modified(["employees"]) >= storage.started_at
+        print("✅ Writes bump the collection version")
+
+
+class TestBackends:
+    """Storage backend interface"""
+
+    def test_incomplete_backend_cannot_be_instantiated(self):
+        class NoPing(Storage):
+            def _collection(self, name):
+                return None
+        with pytest.raises(TypeError):
+            NoPing()
+        print("✅ Backends must implement _collection and ping")
@@ -0,0 +1,170 @@
+"""
+Test suite for replacement tools
+Tests that the dispatcher helpers for the Remplacements section:
+1. Rank free, active and non-absent employees for an orphaned block
+2. Propose a conflict-free assignment of a day's uncovered blocks
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+TEST_DATE = "2026-01-13"
+
+
+def find_assigned_block():
+    """Return (assignment, shift, block) for the first assigned, non-admin block"""
+    response = requests.get(f"{BASE_URL}/api/assignments")
+    assert response.status_code == 200
+    for assignment in response.json():
+        if not assignment.get('employee_id'):
+            continue
+        if not (assignment['start_date'] <= TEST_DATE <= assignment['end_date']):
+            continue
+        for shift in assignment.get('shifts', []):
+            if not shift.get('is_admin') and shift.get('blocks'):
+                return assignment, shift, shift['blocks'][0]
+    return None, None, None
+
+
+class TestReplacementCandidates:
+    """Test the ranked replacement candidates endpoint"""
+    
+    def test_candidates_for_block(self):
+        """Candidates exclude the current driver and are ranked by load"""
+        assignment, shift, block = find_assigned_block()
+        if not assignment:
+            pytest.skip("No assigned block available for testing")
+        
+        response = requests.get(f"{BASE_URL}/api/replacements/candidates", params={
+            "date": TEST_DATE,
+            "assignment_id": assignment['id'],
+            "shift_id": shift['id'],
+            "block_id": block['id']
+        })
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert data['current_employee_id'] == assignment['employee_id']
+        candidates = data['candidates']
+        candidate_ids = [c['employee_id'] for c in candidates]
+        assert assignment['employee_id'] not in candidate_ids
+        
+        # Ranked by daily minutes, then weekly minutes, then hire date
+        keys = [(c['daily_minutes'], c['weekly_minutes'], c['hire_date']) for c in candidates]
+        assert keys == sorted(keys)
+        print(f"✅ {len(candidates)} candidates for circuit {assignment['circuit_number']} ({data['start_time']}-{data['end_time']})")
+    
+    def test_candidates_are_free(self):
+        """No candidate has a conflicting block at that time"""
+        assignment, shift, block = find_assigned_block()
+        if not assignment:
+            pytest.skip("No assigned block available for testing")
+        
+        response = requests.get(f"{BASE_URL}/api/replacements/candidates", params={
+            "date": TEST_DATE,
+            "assignment_id": assignment['id'],
+            "shift_id": shift['id'],
+            "block_id": block['id']
+        })
+        data = response.json()
+        
+        for candidate in data['candidates'][:5]:
+            conflict = requests.post(f"{BASE_URL}/api/check-conflict", json={
+                "employee_id": candidate['employee_id'],
+                "date": TEST_DATE,
+                "start_time": data['start_time'],
+                "end_time": data['end_time']
+            }).json()
+            assert conflict['conflict'] is False, f"{candidate['name']} is not free"
+        print("✅ Top candidates have no conflict")
+    
+    def test_candidates_unknown_assignment(self):
+        """Unknown assignment returns 404"""
+        response = requests.get(f"{BASE_URL}/api/replacements/candidates", params={
+            "date": TEST_DATE,
+            "assignment_id": "does-not-exist",
+            "shift_id": "x"
+        })
+        assert response.status_code == 404
+        print("✅ Unknown assignment returns 404")
+
+
+class TestReplacementSolver:
+    """Test the automatic replacement solver (preview mode only)"""
+    
+    def test_solve_preview(self):
+        """Proposals are conflict-free and nothing is committed in preview"""
+        response = requests.post(f"{BASE_URL}/api/replacements/solve", json={"date": TEST_DATE})
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert data['committed'] == 0
+        assert len(data['proposals']) == len(data['reassignments'])
+        
+        # No driver receives two overlapping items
+        by_driver = {}
+        for proposal in data['proposals']:
+            assert proposal['new_employee_id'] != proposal['original_employee_id']
+            by_driver.setdefault(proposal['new_employee_id'], []).append(
+                (proposal['start_time'], proposal['end_time'])
+            )
+        for intervals in by_driver.values():
+            intervals.sort()
+            for (_, prev_end), (next_start, _) in zip(intervals, intervals[1:]):
+                assert prev_end <= next_start
+        
+        print(f"✅ {len(data['proposals'])} proposals, {len(data['unresolved'])} unresolved for {TEST_DATE}")
+    
+    def test_solve_proposals_are_reassignments(self):
+        """Proposed reassignments have the TemporaryReassignment shape"""
+        response = requests.post(f"{BASE_URL}/api/replacements/solve", json={"date": TEST_DATE})
+        data = response.json()
+        for reassignment in data['reassignments']:
+            assert reassignment['date'] == TEST_DATE
+            for field in ('assignment_id', 'shift_id', 'block_id', 'original_employee_id', 'new_employee_id'):
+                assert field in reassignment
+        print("✅ Proposals can be committed as temporary reassignments")
+
+
+class TestReplacementCommit:
+    """Test committing reviewed solver proposals"""
+    
+    def test_commit_proposals(self):
+        """Committed proposals become reassignments; solving again proposes nothing; stale ones are skipped"""
+        response = requests.post(f"{BASE_URL}/api/replacements/solve", json={"date": TEST_DATE})
+        proposals = response.json()['reassignments']
+        if not proposals:
+            pytest.skip("No uncovered block to commit")
+        
+        response = requests.post(f"{BASE_URL}/api/replacements/commit", json=proposals)
+        assert response.status_code == 200
+        data = response.json()
+        assert data['committed'] == len(proposals)
+        assert data['skipped'] == []
+        
+        def keyed():
+            reassignments = requests.get(f"{BASE_URL}/api/temporary-reassignments", params={"date": TEST_DATE}).json()
+            return {(r['assignment_id'], r['shift_id'], r['block_id']): r for r in reassignments}
+        
+        saved = keyed()
+        for proposal in proposals:
+            key = (proposal['assignment_id'], proposal['shift_id'], proposal['block_id'])
+            assert saved[key]['new_employee_id'] == proposal['new_employee_id']
+        
+        response = requests.post(f"{BASE_URL}/api/replacements/solve", json={"date": TEST_DATE})
+        assert response.json()['proposals'] == []
+        
+        # Les blocs sont maintenant couverts: la même proposition est périmée
+        response = requests.post(f"{BASE_URL}/api/replacements/commit", json=proposals)
+        assert response.status_code == 200
+        data = response.json()
+        assert data['committed'] == 0
+        assert len(data['skipped']) == len(proposals)
+        assert len(keyed()) == len(saved)
+        
+        for proposal in proposals:
+            reassignment = saved[(proposal['assignment_id'], proposal['shift_id'], proposal['block_id'])]
+            requests.delete(f"{BASE_URL}/api/temporary-reassignments/{reassignment['id']}")
+        print(f"✅ {len(proposals)} proposals committed, stale ones skipped")
@@ -6,9 +6,11 @@ Testing P0/P1/P2 features:
 - P2: Navigation icons, Circuit display for absent drivers
 """
 
+import json
 import pytest
 import requests
 import os
+import time
 from datetime import datetime, timedelta
 
 BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
@@ -23,6 +25,12 @@ class TestBackendHealth:
         data = response.json()
         assert "message" in data
 
+    def test_health(self):
+        """Test that the API reports ready once the database pool is warm"""
+        response = requests.get(f"{BASE_URL}/api/health")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ok"
+    
     def test_auth_login(self):
         """Test login with password 1600"""
         response = requests.post(f"{BASE_URL}/api/auth/login", json={"password": "1600"})
@@ -31,6 +39,51 @@ class TestBackendHealth:
         assert data.get("success") == True
         assert "admin" in data
         assert data["admin"]["name"] == "Fernand Alary"
+    
+    def test_index_status(self):
+        """Test that the startup routine reports the indexes it created"""
+        response = requests.get(f"{BASE_URL}/api/admin/indexes")
+        assert response.status_code == 200
+        status = response.json()["status"]
+        for collection in ("employees", "assignments", "temporary_reassignments"):
+            assert status[collection]["id_unique"] == "ready"
+        assert "date_assignment_shift_block_unique" in status["temporary_reassignments"]
+    
+    def test_archive_status(self):
+        """Test that the archival settings and last run are reported"""
+        response = requests.get(f"{BASE_URL}/api/admin/archive")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["horizon_days"] > 0
+        assert "cutoff" in data and "moved" in data
+    
+    def test_metrics_report_load_latency(self):
+        """Test that schedule collection loads are timed"""
+        requests.get(f"{BASE_URL}/api/schedule")
+        response = requests.get(f"{BASE_URL}/api/metrics")
+        assert response.status_code == 200
+        latency = response.json()["latency"]
+        for name in ("load.schedule_collections", "load.employees", "load.temporary_reassignments"):
+            assert latency[name]["count"] >= 1
+            assert latency[name]["max_ms"] >= latency[name]["p50_ms"]
+    
+    def test_metrics_report_serialization_and_payload(self):
+        """Test that the schedule serialization time and response sizes are reported"""
+        response = requests.get(f"{BASE_URL}/api/schedule", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert "schedule" in response.json()
+        
+        data = requests.get(f"{BASE_URL}/api/metrics").json()
+        assert data["latency"]["serialize./schedule"]["count"] >= 1
+        payload = data["payload"]["/schedule"]
+        assert payload["avg_sent_bytes"] <= payload["avg_bytes"]
+
+    def test_metrics_keyed_by_route_template(self):
+        """Test that metrics of routes with path parameters are keyed by template, not by URL"""
+        requests.delete(f"{BASE_URL}/api/holidays/does-not-exist")
+        data = requests.get(f"{BASE_URL}/api/metrics").json()
+        assert "/holidays/{holiday_id}" in data["payload"]
+        assert "/holidays/does-not-exist" not in data["payload"]
 
 
 class TestTemporaryReassignments:
@@ -53,12 +106,37 @@ class TestTemporaryReassignments:
         assert response.status_code == 200
         assert isinstance(response.json(), list)
     
+    def test_get_temporary_reassignments_by_date_range(self):
+        """Test GET /api/temporary-reassignments with a date range (reaches the archive)"""
+        response = requests.get(f"{BASE_URL}/api/temporary-reassignments?start_date=2020-01-01&end_date={self.today}")
+        assert response.status_code == 200
+        for reassignment in response.json():
+            assert "2020-01-01" <= reassignment["date"] <= self.today
+            assert "archived_at" not in reassignment
+    
     def test_get_temporary_reassignments_by_date(self):
         """Test GET /api/temporary-reassignments with date filter"""
         response = requests.get(f"{BASE_URL}/api/temporary-reassignments?date={self.today}")
         assert response.status_code == 200
         assert isinstance(response.json(), list)
-    
+
+    def test_get_temporary_reassignments_paginated(self):
+        """Test GET /api/temporary-reassignments pages with limit and X-Next-Cursor, in date order"""
+        response = requests.get(f"{BASE_URL}/api/temporary-reassignments", params={"limit": 1})
+        assert response.status_code == 200
+        first_page = response.json()
+        assert len(first_page) <= 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor:
+            response = requests.get(f"{BASE_URL}/api/temporary-reassignments", params={"limit": 1, "cursor": cursor})
+            assert response.status_code == 200
+            next_page = response.json()
+            assert next_page and next_page[0]["id"] != first_page[0]["id"]
+            assert next_page[0]["date"] >= first_page[0]["date"]
+
+        response = requests.get(f"{BASE_URL}/api/temporary-reassignments", params={"sort": "new_employee_id"})
+        assert response.status_code == 400
+
     def test_create_temporary_reassignment(self):
         """Test POST /api/temporary-reassignments - Create temporary reassignment"""
         # Skip if no assignments exist
@@ -87,6 +165,36 @@ class TestTemporaryReassignments:
         # Cleanup
         requests.delete(f"{BASE_URL}/api/temporary-reassignments/{data['id']}")
     
+    def test_create_temporary_reassignment_twice_upserts(self):
+        """Test that posting the same block twice updates one reassignment"""
+        if not self.assignments or not self.employees:
+            pytest.skip("No assignments or employees to test with")
+        
+        assignment = self.assignments[0]
+        shift_id = assignment.get('shifts', [{}])[0].get('id', 'test-shift') if assignment.get('shifts') else 'test-shift'
+        
+        payload = {
+            "date": self.today,
+            "assignment_id": assignment['id'],
+            "shift_id": shift_id,
+            "block_id": None,
+            "original_employee_id": assignment.get('employee_id'),
+            "new_employee_id": None
+        }
+        first = requests.post(f"{BASE_URL}/api/temporary-reassignments", json=payload).json()
+        
+        payload["new_employee_id"] = self.employees[0]['id']
+        response = requests.post(f"{BASE_URL}/api/temporary-reassignments", json=payload)
+        assert response.status_code == 200
+        second = response.json()
+        
+        assert second["id"] == first["id"]
+        assert second["new_employee_id"] == self.employees[0]['id']
+        assert "_id" not in second
+        
+        # Cleanup
+        requests.delete(f"{BASE_URL}/api/temporary-reassignments/{second['id']}")
+    
     def test_create_reassignment_to_replacement_zone(self):
         """Test creating reassignment with new_employee_id=null (unassign to replacement zone)"""
         if not self.assignments:
@@ -166,6 +274,107 @@ class TestTemporaryReassignments:
         assert response.status_code == 200
         data = response.json()
         assert data.get("success") == True
+    
+    def test_bulk_reassign_employee_day(self):
+        """Test POST /api/temporary-reassignments/bulk moving all of a driver's blocks for a day"""
+        test_date = "2099-12-30"  # Future date to avoid conflicts
+        assigned = [a for a in self.assignments if a.get('employee_id') and a['start_date'] <= test_date <= a['end_date']]
+        if not assigned or len(self.employees) < 2:
+            pytest.skip("No active assignment on the test date")
+        
+        from_id = assigned[0]['employee_id']
+        to_id = next(e['id'] for e in self.employees if e['id'] != from_id)
+        response = requests.post(f"{BASE_URL}/api/temporary-reassignments/bulk", json={
+            "date": test_date,
+            "from_employee_id": from_id,
+            "to_employee_id": to_id
+        })
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == len(data["reassignments"]) > 0
+        assert all(r["new_employee_id"] == to_id for r in data["reassignments"])
+        week_hours = next(iter(data["hours"].values()))
+        assert to_id in week_hours
+        
+        # Cleanup
+        requests.delete(f"{BASE_URL}/api/temporary-reassignments/by-date/{test_date}")
+    
+    def test_delete_reassignments_by_range(self):
+        """Test DELETE /api/temporary-reassignments with a date range and assignment filter"""
+        if not self.assignments:
+            pytest.skip("No assignments to test with")
+        
+        assignment = self.assignments[0]
+        shift_id = assignment.get('shifts', [{}])[0].get('id', 'test-shift') if assignment.get('shifts') else 'test-shift'
+        for test_date in ("2099-11-02", "2099-11-03", "2099-11-10"):
+            requests.post(f"{BASE_URL}/api/temporary-reassignments", json={
+                "date": test_date,
+                "assignment_id": assignment['id'],
+                "shift_id": shift_id,
+                "block_id": None,
+                "original_employee_id": assignment.get('employee_id'),
+                "new_employee_id": None
+            })
+        
+        response = requests.delete(
+            f"{BASE_URL}/api/temporary-reassignments",
+            params={"start_date": "2099-11-01", "end_date": "2099-11-07", "assignment_ids": assignment['id']}
+        )
+        assert response.status_code == 200
+        assert response.json()["deleted_count"] == 2
+        
+        remaining = requests.get(f"{BASE_URL}/api/temporary-reassignments?date=2099-11-10").json()
+        assert len(remaining) == 1
+        
+        # Cleanup
+        requests.delete(f"{BASE_URL}/api/temporary-reassignments/by-date/2099-11-10")
+    
+    def test_bulk_delete_requires_filter(self):
+        """Test that a bulk delete without any filter is rejected"""
+        response = requests.delete(f"{BASE_URL}/api/temporary-reassignments")
+        assert response.status_code == 400
+        # Des virgules seules ne sont pas un filtre
+        response = requests.delete(f"{BASE_URL}/api/temporary-reassignments", params={"employee_ids": ",,"})
+        assert response.status_code == 400
+        response = requests.delete(f"{BASE_URL}/api/temporary-tasks", params={"employee_ids": ","})
+        assert response.status_code == 400
+    
+    def test_events_stream_publishes_reassignment(self):
+        """Test that GET /api/events streams a reassignment.upserted event for a new reassignment"""
+        if not self.assignments:
+            pytest.skip("No assignments to test with")
+        
+        assignment = self.assignments[0]
+        shift_id = assignment.get('shifts', [{}])[0].get('id', 'test-shift') if assignment.get('shifts') else 'test-shift'
+        with requests.get(f"{BASE_URL}/api/events", stream=True, timeout=30) as stream:
+            assert stream.headers["Content-Type"].startswith("text/event-stream")
+            created = requests.post(f"{BASE_URL}/api/temporary-reassignments", headers={"X-Client-Id": "test-tab"}, json={
+                "date": "2099-12-15",
+                "assignment_id": assignment['id'],
+                "shift_id": shift_id,
+                "block_id": None,
+                "original_employee_id": assignment.get('employee_id'),
+                "new_employee_id": None
+            }).json()
+            
+            event = None
+            for line in stream.iter_lines(decode_unicode=True):
+                if line.startswith("data:") and created['id'] in line:
+                    event = json.loads(line[len("data:"):])
+                    break
+        
+        assert event["type"] == "reassignment.upserted"
+        assert event["reassignment"]["date"] == "2099-12-15"
+        # Le client à l'origine de l'écriture reconnaît son propre événement
+        assert event["client_id"] == "test-tab"
+        
+        # Cleanup
+        requests.delete(f"{BASE_URL}/api/temporary-reassignments/{created['id']}")
+    
+    def test_bulk_reassign_requires_items(self):
+        """Test that an empty bulk reassignment is rejected"""
+        response = requests.post(f"{BASE_URL}/api/temporary-reassignments/bulk", json={"reassignments": []})
+        assert response.status_code == 400
 
 
 class TestScheduleAPI:
@@ -211,6 +420,39 @@ class TestScheduleAPI:
         
         assert "reassignment_index" in data
         assert isinstance(data["reassignment_index"], dict)
+    
+    def test_bootstrap_returns_reference_data_and_schedule(self):
+        """Test GET /api/bootstrap returns everything the dashboard loads, with an ETag"""
+        today = datetime.now()
+        week_start = (today - timedelta(days=today.weekday())).strftime('%Y-%m-%d')
+        response = requests.get(f"{BASE_URL}/api/bootstrap", params={"week_start": week_start})
+        assert response.status_code == 200
+        data = response.json()
+        
+        for key in ("employees", "schools", "assignments", "temporary_tasks", "absences", "holidays", "schedule"):
+            assert key in data
+        assert data["schedule"]["week_dates"][0] == week_start
+        assert "reassignment_index" in data["schedule"]
+        
+        etag = response.headers.get("ETag")
+        response = requests.get(f"{BASE_URL}/api/bootstrap", params={"week_start": week_start},
+                                headers={"If-None-Match": etag})
+        assert response.status_code == 304
+    
+    def test_schedule_fields_selects_sections(self):
+        """Test GET /api/schedule?fields= returns only the requested sections and row fields"""
+        response = requests.get(f"{BASE_URL}/api/schedule", params={
+            "fields": "week_dates,schedule.employee,schedule.weekly_total"
+        })
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert set(data) == {"schedule", "week_dates"}
+        for row in data["schedule"]:
+            assert set(row) == {"employee", "weekly_total"}
+        
+        response = requests.get(f"{BASE_URL}/api/schedule", params={"fields": "schedule.password"})
+        assert response.status_code == 400
 
 
 class TestAssignmentsAPI:
@@ -221,7 +463,34 @@ class TestAssignmentsAPI:
         response = requests.get(f"{BASE_URL}/api/assignments")
         assert response.status_code == 200
         assert isinstance(response.json(), list)
-    
+
+    def test_search_assignments_across_pages(self):
+        """Test GET /api/assignments?search= filters on the server, before the page limit"""
+        ids = []
+        for i in range(3):
+            response = requests.post(f"{BASE_URL}/api/assignments", json={
+                "circuit_number": f"TEST-SEARCH-{i}",
+                "start_date": "2026-01-01",
+                "end_date": "2026-06-30",
+                "shifts": []
+            })
+            assert response.status_code == 200
+            ids.append(response.json()["id"])
+
+        response = requests.get(f"{BASE_URL}/api/assignments", params={
+            "search": "test-search", "sort": "circuit_number", "limit": 2
+        })
+        assert response.status_code == 200
+        assert [a["circuit_number"] for a in response.json()] == ["TEST-SEARCH-0", "TEST-SEARCH-1"]
+        cursor = response.headers["X-Next-Cursor"]
+        response = requests.get(f"{BASE_URL}/api/assignments", params={
+            "search": "test-search", "sort": "circuit_number", "limit": 2, "cursor": cursor
+        })
+        assert [a["circuit_number"] for a in response.json()] == ["TEST-SEARCH-2"]
+
+        for assignment_id in ids:
+            requests.delete(f"{BASE_URL}/api/assignments/{assignment_id}")
+
     def test_create_assignment_with_adapted(self):
         """Test creating assignment with is_adapted=True"""
         today = datetime.now().strftime('%Y-%m-%d')
@@ -265,10 +534,75 @@ class TestAssignmentsAPI:
         data = response.json()
         
         assert data["is_adapted"] == False
-        
+
         # Cleanup
         requests.delete(f"{BASE_URL}/api/assignments/{data['id']}")
 
+    def test_clone_assignments_to_next_period(self):
+        """Test POST /api/assignments/clone copies a period's assignments with new ids"""
+        source = requests.post(f"{BASE_URL}/api/assignments", json={
+            "circuit_number": "TEST-555",
+            "shifts": [{"name": "AM", "blocks": [{"school_id": "x", "start_time": "07:00", "end_time": "08:00"}]}],
+            "start_date": "2098-01-01",
+            "end_date": "2098-01-31"
+        }).json()
+
+        payload = {
+            "source_start_date": "2098-01-01",
+            "source_end_date": "2098-01-31",
+            "target_start_date": "2099-01-01",
+            "target_end_date": "2099-01-31",
+            "keep_employees": False
+        }
+        response = requests.post(f"{BASE_URL}/api/assignments/clone", json=payload)
+        assert response.status_code == 200
+        assert response.json()["cloned"] >= 1
+
+        assignments = requests.get(f"{BASE_URL}/api/assignments").json()
+        clone = next(a for a in assignments if a["circuit_number"] == "TEST-555" and a["start_date"] == "2099-01-01")
+        assert clone["id"] != source["id"]
+        assert clone["shifts"][0]["blocks"][0]["id"] != source["shifts"][0]["blocks"][0]["id"]
+        assert clone["employee_id"] is None
+
+        # A second clone skips circuits already present in the target period
+        response = requests.post(f"{BASE_URL}/api/assignments/clone", json=payload)
+        assert "TEST-555" in response.json()["skipped"]
+        print("✅ Assignments cloned to the next period")
+
+        # Cleanup
+        requests.delete(f"{BASE_URL}/api/assignments/{source['id']}")
+        requests.delete(f"{BASE_URL}/api/assignments/{clone['id']}")
+
+    def test_update_assignment_stores_block_minutes(self):
+        """Test that blocks are stored with precomputed minutes and days bitmask"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        end_date = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
+
+        response = requests.post(f"{BASE_URL}/api/assignments", json={
+            "circuit_number": "TEST-777",
+            "shifts": [],
+            "start_date": today,
+            "end_date": end_date
+        })
+        assert response.status_code == 200
+        assignment_id = response.json()["id"]
+
+        shifts = [{"id": "s1", "name": "AM", "blocks": [{
+            "id": "b1", "school_id": "x", "start_time": "07:00", "end_time": "08:00",
+            "hlp_before": 10, "hlp_after": 5, "days": ["L", "V"]
+        }]}]
+        response = requests.put(f"{BASE_URL}/api/assignments/{assignment_id}", json={"shifts": shifts})
+        assert response.status_code == 200
+        block = response.json()["shifts"][0]["blocks"][0]
+
+        assert block["start_min"] == 420 and block["end_min"] == 480
+        assert block["hlp_start_min"] == 410 and block["hlp_end_min"] == 485
+        assert block["days_mask"] == 1 | 16
+        print("✅ Block minutes stored on update")
+
+        # Cleanup
+        requests.delete(f"{BASE_URL}/api/assignments/{assignment_id}")
+
 
 class TestAbsencesAPI:
     """P2 - Test absences API for absent driver circuit display"""
@@ -285,6 +619,17 @@ class TestAbsencesAPI:
         assert response.status_code == 200
         assert isinstance(response.json(), list)
     
+    def test_get_absences_by_range(self):
+        """Test GET /api/absences keeps only absences overlapping the range"""
+        response = requests.get(f"{BASE_URL}/api/absences", params={
+            "start_date": "2026-01-12", "end_date": "2026-01-16", "sort": "-start_date"
+        })
+        assert response.status_code == 200
+        absences = response.json()
+        for absence in absences:
+            assert absence['start_date'] <= "2026-01-16" and absence['end_date'] >= "2026-01-12"
+        assert [a['start_date'] for a in absences] == sorted((a['start_date'] for a in absences), reverse=True)
+    
     def test_create_absence(self):
         """Test creating an absence"""
         if not self.employees:
@@ -320,6 +665,62 @@ class TestEmployeesAPI:
         response = requests.get(f"{BASE_URL}/api/employees")
         assert response.status_code == 200
         assert isinstance(response.json(), list)
+    
+    def test_employees_keyset_pagination(self):
+        """Test GET /api/employees pages follow X-Next-Cursor without gaps or duplicates"""
+        everyone = requests.get(f"{BASE_URL}/api/employees", params={"sort": "name"}).json()
+        
+        seen = []
+        params = {"sort": "name", "limit": 2}
+        while True:
+            response = requests.get(f"{BASE_URL}/api/employees", params=params)
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page) <= 2
+            seen += [e['id'] for e in page]
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+            params["cursor"] = cursor
+        
+        assert seen == [e['id'] for e in everyone]
+    
+    def test_employees_filters_and_invalid_sort(self):
+        """Test the inactive filter and rejection of unsupported sorts"""
+        response = requests.get(f"{BASE_URL}/api/employees", params={"inactive": "false"})
+        assert response.status_code == 200
+        assert all(not e.get('is_inactive') for e in response.json())
+        
+        response = requests.get(f"{BASE_URL}/api/employees", params={"sort": "password"})
+        assert response.status_code == 400
+    
+    def test_employees_conditional_get(self):
+        """Test GET /api/employees answers 304 to a current ETag, and 200 again after a write"""
+        response = requests.get(f"{BASE_URL}/api/employees")
+        assert response.status_code == 200
+        etag = response.headers.get("ETag")
+        assert etag and response.headers.get("Last-Modified")
+        
+        response = requests.get(f"{BASE_URL}/api/employees", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        
+        created = requests.post(f"{BASE_URL}/api/employees", json={"name": "TEST_ETAG, E", "hire_date": "2020-01-01"}).json()
+        response = requests.get(f"{BASE_URL}/api/employees", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        
+        # Cleanup
+        requests.delete(f"{BASE_URL}/api/employees/{created['id']}")
+    
+    def test_employees_fields_projection(self):
+        """Test GET /api/employees?fields=name returns only id and name"""
+        response = requests.get(f"{BASE_URL}/api/employees", params={"fields": "name"})
+        assert response.status_code == 200
+        for employee in response.json():
+            assert set(employee) == {"id", "name"}
+        
+        response = requests.get(f"{BASE_URL}/api/employees", params={"fields": "name,password"})
+        assert response.status_code == 400
 
 
 class TestSchoolsAPI:
@@ -331,6 +732,40 @@ class TestSchoolsAPI:
         assert response.status_code == 200
         assert isinstance(response.json(), list)
 
+    def test_school_rename_propagates_to_blocks(self):
+        """Test that renaming a school updates the school_name stored on blocks"""
+        school = requests.post(f"{BASE_URL}/api/schools", json={"name": "TEST École", "color": "#111111"}).json()
+        today = datetime.now().strftime('%Y-%m-%d')
+        assignment = requests.post(f"{BASE_URL}/api/assignments", json={
+            "circuit_number": "TEST-666",
+            "shifts": [{"name": "AM", "blocks": [{
+                "school_id": school["id"], "school_name": "TEST École", "school_color": "#111111",
+                "start_time": "07:00", "end_time": "08:00"
+            }]}],
+            "start_date": today,
+            "end_date": today
+        }).json()
+
+        response = requests.put(f"{BASE_URL}/api/schools/{school['id']}", json={"name": "TEST École 2", "color": "#222222"})
+        assert response.status_code == 200
+
+        # La propagation s'exécute en arrière-plan
+        block = None
+        for _ in range(20):
+            assignments = requests.get(f"{BASE_URL}/api/assignments").json()
+            current = next(a for a in assignments if a["id"] == assignment["id"])
+            block = current["shifts"][0]["blocks"][0]
+            if block["school_name"] == "TEST École 2":
+                break
+            time.sleep(0.25)
+        assert block["school_name"] == "TEST École 2"
+        assert block["school_color"] == "#222222"
+        print("✅ School rename propagated to blocks")
+
+        # Cleanup
+        requests.delete(f"{BASE_URL}/api/assignments/{assignment['id']}")
+        requests.delete(f"{BASE_URL}/api/schools/{school['id']}")
+
 
 class TestHolidaysAPI:
     """Test holidays API"""
@@ -340,6 +775,45 @@ class TestHolidaysAPI:
         response = requests.get(f"{BASE_URL}/api/holidays")
         assert response.status_code == 200
         assert isinstance(response.json(), list)
+    
+    def test_create_holiday_period(self):
+        """Test that a congé period is one row and covers every date in the schedule"""
+        payload = {
+            "name": "TEST_Relâche",
+            "date": "2030-03-04",
+            "end_date": "2030-03-08",
+            "type": "conge"
+        }
+        response = requests.post(f"{BASE_URL}/api/holidays", json=payload)
+        assert response.status_code == 200
+        holiday = response.json()
+        assert holiday["end_date"] == "2030-03-08"
+        
+        try:
+            schedule = requests.get(f"{BASE_URL}/api/schedule?week_start=2030-03-04").json()
+            for date_str in schedule['week_dates']:
+                assert date_str in schedule['holidays']
+            for emp_schedule in schedule['schedule']:
+                has_admin = any(
+                    s.get('is_admin') for a in emp_schedule['assignments'] for s in a.get('shifts', [])
+                )
+                if not has_admin:
+                    assert emp_schedule['weekly_total'] == 0
+        finally:
+            requests.delete(f"{BASE_URL}/api/holidays/{holiday['id']}")
+        
+        # Deleting the period clears it from the schedule
+        schedule = requests.get(f"{BASE_URL}/api/schedule?week_start=2030-03-04").json()
+        assert "2030-03-06" not in schedule['holidays']
+    
+    def test_create_holiday_period_invalid(self):
+        """Test that a period ending before it starts is rejected"""
+        response = requests.post(f"{BASE_URL}/api/holidays", json={
+            "name": "TEST_Invalid",
+            "date": "2030-03-08",
+            "end_date": "2030-03-04"
+        })
+        assert response.status_code == 400
 
 
 if __name__ == "__main__":